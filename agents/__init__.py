@@ -0,0 +1,14 @@
+"""
+템플릿 검증 에이전트 모듈
+
+- GuidelineJudgeAgent: LLM 기반 가이드라인 준수 판정
+- Agent2: 검증 도구 병렬 실행 및 최종 승인/반려 결정
+"""
+
+from .guideline_judge_agent import GuidelineJudgeAgent
+from .agent2 import Agent2
+
+__all__ = [
+    'GuidelineJudgeAgent',
+    'Agent2'
+]
@@ -0,0 +1,160 @@
+"""
+Agent2: 생성된 템플릿 검증 단계
+- 결정적 검증 도구(BlackList/WhiteList/InfoCommLaw)를 병렬 실행
+- 하드 실패(광고 표기 누락 등)가 나오면 즉시 중단하고 LLM 판정 생략
+- 모든 도구를 통과한 경우에만 GuidelineJudgeAgent 호출
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Dict, List, Optional
+
+from core.deadline import bounded
+from core.metrics import metrics, submit_with_context
+from tools.blacklist_tool import BlackListTool
+from tools.info_comm_law_tool import InfoCommLawTool
+from tools.policy_rule_engine import get_policy_engine
+from tools.whitelist_tool import WhiteListTool
+from utils.keyword_matcher import get_keyword_matcher
+from .guideline_judge_agent import GuidelineJudgeAgent
+
+
+MIN_JUDGE_SECONDS = 0.5  # 남은 시간이 이보다 적으면 LLM 판정 생략
+
+
+class Agent2:
+    """템플릿 검증 에이전트 (도구 병렬 실행 + 조기 종료 + LLM 판정)"""
+
+    def __init__(
+        self,
+        judge: Optional[GuidelineJudgeAgent] = None,
+        tools: List = None,
+        stage_timeout: float = 2.0,
+        judge_timeout: float = 15.0,
+        max_concurrent: int = 1,
+    ):
+        self.engine = get_policy_engine()
+        self.tools = tools or [BlackListTool(self.engine), WhiteListTool(self.engine), InfoCommLawTool()]
+        self.judge = judge
+        self.stage_timeout = stage_timeout
+        self.judge_timeout = judge_timeout
+        # 동시 검증 요청 수만큼 여유를 둬야 도구가 다른 요청의 LLM 판정 뒤에 밀려 시간 초과되지 않음
+        self.executor = ThreadPoolExecutor(
+            max_workers=(len(self.tools) + 1) * max(1, max_concurrent), thread_name_prefix="agent2"
+        )
+
+    def validate(self, template: str, entities: Dict = None, guidelines: List[str] = None) -> Dict:
+        """템플릿 검증 후 승인/반려 결정"""
+        start = time.perf_counter()
+
+        # 키워드 스캔과 정책 규칙 판정은 한 번만 하고 모든 도구가 공유
+        scan = get_keyword_matcher().scan(template)
+        policy = self.engine.validate(template)
+        futures = {
+            submit_with_context(self.executor, self._run_tool, tool, template, entities, scan, policy): tool
+            for tool in self.tools
+        }
+
+        # 요청 마감이 가까우면 그 안에서 끝냄
+        stage_timeout = bounded(self.stage_timeout)
+        tool_results = []
+        try:
+            for future in as_completed(futures, timeout=stage_timeout):
+                result = self._collect(future, futures[future])
+                tool_results.append(result)
+
+                if result["hard_fail"]:
+                    # 남은 검증과 LLM 판정은 생략
+                    metrics.increment("validation_short_circuits_total", tool=result["tool"])
+                    for pending in futures:
+                        pending.cancel()
+                    return self._decision(False, "tools", tool_results, None, start)
+        except FuturesTimeout:
+            for pending, tool in futures.items():
+                if not pending.done():
+                    pending.cancel()
+                    metrics.increment("timeouts_total", stage=f"tool:{tool.name}")
+                    tool_results.append(self._failure(tool.name, f"검증 시간 초과 ({stage_timeout:.2f}초)"))
+
+        # 완료 순서가 아니라 도구 순서로 정렬 (같은 템플릿이면 판정 프롬프트가 같아야 녹화 재생/캐시가 맞음)
+        order = {tool.name: i for i, tool in enumerate(self.tools)}
+        tool_results.sort(key=lambda result: order.get(result["tool"], len(order)))
+
+        if not all(result["pass"] for result in tool_results):
+            return self._decision(False, "tools", tool_results, None, start)
+
+        if self.judge is None:
+            return self._decision(True, "tools", tool_results, None, start)
+
+        judge_timeout = bounded(self.judge_timeout)
+        if judge_timeout < MIN_JUDGE_SECONDS:
+            metrics.increment("degraded_total", step="guideline_judge")
+            judge_result = self._skipped_judge("요청 마감이 가까워 LLM 판정을 생략했습니다.")
+            return self._decision(True, "tools", tool_results, judge_result, start)
+
+        judge_future = submit_with_context(self.executor, self._run_judge, template, tool_results, guidelines)
+        try:
+            judge_result = judge_future.result(timeout=judge_timeout)
+        except FuturesTimeout:
+            judge_future.cancel()
+            metrics.increment("timeouts_total", stage="guideline_judge")
+            # 판정이 늦으면 도구 결과만으로 승인 (응답 지연 방지)
+            judge_result = self._skipped_judge(f"LLM 판정이 {judge_timeout:.1f}초 내에 끝나지 않아 생략했습니다.")
+
+        return self._decision(judge_result["pass"], "judge", tool_results, judge_result, start)
+
+    @staticmethod
+    def _run_tool(tool, template: str, entities: Dict, scan, policy: Dict) -> Dict:
+        """도구 실행 (도구별 스팬 기록)"""
+        with metrics.span(f"tool:{tool.name}"):
+            return tool.run(template, entities, scan, policy)
+
+    def _run_judge(self, template: str, tool_results: List[Dict], guidelines: List[str]) -> Dict:
+        """LLM 판정 실행 (스팬 기록)"""
+        with metrics.span("guideline_judge"):
+            return self.judge.judge(template, tool_results, guidelines)
+
+    def _collect(self, future, tool) -> Dict:
+        """도구 실행 결과 수집 (예외는 실패 결과로 변환)"""
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"⚠️ {tool.name} 검증 오류: {e}")
+            return self._failure(tool.name, f"검증 오류: {e}")
+
+    @staticmethod
+    def _skipped_judge(reason: str) -> Dict:
+        """LLM 판정을 받지 못한 경우 (도구 결과만으로 승인)"""
+        return {
+            "tool": "guideline_judge",
+            "pass": True,
+            "score": None,
+            "issues": [],
+            "suggestions": [reason],
+        }
+
+    @staticmethod
+    def _failure(tool_name: str, issue: str) -> Dict:
+        """실행하지 못한 도구의 결과"""
+        return {
+            "tool": tool_name,
+            "pass": False,
+            "hard_fail": False,
+            "score": 0,
+            "issues": [issue],
+            "suggestions": [],
+        }
+
+    @staticmethod
+    def _decision(approved: bool, stage: str, tool_results: List[Dict], judge_result: Optional[Dict], start: float) -> Dict:
+        """최종 승인/반려 결정 및 피드백 생성"""
+        results = tool_results + ([judge_result] if judge_result else [])
+        return {
+            "approved": approved,
+            "stage": stage,
+            "tool_results": tool_results,
+            "judge_result": judge_result,
+            "issues": [issue for result in results for issue in result["issues"]],
+            "suggestions": [suggestion for result in results for suggestion in result["suggestions"]],
+            "elapsed": round(time.perf_counter() - start, 3),
+        }
@@ -0,0 +1,77 @@
+"""
+GuidelineJudgeAgent
+결정적 도구 검증을 모두 통과한 템플릿에 대해서만 호출되는 LLM 판정 단계
+"""
+
+import json
+from typing import Dict, List
+
+from core.base_processor import BaseTemplateProcessor
+
+
+class GuidelineJudgeAgent:
+    """LLM as a Judge: 가이드라인 준수 종합 판단"""
+
+    def __init__(self, processor: BaseTemplateProcessor, pass_score: int = 70):
+        self.processor = processor
+        self.pass_score = pass_score
+
+    def judge(self, template: str, tool_results: List[Dict], guidelines: List[str] = None) -> Dict:
+        """템플릿 가이드라인 준수 여부 판단"""
+        prompt = self._create_judge_prompt(template, tool_results, guidelines or [])
+
+        try:
+            response = self.processor.generate_with_gemini(prompt)
+            parsed = self.processor.parse_json_response(response)
+        except Exception as e:
+            print(f"가이드라인 판정 오류: {e}")
+            parsed = {}
+
+        # 판정 실패 시 도구 결과만으로 통과 처리 (생성 흐름을 막지 않음)
+        if not parsed:
+            return {
+                "tool": "guideline_judge",
+                "pass": True,
+                "score": None,
+                "issues": [],
+                "suggestions": ["LLM 판정 결과를 받지 못해 도구 검증 결과만 반영했습니다."],
+            }
+
+        score = parsed.get("score", 0)
+        return {
+            "tool": "guideline_judge",
+            "pass": bool(parsed.get("pass", False)) and score >= self.pass_score,
+            "score": score,
+            "issues": parsed.get("violations", []),
+            "suggestions": parsed.get("suggestions", []),
+        }
+
+    def _create_judge_prompt(self, template: str, tool_results: List[Dict], guidelines: List[str]) -> str:
+        """판정 프롬프트 생성"""
+        tool_summary = [
+            {"tool": result["tool"], "score": result["score"], "suggestions": result["suggestions"]}
+            for result in tool_results
+        ]
+        guidelines_text = "\n---\n".join(guidelines[:3])
+
+        return f"""
+당신은 카카오 알림톡 템플릿 심사 담당자입니다.
+아래 가이드라인과 자동 검증 결과를 참고하여 템플릿이 알림톡 심사를 통과할 수 있는지 판단해주세요.
+
+참고 가이드라인:
+{guidelines_text}
+
+자동 검증 결과:
+{json.dumps(tool_summary, ensure_ascii=False, indent=2)}
+
+심사 대상 템플릿:
+{template}
+
+JSON 형태:
+{{
+    "pass": true 또는 false,
+    "score": 0-100 사이 점수,
+    "violations": ["위반사항들"],
+    "suggestions": ["개선제안들"]
+}}
+"""
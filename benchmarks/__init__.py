@@ -0,0 +1,10 @@
+"""
+오프라인 성능 측정 모듈
+
+- FakeProvider: 네트워크 없이 동작하는 결정적 가짜 Gemini 백엔드
+- run_benchmark: TemplateSystem 성능 측정 후 JSON 결과 출력
+"""
+
+from .fake_provider import FakeProvider
+
+__all__ = ['FakeProvider']
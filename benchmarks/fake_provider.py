@@ -0,0 +1,149 @@
+"""
+결정적 가짜 Gemini 프로바이더
+- 임베딩: 문자 bigram 해싱 기반 (같은 텍스트 -> 같은 벡터, 비슷한 텍스트 -> 비슷한 벡터)
+- 생성: 프롬프트 종류(엔티티/판정/템플릿)에 맞는 고정 형식 응답
+- 지연/꼬리 지연/오류: 시드 고정 난수로 재현 가능하게 주입
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from typing import List
+
+import numpy as np
+
+
+class FakeProviderError(RuntimeError):
+    """주입된 가짜 API 오류"""
+
+
+class FakeProvider:
+    """GeminiProvider와 같은 인터페이스의 오프라인 프로바이더"""
+
+    def __init__(
+        self,
+        dimension: int = 768,
+        generate_latency: float = 0.0,
+        embed_latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 42,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+    ):
+        self.model_name = "fake-gemini"
+        self.dimension = dimension
+        self.embedding_model = f"fake-bigram-{dimension}"
+        self.generate_latency = generate_latency
+        self.embed_latency = embed_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate        # 꼬리 지연: 이 비율의 호출에 slow_latency 추가
+        self.slow_latency = slow_latency
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.generate_calls = 0
+        self.embed_calls = 0
+
+    def generate_content(self, prompt: str) -> str:
+        """프롬프트 종류에 맞는 결정적 응답 생성"""
+        with self._lock:
+            self.generate_calls += 1
+        self._simulate(self.generate_latency)
+
+        if "사용자 입력 목록:" in prompt:
+            return self._batch_entity_response(prompt)
+        if '"extracted_info"' in prompt:
+            return self._entity_response(prompt)
+        if "심사 담당자" in prompt:
+            return '```json\n{"pass": true, "score": 90, "violations": [], "suggestions": []}\n```'
+        return self._template_response(prompt)
+
+    def embed_content(self, text: str, task_type: str = "retrieval_document") -> List[float]:
+        """문자 bigram 해싱 임베딩"""
+        with self._lock:
+            self.embed_calls += 1
+        self._simulate(self.embed_latency)
+
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for i in range(len(text) - 1):
+            bucket = zlib.crc32(text[i:i + 2].encode("utf-8"))
+            vector[bucket % self.dimension] += 1.0 if bucket & 1 else -1.0
+
+        # 빈 텍스트도 정규화 가능하도록 상수 성분 추가
+        vector[0] += 1e-3
+        return vector.tolist()
+
+    def _simulate(self, latency: float) -> None:
+        """지연 및 오류 주입"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+            failed = self._random.random() < self.error_rate
+            if self.slow_rate and self._random.random() < self.slow_rate:
+                jitter += self.slow_latency
+        if latency or jitter:
+            time.sleep(max(0.0, latency + jitter))
+        if failed:
+            raise FakeProviderError("429 Resource has been exhausted (fake)")
+
+    @classmethod
+    def _entity_response(cls, prompt: str) -> str:
+        """엔티티 추출 응답"""
+        match = re.search(r'사용자 입력: "(.*?)"', prompt, flags=re.DOTALL)
+        entities = cls._entities(match.group(1) if match else "")
+        return "```json\n" + json.dumps(entities, ensure_ascii=False) + "\n```"
+
+    @classmethod
+    def _batch_entity_response(cls, prompt: str) -> str:
+        """묶음 엔티티 추출 응답 (입력 번호를 index로 담은 배열)"""
+        items = [
+            {"index": int(index), **cls._entities(json.loads(quoted))}
+            for index, quoted in re.findall(r'^(\d+)\. (".*")$', prompt, flags=re.MULTILINE)
+        ]
+        return "```json\n" + json.dumps(items, ensure_ascii=False) + "\n```"
+
+    @staticmethod
+    def _entities(user_input: str) -> dict:
+        """입력 하나의 엔티티"""
+        return {
+            "extracted_info": {
+                "dates": re.findall(r"\d{1,4}[./월]\s*\d{1,2}일?", user_input),
+                "names": re.findall(r"([가-힣]{2,4})(?:님|에게)", user_input),
+                "locations": re.findall(r"[가-힣]+점", user_input),
+                "events": re.findall(r"[가-힣]*(?:이벤트|행사|세미나|바자회)", user_input),
+                "others": [],
+            },
+            "message_intent": "행사안내" if "이벤트" in user_input or "행사" in user_input else "일반안내",
+            "context": user_input,
+            "message_type": "정보성",
+            "urgency_level": "보통",
+            "target_audience": "일반고객",
+        }
+
+    @staticmethod
+    def _template_response(prompt: str) -> str:
+        """템플릿 생성 응답"""
+        match = re.search(r"사용자 요청: (.*)", prompt)
+        request = match.group(1).strip()[:40] if match else "안내"
+
+        return f"""[안내 메시지]
+
+안녕하세요, #{{수신자명}}님.
+요청하신 내용({request})에 대해 안내드립니다.
+
+▶ 일시: #{{일시}}
+▶ 장소: #{{장소}}
+▶ 내용: #{{행사명}}
+
+[안내사항]
+- 일정 변경 시 별도로 안내드리겠습니다.
+- 자세한 내용은 홈페이지를 확인해주세요.
+
+[문의]
+- 연락처: #{{연락처}}
+
+※ 본 메시지는 서비스를 신청하신 분들께 발송되는 정보성 안내 메시지입니다."""
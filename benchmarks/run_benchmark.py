@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+TemplateSystem 오프라인 벤치마크
+FakeProvider를 주입해 API 키/네트워크 없이 다음 항목을 측정하고 JSON으로 출력한다.
+
+- cold_start: TemplateSystem 생성 (첫 요청 처리 가능 시점, 가이드라인은 어휘 검색)
+- full_ready: 가이드라인 벡터 인덱스까지 준비된 시점
+- index_build: 인덱스 구축 단독
+- index_load: 저장된 인덱스/청크 저장소 mmap 로드
+- stages: 요청 한 건의 단계별 지연 (core.metrics 스팬 기준)
+- counters: 처리량 구간의 모델 호출/폴백/재시도 카운터
+- hedging: --hedge-percentile 지정 시 헤징 비율/승률
+- speculation: --speculative 지정 시 추측 초안 채택률
+- throughput: 동시성 수준별 처리량 및 지연 분포
+- memory: 프로세스 최대 RSS
+
+--cassette를 주면 FakeProvider 대신 녹화된 실제 모델 응답/지연(core.cassette)으로 측정한다.
+
+사용 예:
+    python -m benchmarks.run_benchmark --latency-ms 50 --concurrency 1,4,8 --output bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from core.cassette import REPLAY_TIMINGS, ReplayProvider
+from core.hedging import configure_hedging, get_hedger
+from core.metrics import metrics
+from core.resilience import configure_call_guards
+
+from .fake_provider import FakeProvider
+
+SAMPLE_INPUTS = [
+    "12월 25일 크리스마스 이벤트 안내를 홍길동에게 보내고 싶어",
+    "강남점 방문 예약 확인 메시지를 김철수님에게 보내려고 해",
+    "가격 변경 안내를 기존 고객들에게 1월 1일부터 적용된다고 알려주고 싶어",
+    "2025.8.26 david 어머님, 어린이집에서 바자회가 열립니다",
+]
+
+
+def summarize(samples: List[float]) -> Dict:
+    """지연 샘플(초) 요약 통계 (밀리초)"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(50) * 1000, 3),
+        "p95_ms": round(percentile(95) * 1000, 3),
+        "p99_ms": round(percentile(99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def timed(func: Callable, *args, **kwargs):
+    """(결과, 경과 시간) 반환"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run_throughput(system, concurrency: int, requests: int, distinct: bool = False) -> Dict:
+    """동시성 수준 하나에서 처리량 측정 (distinct면 요청마다 입력을 달리해 동일 요청 합치기를 피함)"""
+    latencies, errors = [], 0
+
+    def one(i: int):
+        user_input = SAMPLE_INPUTS[i % len(SAMPLE_INPUTS)]
+        if distinct:
+            user_input += f" ({i}번)"
+        return timed(system.generate_template, user_input)[1]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(one, i) for i in range(requests)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(requests / wall, 3) if wall else None,
+        "latency": summarize(latencies),
+    }
+
+
+def speculation_stats(counters: Dict) -> Dict:
+    """추측 초안 결과별 횟수와 채택률"""
+    by_result = {
+        sample["labels"]["result"]: sample["value"] for sample in counters.get("speculative_drafts_total", [])
+    }
+    total = sum(by_result.values())
+    return {**by_result, "acceptance_rate": round(by_result.get("accepted", 0) / total, 4) if total else 0.0}
+
+
+def run_benchmark(args) -> Dict:
+    """전체 벤치마크 실행"""
+    provider = FakeProvider(
+        generate_latency=args.latency_ms / 1000,
+        embed_latency=args.embed_latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_ms / 1000,
+    )
+    if args.cassette:
+        # 녹화된 실제 트래픽으로 응답 (녹화에 없는 요청만 FakeProvider)
+        provider = ReplayProvider(args.cassette, timing=args.replay_timing, speed=args.replay_speed, fallback=provider)
+    # 기본은 호출 제한 없이 측정 (--rpm으로 클라이언트 측 제한 효과 확인)
+    configure_call_guards(
+        generate={"rpm": args.rpm, "tpm": 0, "seed": args.seed},
+        embed={"rpm": 0, "seed": args.seed},
+    )
+    configure_hedging(
+        generate={"percentile": args.hedge_percentile, "budget": args.hedge_budget} if args.hedge_percentile else None
+    )
+
+    # 파이프라인의 print 출력은 결과 JSON과 섞이지 않도록 버린다
+    with contextlib.redirect_stdout(io.StringIO()):
+        from main import TemplateSystem
+
+        # 인덱스 캐시는 임시 디렉터리를 써서 항상 콜드 구축부터 측정
+        cache_root = Path(tempfile.mkdtemp(prefix="bench-index-"))
+        system, cold_start = timed(TemplateSystem, provider=provider, index_cache_dir=cache_root / "cold")
+        if args.entity_batch_ms:
+            system.entity_extractor.enable_batching(args.entity_batch_ms / 1000, args.entity_batch_size)
+        if args.speculative:
+            system.enable_speculation()
+        _, full_ready = timed(system.wait_until_ready)
+        system.index_cache_dir = cache_root / "build"
+        _, index_build = timed(system._build_indexes)
+        _, index_load = timed(system._build_indexes)
+
+        # 단계별 지연은 파이프라인이 기록한 스팬에서 가져온다
+        metrics.reset()
+        for i in range(args.stage_requests):
+            system.generate_template(SAMPLE_INPUTS[i % len(SAMPLE_INPUTS)])
+        stage_samples = {
+            stage: [duration / 1000 for duration in durations]
+            for stage, durations in metrics.stage_durations().items()
+        }
+
+        metrics.reset()
+        throughput = [
+            run_throughput(system, level, args.requests, args.distinct_inputs) for level in args.concurrency
+        ]
+        counters = metrics.snapshot()["counters"]
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            "latency_ms": args.latency_ms,
+            "embed_latency_ms": args.embed_latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "rpm": args.rpm,
+            "slow_rate": args.slow_rate,
+            "slow_ms": args.slow_ms,
+            "hedge_percentile": args.hedge_percentile,
+            "hedge_budget": args.hedge_budget,
+            "distinct_inputs": args.distinct_inputs,
+            "entity_batch_ms": args.entity_batch_ms,
+            "entity_batch_size": args.entity_batch_size,
+            "speculative": args.speculative,
+            "seed": args.seed,
+            "cassette": args.cassette,
+            "replay_timing": args.replay_timing if args.cassette else None,
+        },
+        "corpus": {
+            "templates": len(system.template_library),
+            "guideline_chunks": len(system.guidelines),
+        },
+        "cold_start_s": round(cold_start, 3),
+        "full_ready_s": round(cold_start + full_ready, 3),
+        "index_build_s": round(index_build, 3),
+        "index_load_s": round(index_load, 3),
+        "stages": {stage: summarize(samples) for stage, samples in stage_samples.items()},
+        "throughput": throughput,
+        "model_calls": (
+            provider.stats() if args.cassette
+            else {"generate": provider.generate_calls, "embed": provider.embed_calls}
+        ),
+        "counters": counters,
+        "hedging": get_hedger("generate").stats() if args.hedge_percentile else None,
+        "speculation": speculation_stats(counters) if args.speculative else None,
+        "memory": {"peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TemplateSystem 오프라인 벤치마크")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="생성 호출 주입 지연")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="임베딩 호출 주입 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="지연 편차 (±)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="호출 오류 주입 비율 (0~1)")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="꼬리 지연 호출 비율 (0~1)")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="꼬리 지연 호출에 추가되는 지연")
+    parser.add_argument("--hedge-percentile", type=float, default=0.0, help="헤징 시작 백분위 (0이면 헤징 끔)")
+    parser.add_argument("--hedge-budget", type=float, default=0.05, help="헤징 추가 호출 예산 비율")
+    parser.add_argument("--distinct-inputs", action="store_true", help="처리량 구간 요청마다 다른 입력 사용")
+    parser.add_argument("--entity-batch-ms", type=float, default=0.0, help="엔티티 추출 묶음 대기 창 (0이면 끔)")
+    parser.add_argument("--entity-batch-size", type=int, default=8, help="엔티티 추출 묶음 최대 크기")
+    parser.add_argument("--speculative", action="store_true", help="엔티티 추출과 동시에 추측 초안 생성")
+    parser.add_argument("--cassette", help="녹화 파일(core.cassette)로 재생 (생략 시 FakeProvider)")
+    parser.add_argument("--replay-timing", choices=REPLAY_TIMINGS, default="recorded", help="녹화 지연대로 | 지연 없이")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="recorded 재생 배속")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rpm", type=float, default=0.0, help="생성 호출 분당 제한 (0이면 제한 없음)")
+    parser.add_argument("--stage-requests", type=int, default=8, help="단계별 측정 요청 수")
+    parser.add_argument("--requests", type=int, default=32, help="동시성 수준별 요청 수")
+    parser.add_argument(
+        "--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 4, 8],
+        help="쉼표로 구분한 동시성 수준 (예: 1,4,8)",
+    )
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (생략 시 stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = run_benchmark(args)
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"✅ 벤치마크 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
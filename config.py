@@ -6,4 +6,87 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 EMBEDDING_MODEL = "sentence-transformers/distiluse-base-multilingual-cased"
 FAISS_INDEX_PATH = "template_index.faiss"
-TEMPLATE_DATA_PATH = "template_data.json"
\ No newline at end of file
+TEMPLATE_DATA_PATH = "template_data.json"
+
+# 알림톡 본문 최대 길이(자) - 생성 프롬프트, 로컬 점수, 정보통신망법 검증, 대량 렌더링이 함께 사용
+MAX_TEMPLATE_LENGTH = 1000
+
+# 템플릿 검증 단계 (Agent2)
+VALIDATION_STAGE_TIMEOUT = 2.0   # 결정적 검증 도구 전체 제한 시간(초)
+JUDGE_TIMEOUT = 15.0             # LLM 판정 제한 시간(초)
+MAX_REGENERATION_ATTEMPTS = 2    # 반려 시 최대 재생성 횟수
+MAX_CONCURRENT_VALIDATIONS = int(os.getenv("MAX_CONCURRENT_VALIDATIONS", "32"))  # 프로세스당 동시 검증 요청 수 (스레드 풀 크기 기준)
+
+# 계측: 설정 시 단계별 스팬을 JSON Lines로 기록
+METRICS_JSONL_PATH = os.getenv("METRICS_JSONL_PATH")
+
+# 모델 호출 보호 (0이면 제한 없음)
+GENERATE_RPM_LIMIT = float(os.getenv("GENERATE_RPM_LIMIT", "1000"))       # 생성 분당 요청 수
+GENERATE_TPM_LIMIT = float(os.getenv("GENERATE_TPM_LIMIT", "1000000"))    # 생성 분당 토큰 수
+EMBED_RPM_LIMIT = float(os.getenv("EMBED_RPM_LIMIT", "1500"))             # 임베딩 분당 요청 수
+MAX_CONCURRENT_MODEL_CALLS = int(os.getenv("MAX_CONCURRENT_MODEL_CALLS", "8"))  # 동시 호출 상한 (오류 시 자동 축소)
+MODEL_BACKOFF_BASE = 0.5         # 재시도 백오프 기본 대기(초)
+MODEL_BACKOFF_MAX = 8.0          # 재시도 백오프 최대 대기(초)
+CIRCUIT_FAILURE_THRESHOLD = 5    # 연속 실패 시 회로 열림
+CIRCUIT_RESET_TIMEOUT = 30.0     # 회로 열림 유지 시간(초), 이후 시험 호출
+
+# PDF 가이드 수집 (페이지 단위 추출 결과를 파일 해시로 캐시)
+GUIDELINE_PDF_DIR = os.getenv("GUIDELINE_PDF_DIR", "data")
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", ".cache/pdf_pages")
+
+# 인덱스/청크 저장소 캐시 (코퍼스 해시별, 워커 프로세스 간 mmap 공유)
+INDEX_CACHE_DIR = os.getenv("INDEX_CACHE_DIR", ".cache/index")
+
+# 승인 템플릿 라이브러리 (SQLite + 임베딩 모델별 샤드 인덱스, 대량 가져오기: python -m core.template_library import)
+TEMPLATE_LIBRARY_DIR = os.getenv("TEMPLATE_LIBRARY_DIR", "data/template_library")
+TEMPLATE_LIBRARY_SEED = os.getenv("TEMPLATE_LIBRARY_SEED", "data/approved_templates.jsonl")  # 비어 있을 때 넣을 시드
+
+# 엔티티 추출 마이크로 배칭 (동시 요청의 추출을 짧은 창 동안 모아 한 번에 호출, 0이면 끔)
+ENTITY_BATCH_WINDOW_MS = float(os.getenv("ENTITY_BATCH_WINDOW_MS", "0"))   # 묶음 대기 창(ms), 서버 모드 권장 5~20
+ENTITY_BATCH_MAX_SIZE = int(os.getenv("ENTITY_BATCH_MAX_SIZE", "8"))       # 묶음당 최대 요청 수
+
+# 의도별 가이드라인 검색 결과를 인덱스 번들에 미리 계산해 두고, 의도가 맞는 요청은 임베딩/검색 생략
+PRECOMPUTED_INTENT_GUIDELINES = os.getenv("PRECOMPUTED_INTENT_GUIDELINES", "1") == "1"
+
+# 추측 초안: 엔티티 추출과 동시에 규칙 기반 엔티티로 검색/생성을 시작, 추출된 의도/유형이 같으면 초안 사용
+SPECULATIVE_GENERATION = os.getenv("SPECULATIVE_GENERATION", "0") == "1"
+
+# 모델 호출 녹화/재생 (core.cassette, 녹화 경로의 {pid}는 프로세스 id로 치환)
+CASSETTE_RECORD_PATH = os.getenv("CASSETTE_RECORD_PATH")                  # 설정 시 generate/embed 호출 녹화
+CASSETTE_REPLAY_PATH = os.getenv("CASSETTE_REPLAY_PATH")                  # 설정 시 API 대신 녹화 파일로 응답
+CASSETTE_REPLAY_TIMING = os.getenv("CASSETTE_REPLAY_TIMING", "recorded")  # recorded(녹화 지연대로) | fast
+
+# 대화 세션 문맥 캐시 (수정 요청 시 추출/검색 결과 재사용)
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "256"))          # 보관할 최대 세션 수 (LRU)
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "1800"))     # 마지막 사용 후 만료(초)
+
+# 단계별 모델 라우팅 (단계 이름은 계측 스팬 이름, 앞쪽 모델이 기본 후보)
+# 측정된 지연이 짧은 후보부터 호출하고, 제한 시간 초과/실패 시 다음 후보로 전환
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "1") == "1"
+MODEL_ROUTES = {
+    "entity_extraction": ["gemini-1.5-flash-8b", "gemini-2.0-flash-exp"],   # 짧은 JSON 추출
+    "generation": ["gemini-2.0-flash-exp", "gemini-1.5-flash"],             # 긴 템플릿 생성/수정
+    "guideline_judge": ["gemini-1.5-flash", "gemini-2.0-flash-exp"],        # 가이드라인 판정
+    "metadata": ["gemini-1.5-flash"],                                        # 청크 메타데이터 자동 생성
+    "default": ["gemini-2.0-flash-exp", "gemini-1.5-flash"],
+}
+MODEL_ROUTE_TIMEOUTS = {"entity_extraction": 5.0, "generation": 20.0, "guideline_judge": 10.0, "default": 20.0}  # 초
+MODEL_PRICES = {  # 100만 토큰당 (입력, 출력) USD - 비용 지표 추정용
+    "gemini-1.5-flash-8b": (0.0375, 0.15),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-2.0-flash-exp": (0.10, 0.40),
+}
+
+# 생성 호출 헤징 (최근 지연의 백분위까지 응답이 없으면 같은 호출을 한 번 더 보내 먼저 온 결과 사용)
+HEDGE_GENERATION = os.getenv("HEDGE_GENERATION", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.95"))   # 헤지 시작 지연 백분위
+HEDGE_BUDGET = float(os.getenv("HEDGE_BUDGET", "0.05"))           # 전체 호출 대비 최대 추가 호출 비율
+HEDGE_MIN_SAMPLES = 20                                            # 단계별 지연 샘플이 이만큼 쌓인 뒤부터 헤징
+
+# 요청 마감 (0이면 없음). 남은 시간이 아래 값보다 적으면 해당 단계를 줄여 마감 안에 응답
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "30"))
+DEGRADE_GUIDELINE_SEARCH_BELOW = 12.0   # 가이드라인 검색 생략
+DEGRADE_LLM_ENTITIES_BELOW = 8.0        # 규칙 기반 엔티티 추출
+DEGRADE_LLM_GENERATION_BELOW = 2.0      # 모델 호출 없이 기본 템플릿 (_generate_fallback_template)
+VALIDATION_RESERVE_SECONDS = 1.0        # 생성 단계가 검증용으로 남겨두는 시간
+DEADLINE_RESPONSE_MARGIN = 0.1          # 마감 전 응답 조립용 여유
@@ -5,14 +5,21 @@
 - BaseTemplateProcessor: 공통 기능 기반 클래스
 - EntityExtractor: 엔티티 추출 전문 클래스
 - TemplateGenerator: 템플릿 생성 전문 클래스
+- CompiledTemplate: 한 번 파싱해 재사용하는 템플릿 (변수 추출/렌더링)
+- BulkRenderer: 수신자 파일 대량 메일머지
 """
 
 from .base_processor import BaseTemplateProcessor
 from .entity_extractor import EntityExtractor  
 from .template_generator import TemplateGenerator
+from .compiled_template import CompiledTemplate, compile_template
+from .bulk_renderer import BulkRenderer
 
 __all__ = [
     'BaseTemplateProcessor',
     'EntityExtractor', 
-    'TemplateGenerator'
+    'TemplateGenerator',
+    'CompiledTemplate',
+    'compile_template',
+    'BulkRenderer'
 ]
\ No newline at end of file
@@ -1,70 +1,96 @@
-import re
 import json
+import hashlib
+import shutil
 import numpy as np
 import faiss
-from typing import List, Dict, Tuple, Optional
-import google.generativeai as genai
+from typing import List, Dict, Tuple, Optional, Sequence
 from pathlib import Path
 
+from .chunk_store import ChunkStore, write_chunk_store
+
+from .compiled_template import compile_template
+from .deadline import call_with_deadline
+from .hedging import get_hedger
+from .metrics import metrics
+from .providers import GeminiProvider, prefix_cache_for
+from .resilience import estimate_tokens, get_call_guard
+
 class BaseTemplateProcessor:
     """템플릿 처리 기본 클래스"""
     
-    def __init__(self, api_key: str, gemini_model: str = "gemini-1.5-flash"):
+    def __init__(self, api_key: str, gemini_model: str = "gemini-1.5-flash", provider=None, router=None):
         self.api_key = api_key
         
-        # AI 모델 초기화
-        genai.configure(api_key=api_key)
-        self.gemini_model = genai.GenerativeModel(gemini_model)
+        # AI 모델 초기화 (provider를 주입하면 Gemini 대신 사용)
+        self.provider = provider or GeminiProvider(api_key, gemini_model)
+        self.prefix_cache = prefix_cache_for(self.provider)
         
-        print(f"✅ Gemini 모델 초기화: {gemini_model}")
-        print("✅ Gemini Embedding API 사용 준비 완료")
+        # 단계별 모델 라우터 (있으면 생성 호출은 라우터의 후보 모델로, 임베딩은 기본 프로바이더로)
+        self.router = router
+        
+        # 호출 보호 장치 (모든 프로세서가 종류별로 공유)
+        self.generate_guard = get_call_guard("generate")
+        self.embed_guard = get_call_guard("embed")
+        self.hedger = get_hedger("generate")  # 설정에서 꺼져 있으면 None
         
         # 데이터 저장소
         self.templates = []
         self.guidelines = []
+        self.guideline_sources = []  # 가이드라인 청크별 출처 목록 (준중복 병합 시 여러 개)
         
         # FAISS 인덱스
         self.template_index = None
         self.guideline_index = None
         
+        # 마지막 encode_texts가 폴백 임베딩을 썼는지 (폴백 인덱스는 디스크에 저장하지 않음)
+        self.embedding_degraded = False
+        
     def encode_texts(self, texts: List[str]) -> np.ndarray:
         """텍스트 리스트를 Gemini Embedding으로 변환"""
         try:
             # Gemini Embedding API 사용
             embeddings = []
             for text in texts:
-                result = genai.embed_content(
-                    model="models/text-embedding-004",
-                    content=text,
-                    task_type="retrieval_document"
-                )
-                embeddings.append(result['embedding'])
+                embeddings.append(self.embed_guard.call(
+                    self.provider.embed_content, text, task_type="retrieval_document", tokens=estimate_tokens(text)
+                ))
             
+            self.embedding_degraded = False
             return np.array(embeddings)
         except Exception as e:
             print(f"❌ Gemini Embedding 오류: {e}")
+            metrics.increment("fallbacks_total", kind="embedding")
+            self.embedding_degraded = True
             # 폴백: 간단한 TF-IDF 기반 임베딩
             return self._fallback_embedding(texts)
     
+    def encode_texts_strict(self, texts: List[str]) -> np.ndarray:
+        """encode_texts와 같지만 폴백 임베딩이면 예외 (디스크에 남는 인덱스용)"""
+        embeddings = self.encode_texts(texts)
+        if self.embedding_degraded:
+            raise RuntimeError("임베딩 API를 사용할 수 없어 색인을 중단합니다.")
+        return embeddings
+    
+    @property
+    def embedding_key(self) -> str:
+        """임베딩 공간 식별자 (프로바이더 종류 + 임베딩 모델)"""
+        return f"{type(self.provider).__name__}-{getattr(self.provider, 'embedding_model', '')}"
+    
     def _fallback_embedding(self, texts: List[str]) -> np.ndarray:
         """폴백 임베딩 (간단한 TF-IDF 기반)"""
         from collections import Counter
         import math
         
         try:
-            # 모든 단어 수집 및 어휘 생성
-            all_words = []
-            for text in texts:
-                words = text.lower().split()
-                all_words.extend(words)
-            
-            word_counter = Counter(all_words)
+            # 모든 단어 수집 및 어휘 생성 (문서 빈도는 한 번만 계산)
+            tokenized = [text.lower().split() for text in texts]
+            word_counter = Counter(word for words in tokenized for word in words)
+            document_frequency = Counter(word for words in tokenized for word in set(words))
             vocab = {word: idx for idx, (word, _) in enumerate(word_counter.most_common(1000))}
             
             # 간단한 TF-IDF 계산
             embeddings = []
-            for text in texts:
-                words = text.lower().split()
+            for words in tokenized:
                 word_counts = Counter(words)
                 
                 # TF-IDF 벡터 생성 (384차원으로 고정)
@@ -72,7 +98,7 @@ class BaseTemplateProcessor:
                 for word, count in word_counts.items():
                     if word in vocab and vocab[word] < 384:
                         tf = count / len(words)
-                        idf = math.log(len(texts) / (1 + sum(1 for t in texts if word in t.lower().split())))
+                        idf = math.log(len(texts) / (1 + document_frequency[word]))
                         vector[vocab[word]] = tf * idf
                 
                 embeddings.append(vector)
@@ -94,49 +120,117 @@ class BaseTemplateProcessor:
         
         return index
     
+    def load_or_build_index(
+        self,
+        name: str,
+        texts: Sequence[str],
+        cache_dir: Path,
+        sources: Optional[Sequence[List[str]]] = None,
+        embed_texts: Optional[Sequence[str]] = None,
+    ) -> Tuple[faiss.Index, Sequence[str]]:
+        """코퍼스 해시로 저장된 인덱스/청크 저장소를 mmap으로 열거나, 없으면 구축 후 저장
+        
+        반환되는 텍스트 목록은 ChunkStore(mmap, 지연 디코딩)이며 저장에 실패하면 원래 리스트.
+        """
+        digest = hashlib.sha256()
+        digest.update(type(self.provider).__name__.encode("utf-8"))
+        digest.update(str(getattr(self.provider, "embedding_model", "")).encode("utf-8"))
+        for text in list(texts) + list(embed_texts or []):
+            digest.update(b"\0" + text.encode("utf-8"))
+        bundle_dir = Path(cache_dir) / f"{name}-{digest.hexdigest()[:16]}"
+        index_path, chunks_path = bundle_dir / "index.faiss", bundle_dir / "chunks.bin"
+        
+        if index_path.exists() and chunks_path.exists():
+            print(f"📦 저장된 {name} 인덱스 사용: {bundle_dir}")
+            return self._read_index(index_path), ChunkStore(chunks_path)
+        
+        embeddings = self.encode_texts(list(embed_texts or texts))
+        index = self.build_faiss_index(embeddings)
+        if self.embedding_degraded:
+            return index, list(texts)
+        
+        try:
+            tmp_dir = bundle_dir.with_name(bundle_dir.name + ".tmp")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            faiss.write_index(index, str(tmp_dir / "index.faiss"))
+            write_chunk_store(tmp_dir / "chunks.bin", texts, sources)
+            tmp_dir.rename(bundle_dir)
+        except OSError as e:
+            # 다른 프로세스가 먼저 저장했거나 쓰기 불가 - 방금 만든 인덱스 사용
+            print(f"⚠️ {name} 인덱스 저장 실패: {e}")
+            if not (index_path.exists() and chunks_path.exists()):
+                return index, list(texts)
+        
+        # 힙의 인덱스 대신 mmap으로 다시 열어 프로세스 간 공유
+        return self._read_index(index_path), ChunkStore(chunks_path)
+    
+    @staticmethod
+    def _read_index(path: Path) -> faiss.Index:
+        """FAISS 인덱스를 mmap으로 읽기 (지원하지 않는 버전은 일반 읽기)"""
+        mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+        if mmap_flag is not None:
+            try:
+                return faiss.read_index(str(path), mmap_flag)
+            except RuntimeError:
+                pass
+        return faiss.read_index(str(path))
+    
     def search_similar(self, query: str, index: faiss.Index, texts: List[str], top_k: int = 3) -> List[Tuple[str, float]]:
         """Gemini Embedding 기반 유사도 검색"""
         if index is None or not texts:
             return []
         
         try:
-            # Gemini Embedding으로 쿼리 임베딩
-            result = genai.embed_content(
-                model="models/text-embedding-004",
-                content=query,
-                task_type="retrieval_query"
-            )
-            query_embedding = np.array([result['embedding']])
-            query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
-            
-            scores, indices = index.search(query_embedding.astype('float32'), top_k)
-            
-            results = []
-            for score, idx in zip(scores[0], indices[0]):
-                if idx < len(texts):
-                    results.append((texts[idx], float(score)))
-            
-            return results
+            return [(texts[idx], score) for idx, score in self.search_index(query, index, top_k) if idx < len(texts)]
         except Exception as e:
             print(f"❌ 검색 오류: {e}")
             return []
     
+    def search_index(self, query: str, index: faiss.Index, top_k: int = 3) -> List[Tuple[int, float]]:
+        """질의 임베딩 후 (청크 번호, 점수) 목록 (오류는 그대로 전달)"""
+        scores, indices = index.search(self.embed_query(query), top_k)
+        return [(int(idx), float(score)) for score, idx in zip(scores[0], indices[0]) if idx >= 0]
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """검색 쿼리 임베딩 (1 x 차원, 정규화된 float32)"""
+        query_embedding = np.array([call_with_deadline(
+            self.embed_guard.call,
+            self.provider.embed_content, query, task_type="retrieval_query", tokens=estimate_tokens(query)
+        )])
+        query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
+        return query_embedding.astype('float32')
+    
     def extract_variables(self, template: str) -> List[str]:
         """템플릿에서 #{변수명} 형태의 변수 추출"""
-        pattern = r'#\{([^}]+)\}'
-        variables = re.findall(pattern, template)
-        return list(set(variables))  # 중복 제거
+        return list(compile_template(template).variables)  # 등장 순서 유지, 중복 제거
     
-    def generate_with_gemini(self, prompt: str, max_retries: int = 3) -> str:
-        """Gemini로 텍스트 생성"""
-        for attempt in range(max_retries):
-            try:
-                response = self.gemini_model.generate_content(prompt)
-                return response.text.strip()
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise e
-                continue
+    def generate_with_gemini(self, prompt: str) -> str:
+        """Gemini로 텍스트 생성 (호출 제한/백오프 재시도/회로 차단 적용)"""
+        return self._generate(lambda provider: provider.generate_content(prompt), estimate_tokens(prompt))
+    
+    def generate_with_prefix(self, prefix: str, suffix: str) -> str:
+        """고정 접두부(캐시 대상)와 요청별 본문으로 생성 (접두 캐시 미지원 시 이어 붙여 전송)"""
+        return self._generate(
+            lambda provider: prefix_cache_for(provider).generate(prefix, suffix), estimate_tokens(prefix + suffix)
+        )
+    
+    def _generate(self, call, tokens: int) -> str:
+        """라우터가 있으면 현재 단계의 후보 모델 순서대로, 없으면 기본 프로바이더로 호출
+
+        헤징을 켜면 모델 하나에 대한 호출(보호 장치 포함)이 느릴 때 같은 모델로 중복 호출.
+        요청 마감이 있으면 남은 시간까지만 기다리고 DeadlineExceeded (호출 측 폴백으로 전환)
+        """
+        def guarded(provider):
+            if self.hedger is None:
+                return self.generate_guard.call(call, provider, tokens=tokens)
+            return self.hedger.call(self.generate_guard.call, call, provider, tokens=tokens)
+        
+        if self.router is None:
+            response = call_with_deadline(guarded, self.provider)
+        else:
+            response = call_with_deadline(self.router.generate, guarded, tokens=tokens)
+        return response.strip()
     
     def parse_json_response(self, response_text: str) -> Dict:
         """JSON 응답 파싱"""
@@ -163,7 +257,8 @@ class BaseTemplateProcessor:
             print(f"파일 로드 오류 {file_path}: {e}")
             return ""
     
-    def chunk_text(self, text: str, chunk_size: int = 800, chunk_overlap: int = 100) -> List[str]:
+    @staticmethod
+    def chunk_text(text: str, chunk_size: int = 800, chunk_overlap: int = 100) -> List[str]:
         """텍스트를 청크로 분할"""
         paragraphs = text.split('\n\n')
         chunks = []
@@ -0,0 +1,200 @@
+"""
+대량 메일머지 (승인된 템플릿 1개 x 수신자 파일)
+- 수신자 CSV/Parquet을 청크 단위로 읽어 메모리 사용량을 청크 크기로 제한
+- CompiledTemplate의 조각을 열 단위로 이어 붙여 렌더링 (행 단위 파이썬 루프 없음)
+- 행마다 누락 변수/길이 초과를 검사하고 결과를 청크마다 바로 기록
+
+사용 예:
+    python -m core.bulk_renderer template.txt recipients.csv messages.csv --chunk-size 100000
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from config import MAX_TEMPLATE_LENGTH
+
+from .compiled_template import SLOT_SYNONYMS, VARIABLE_SLOTS, CompiledTemplate, compile_template, placeholder
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    USE_ARROW = True
+except ImportError:
+    USE_ARROW = False
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+class BulkRenderer:
+    """템플릿 하나를 수신자 파일 전체에 렌더링"""
+
+    def __init__(
+        self,
+        template: str,
+        column_map: Optional[Dict[str, str]] = None,
+        max_length: int = MAX_TEMPLATE_LENGTH,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        keep_columns: Optional[List[str]] = None,
+    ):
+        self.compiled: CompiledTemplate = compile_template(template)
+        self.column_map = dict(column_map or {})
+        self.max_length = max_length
+        self.chunk_size = chunk_size
+        self.keep_columns = keep_columns
+
+    def resolve_columns(self, columns: List[str]) -> Dict[str, str]:
+        """변수 -> 열 이름 (명시 매핑 > 같은 이름 > 같은 엔티티 슬롯의 동의어 열)"""
+        available = set(columns)
+        resolved, unmapped = {}, []
+        for name in self.compiled.variables:
+            candidates = [self.column_map.get(name), name]
+            slot = VARIABLE_SLOTS.get(name)
+            if slot:
+                candidates.extend(SLOT_SYNONYMS[slot])
+            column = next((c for c in candidates if c and c in available), None)
+            if column is None:
+                unmapped.append(name)
+            else:
+                resolved[name] = column
+
+        if unmapped:
+            raise ValueError(f"수신자 파일에 변수 열이 없습니다: {', '.join(unmapped)}")
+        return resolved
+
+    def render_frame(self, frame: pd.DataFrame, columns: Dict[str, str]) -> pd.DataFrame:
+        """청크 하나 렌더링 + 행별 검증 결과"""
+        values = {
+            name: frame[column].fillna("").astype(str).str.strip()
+            for name, column in columns.items()
+        }
+
+        # 행별 누락 변수 (빈 값)
+        missing = pd.Series("", index=frame.index)
+        for name, series in values.items():
+            empty = series.eq("")
+            if empty.any():
+                missing = missing.where(~empty, missing + name + ",")
+        missing = missing.str.rstrip(",")
+
+        # 누락 변수는 #{변수}로 남겨 결과에서 바로 보이게 함
+        filled = {
+            name: series.where(series.ne(""), placeholder(name))
+            for name, series in values.items()
+        }
+        message = self._join(filled, frame.index)
+        length = message.str.len()
+
+        out = frame[self.keep_columns].copy() if self.keep_columns else pd.DataFrame(index=frame.index)
+        out["message"] = message
+        out["length"] = length
+        out["missing"] = missing
+        out["too_long"] = length > self.max_length
+        out["valid"] = missing.eq("") & ~out["too_long"]
+        return out
+
+    def _join(self, filled: Dict[str, pd.Series], index: pd.Index) -> pd.Series:
+        literals, fields = self.compiled.literals, self.compiled.fields
+        if USE_ARROW and fields:
+            parts = [literals[0]]
+            for name, literal in zip(fields, literals[1:]):
+                parts.append(pa.array(filled[name], pa.string()))
+                parts.append(literal)
+            joined = pc.binary_join_element_wise(*parts, "")
+            return pd.Series(joined.to_numpy(zero_copy_only=False), index=index, dtype=object)
+
+        message = pd.Series(literals[0], index=index, dtype=object)
+        for name, literal in zip(fields, literals[1:]):
+            message = message + filled[name] + literal
+        return message
+
+    def iter_chunks(self, path: Path) -> Iterator[pd.DataFrame]:
+        """수신자 파일을 청크 단위로 읽기"""
+        path = Path(path)
+        if path.suffix == ".parquet":
+            if not USE_ARROW:
+                raise ImportError("Parquet 입력에는 pyarrow가 필요합니다.")
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunk_size):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(
+                path, chunksize=self.chunk_size, dtype=str, keep_default_na=False, encoding="utf-8"
+            )
+
+    def run(self, recipients_path: Path, output_path: Path) -> Dict:
+        """수신자 파일 전체 렌더링 후 요약 반환 (출력은 청크마다 추가 기록)"""
+        output_path = Path(output_path)
+        start = time.perf_counter()
+        summary = {"rows": 0, "valid": 0, "missing": 0, "too_long": 0, "chunks": 0}
+        missing_by_variable: Dict[str, int] = {}
+        columns = None
+        writer = None
+
+        try:
+            for frame in self.iter_chunks(recipients_path):
+                if columns is None:
+                    columns = self.resolve_columns(list(frame.columns))
+                rendered = self.render_frame(frame, columns)
+
+                if output_path.suffix == ".parquet":
+                    if not USE_ARROW:
+                        raise ImportError("Parquet 출력에는 pyarrow가 필요합니다.")
+                    table = pa.Table.from_pandas(rendered, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(output_path, table.schema)
+                    writer.write_table(table)
+                else:
+                    rendered.to_csv(
+                        output_path, mode="w" if summary["chunks"] == 0 else "a",
+                        header=summary["chunks"] == 0, index=False, encoding="utf-8",
+                    )
+
+                summary["chunks"] += 1
+                summary["rows"] += len(rendered)
+                summary["valid"] += int(rendered["valid"].sum())
+                summary["missing"] += int(rendered["missing"].ne("").sum())
+                summary["too_long"] += int(rendered["too_long"].sum())
+                counts = rendered.loc[rendered["missing"].ne(""), "missing"].str.split(",").explode().value_counts()
+                for name, count in counts.items():
+                    missing_by_variable[name] = missing_by_variable.get(name, 0) + int(count)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        summary["missing_by_variable"] = missing_by_variable
+        summary["elapsed_s"] = round(time.perf_counter() - start, 3)
+        return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="템플릿 대량 메일머지")
+    parser.add_argument("template", help="승인된 템플릿 텍스트 파일")
+    parser.add_argument("recipients", help="수신자 CSV/Parquet 파일")
+    parser.add_argument("output", help="결과 CSV/Parquet 파일")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-length", type=int, default=MAX_TEMPLATE_LENGTH)
+    parser.add_argument("--keep", default="", help="결과에 함께 남길 열 (쉼표 구분, 예: 수신번호)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    renderer = BulkRenderer(
+        Path(args.template).read_text(encoding="utf-8"),
+        max_length=args.max_length,
+        chunk_size=args.chunk_size,
+        keep_columns=[c for c in args.keep.split(",") if c] or None,
+    )
+    summary = renderer.run(args.recipients, args.output)
+    print(f"✅ {summary['rows']}건 렌더링 완료 ({summary['elapsed_s']}초)")
+    print(f"   정상 {summary['valid']}건 / 변수 누락 {summary['missing']}건 / 길이 초과 {summary['too_long']}건")
+    for name, count in summary["missing_by_variable"].items():
+        print(f"   - #{{{name}}} 누락: {count}건")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+모델 호출 녹화/재생 (cassette)
+- RecordingProvider: 실제 프로바이더를 감싸 generate_content/embed_content 호출의 요청, 응답(오류), 지연을 기록
+- ReplayProvider: 녹화 파일로 네트워크 없이 같은 응답을 돌려줌 (녹화된 지연대로 또는 지연 없이)
+
+녹화 파일은 gzip JSON Lines (임베딩은 float32 base64). 같은 요청이 여러 번 녹화돼 있으면 녹화 순서대로 돌아가며 재생한다.
+접두 캐시 호출은 접두부+요청부를 이은 프롬프트로 기록하므로 재생 시 no-op 접두 캐시로 그대로 맞는다.
+
+사용 예:
+    CASSETTE_RECORD_PATH=traffic.jsonl.gz python test_template.py      # 실제 API 호출 녹화
+    CASSETTE_REPLAY_PATH=traffic.jsonl.gz python test_template.py      # 오프라인 재생
+    python -m benchmarks.run_benchmark --cassette traffic.jsonl.gz --replay-timing fast
+"""
+
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .metrics import metrics
+from .providers import PromptPrefixCache, prefix_cache_for
+
+CASSETTE_VERSION = 1
+REPLAY_TIMINGS = ("recorded", "fast")
+
+
+class CassetteMiss(RuntimeError):
+    """녹화에 없는 요청"""
+
+
+class ReplayedError(RuntimeError):
+    """녹화 당시 실패한 호출을 재생"""
+
+
+def request_key(op: str, payload: str, task_type: Optional[str] = None) -> str:
+    """요청 식별자 (모델 이름은 라우팅에 따라 달라지므로 제외)"""
+    digest = hashlib.sha256(f"{op}\0{task_type or ''}\0".encode("utf-8"))
+    digest.update(payload.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def _encode_embedding(vector) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_embedding(data: str) -> List[float]:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32).tolist()
+
+
+class CassetteWriter:
+    """녹화 파일 기록기 (스레드 안전, 경로의 {pid}는 프로세스 id로 치환해 워커별 파일로 분리)"""
+
+    def __init__(self, path, flush_every: int = 32):
+        self.path = Path(str(path).format(pid=os.getpid()))
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+        self._start = time.monotonic()
+        atexit.register(self.close)
+
+    def write(self, entry: Dict) -> None:
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = gzip.open(self.path, "ab")   # 이어 쓰면 gzip 멤버가 추가되고 읽을 때 이어짐
+            self._file.write(line)
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._file.flush()
+                self._pending = 0
+
+    def elapsed(self) -> float:
+        return round(time.monotonic() - self._start, 6)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_cassette(path) -> List[Dict]:
+    """녹화 항목 목록 (녹화 순서)"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingProvider:
+    """프로바이더 호출을 녹화하는 래퍼 (같은 인터페이스)"""
+
+    def __init__(self, provider, writer: CassetteWriter):
+        self.provider = provider
+        self.writer = writer
+        self.model_name = getattr(provider, "model_name", "")
+        self.embedding_model = getattr(provider, "embedding_model", "")
+        self.prefix_cache = _RecordingPrefixCache(self, prefix_cache_for(provider))
+
+    def generate_content(self, prompt: str) -> str:
+        return self._record("generate", prompt, None, lambda: self.provider.generate_content(prompt))
+
+    def embed_content(self, text: str, task_type: str = "retrieval_document") -> List[float]:
+        return self._record("embed", text, task_type, lambda: self.provider.embed_content(text, task_type=task_type))
+
+    def _record(self, op: str, payload: str, task_type: Optional[str], call: Callable):
+        entry = {
+            "op": op,
+            "key": request_key(op, payload, task_type),
+            "model": self.embedding_model if op == "embed" else self.model_name,
+            "t": self.writer.elapsed(),
+            "request": payload,
+        }
+        if task_type:
+            entry["task_type"] = task_type
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            entry.update(latency=round(time.perf_counter() - start, 6), error=f"{type(e).__name__}: {e}")
+            self.writer.write(entry)
+            raise
+        entry["latency"] = round(time.perf_counter() - start, 6)
+        if op == "embed":
+            entry["embedding"] = _encode_embedding(result)
+        else:
+            entry["response"] = result
+        self.writer.write(entry)
+        return result
+
+
+class _RecordingPrefixCache(PromptPrefixCache):
+    """감싼 프로바이더의 접두 캐시를 그대로 쓰고, 이은 프롬프트 기준으로 녹화"""
+
+    def __init__(self, recorder: RecordingProvider, inner: PromptPrefixCache):
+        super().__init__(recorder)
+        self.inner = inner
+
+    def generate(self, prefix: str, suffix: str) -> str:
+        return self.provider._record("generate", prefix + suffix, None, lambda: self.inner.generate(prefix, suffix))
+
+
+class ReplayProvider:
+    """녹화 파일 재생 프로바이더
+
+    timing="recorded"면 녹화된 지연(÷speed)만큼 기다린 뒤 응답, "fast"면 바로 응답.
+    녹화에 없는 요청은 fallback 프로바이더로 넘기거나(있으면) CassetteMiss.
+    """
+
+    def __init__(
+        self,
+        path,
+        timing: str = "recorded",
+        speed: float = 1.0,
+        fallback=None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if timing not in REPLAY_TIMINGS:
+            raise ValueError(f"timing은 {REPLAY_TIMINGS} 중 하나: {timing}")
+        self.timing = timing
+        self.speed = speed
+        self.fallback = fallback
+        self.sleep = sleep
+        self.model_name = "replay"
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict]] = {}
+        self._cursor: Dict[str, int] = {}
+        embedding_models = set()
+        for entry in read_cassette(path):
+            self._entries.setdefault(entry["key"], []).append(entry)
+            if entry["op"] == "embed":
+                embedding_models.add(entry.get("model", ""))
+        # 임베딩 공간이 같아야 저장된 인덱스를 공유하므로 녹화 당시 임베딩 모델 이름 유지
+        self.embedding_model = ",".join(sorted(embedding_models)) or "replay"
+        self.calls = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def generate_content(self, prompt: str) -> str:
+        entry = self._next("generate", prompt, None)
+        if entry is None:
+            return self.fallback.generate_content(prompt)
+        return entry["response"]
+
+    def embed_content(self, text: str, task_type: str = "retrieval_document") -> List[float]:
+        entry = self._next("embed", text, task_type)
+        if entry is None:
+            return self.fallback.embed_content(text, task_type=task_type)
+        return _decode_embedding(entry["embedding"])
+
+    def _next(self, op: str, payload: str, task_type: Optional[str]) -> Optional[Dict]:
+        key = request_key(op, payload, task_type)
+        with self._lock:
+            self.calls += 1
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+            else:
+                position = self._cursor.get(key, 0)
+                self._cursor[key] = position + 1
+                entry = entries[position % len(entries)]
+
+        if not entries:
+            metrics.increment("cassette_misses_total", op=op)
+            if self.fallback is None:
+                raise CassetteMiss(f"녹화에 없는 {op} 요청: {payload[:60]!r}")
+            return None
+
+        metrics.increment("cassette_replays_total", op=op)
+        if self.timing == "recorded" and entry["latency"] > 0:
+            self.sleep(entry["latency"] / self.speed)
+        if "error" in entry:
+            raise ReplayedError(entry["error"])
+        return entry
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self),
+                "calls": self.calls,
+                "misses": self.misses,
+                "hit_rate": round(1 - self.misses / self.calls, 4) if self.calls else 0.0,
+            }
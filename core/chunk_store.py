@@ -0,0 +1,108 @@
+"""
+메모리 매핑 청크 저장소
+청크 텍스트를 파일 하나(오프셋 테이블 + UTF-8 본문)에 저장하고 mmap으로 연다.
+검색 결과(top-k)에 해당하는 청크만 그때그때 디코딩하므로, 여러 워커 프로세스가
+힙 복사본 없이 페이지 캐시의 한 사본을 공유한다.
+
+파일 구조:
+    MAGIC(8) | count(uint64) | text_offsets(uint64 x count+1) | source_offsets(uint64 x count+1)
+    | text 본문 | source 본문 (청크별 출처는 SOURCE_SEPARATOR로 구분)
+"""
+
+import mmap
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+MAGIC = b"JCHUNK01"
+SOURCE_SEPARATOR = "\x1f"
+_HEADER = len(MAGIC) + 8
+
+
+def write_chunk_store(path: Path, texts: Sequence[str], sources: Optional[Sequence[List[str]]] = None) -> None:
+    """청크 저장소 파일 생성 (임시 파일에 쓴 뒤 교체)"""
+    path = Path(path)
+    encoded_texts = [text.encode("utf-8") for text in texts]
+    encoded_sources = [
+        SOURCE_SEPARATOR.join(chunk_sources).encode("utf-8")
+        for chunk_sources in (sources if sources is not None else [[] for _ in texts])
+    ]
+    count = len(encoded_texts)
+    text_offsets = np.zeros(count + 1, dtype="<u8")
+    np.cumsum([len(b) for b in encoded_texts], out=text_offsets[1:])
+    source_offsets = np.zeros(count + 1, dtype="<u8")
+    np.cumsum([len(b) for b in encoded_sources], out=source_offsets[1:])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(count).astype("<u8").tobytes())
+        f.write(text_offsets.tobytes())
+        f.write(source_offsets.tobytes())
+        for blob in encoded_texts:
+            f.write(blob)
+        for blob in encoded_sources:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class _LazySources(Sequence):
+    """청크별 출처 목록 (접근 시 디코딩)"""
+
+    def __init__(self, store: "ChunkStore"):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, i: int) -> List[str]:
+        return self._store.sources_of(i)
+
+
+class ChunkStore(Sequence):
+    """읽기 전용 mmap 청크 목록 (list처럼 len/인덱싱/순회 가능)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"청크 저장소 형식이 아닙니다: {self.path}")
+
+        count = int(np.frombuffer(self._mmap, dtype="<u8", count=1, offset=len(MAGIC))[0])
+        self._text_offsets = np.frombuffer(self._mmap, dtype="<u8", count=count + 1, offset=_HEADER)
+        self._source_offsets = np.frombuffer(
+            self._mmap, dtype="<u8", count=count + 1, offset=_HEADER + 8 * (count + 1)
+        )
+        self._text_base = _HEADER + 16 * (count + 1)
+        self._source_base = self._text_base + int(self._text_offsets[-1])
+        self._count = count
+        self.sources = _LazySources(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        start = self._text_base + int(self._text_offsets[i])
+        end = self._text_base + int(self._text_offsets[i + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self[i]
+
+    def sources_of(self, i: int) -> List[str]:
+        start = self._source_base + int(self._source_offsets[i])
+        end = self._source_base + int(self._source_offsets[i + 1])
+        raw = self._mmap[start:end].decode("utf-8")
+        return raw.split(SOURCE_SEPARATOR) if raw else []
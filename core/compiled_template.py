@@ -0,0 +1,91 @@
+"""
+컴파일된 템플릿
+템플릿을 한 번만 파싱해 고정 문자열 조각과 #{변수} 조각으로 나눠 두고,
+변수 추출과 렌더링은 파싱 결과를 재사용한다 (렌더링 = 조각 join).
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Mapping, Optional, Tuple
+
+VARIABLE_PATTERN = re.compile(r"#\{([^}]+)\}")
+
+# 엔티티 슬롯(extracted_info 키)별 동의어 변수명
+SLOT_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "dates": ("일시", "날짜", "시간", "적용일", "방문일정", "예약일정", "행사일시"),
+    "names": ("수신자명", "수신자", "고객명", "보호자명", "회원명"),
+    "locations": ("장소", "매장명", "주소", "위치", "행사장소"),
+    "events": ("행사명", "이벤트명", "활동명", "프로그램명"),
+}
+
+VARIABLE_SLOTS: Dict[str, str] = {
+    name: slot for slot, names in SLOT_SYNONYMS.items() for name in names
+}
+
+
+def placeholder(name: str) -> str:
+    """변수명 -> #{변수명}"""
+    return "#{" + name + "}"
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """literals[i] + #{fields[i]} + ... + literals[-1] 형태로 파싱된 템플릿"""
+
+    source: str
+    literals: Tuple[str, ...]
+    fields: Tuple[str, ...]
+    variables: Tuple[str, ...] = field(init=False)
+    slots: Dict[str, str] = field(init=False, compare=False)
+
+    def __post_init__(self):
+        # 등장 순서를 유지한 중복 없는 변수 목록과 엔티티 슬롯 매핑
+        variables = tuple(dict.fromkeys(self.fields))
+        object.__setattr__(self, "variables", variables)
+        object.__setattr__(self, "slots", {
+            name: VARIABLE_SLOTS[name] for name in variables if name in VARIABLE_SLOTS
+        })
+
+    @classmethod
+    def parse(cls, template: str) -> "CompiledTemplate":
+        parts = VARIABLE_PATTERN.split(template)
+        return cls(template, tuple(parts[0::2]), tuple(parts[1::2]))
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """변수 값으로 채운 문자열 (값이 없는 변수는 #{변수} 그대로 유지)"""
+        out = [self.literals[0]]
+        for name, literal in zip(self.fields, self.literals[1:]):
+            value = values.get(name)
+            out.append(placeholder(name) if value is None else str(value))
+            out.append(literal)
+        return "".join(out)
+
+    def entity_values(self, entities: Dict) -> Dict[str, str]:
+        """엔티티 슬롯별 첫 번째 값을 동의어 변수에 매핑"""
+        extracted_info = entities.get("extracted_info", {})
+        values = {}
+        for name, slot in self.slots.items():
+            candidates = extracted_info.get(slot)
+            if candidates:
+                values[name] = candidates[0]
+        return values
+
+    def render_entities(self, entities: Dict) -> str:
+        """추출된 엔티티로 채운 문자열"""
+        return self.render(self.entity_values(entities))
+
+    def missing(self, values: Mapping[str, Optional[str]]) -> Tuple[str, ...]:
+        """값이 없거나 빈 변수 목록"""
+        return tuple(name for name in self.variables if not values.get(name))
+
+    @property
+    def static_length(self) -> int:
+        """변수를 제외한 고정 문자열 길이 (렌더링 결과 길이 = 고정 길이 + 변수 값 길이 합)"""
+        return sum(len(literal) for literal in self.literals)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(template: str) -> CompiledTemplate:
+    """파싱 결과를 캐시하는 컴파일 진입점"""
+    return CompiledTemplate.parse(template)
@@ -0,0 +1,92 @@
+"""
+요청 단위 마감 시각 (end-to-end deadline)
+요청마다 마감 시각을 컨텍스트 변수로 두고, 단계와 모델 호출이 남은 시간을 확인해 그 안에서만 기다린다.
+submit_with_context로 넘긴 작업에도 그대로 전파되며, 안쪽 범위는 바깥 마감보다 늦어질 수 없다.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from .metrics import current_stage, metrics, submit_with_context
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class DeadlineExceeded(TimeoutError):
+    """요청 마감 시각 초과"""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[Optional[float]]:
+    """지금부터 seconds 안에 끝나야 하는 범위 (None이면 바깥 마감 유지). 마감 시각(monotonic) 반환"""
+    outer = _deadline.get()
+    deadline = outer
+    if seconds is not None:
+        deadline = time.monotonic() + max(0.0, seconds)
+        if outer is not None:
+            deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """남은 시간(초), 마감이 없으면 None"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def has_time(seconds: float) -> bool:
+    """seconds 이상 남았는지 (마감이 없으면 항상 True)"""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def bounded(timeout: Optional[float]) -> Optional[float]:
+    """기존 제한 시간을 남은 시간으로 줄임"""
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+
+def check() -> None:
+    """마감이 지났으면 DeadlineExceeded"""
+    if remaining() == 0.0:
+        raise DeadlineExceeded(f"{current_stage() or '요청'} 단계에서 마감 시각 초과")
+
+
+def call_with_deadline(fn: Callable, *args, **kwargs):
+    """마감이 있으면 남은 시간까지만 기다림 (중단할 수 없는 호출은 백그라운드에서 끝나도록 둠)"""
+    left = remaining()
+    if left is None:
+        return fn(*args, **kwargs)
+    check()
+
+    future = submit_with_context(_get_executor(), fn, *args, **kwargs)
+    try:
+        return future.result(timeout=left)
+    except FutureTimeoutError:
+        future.cancel()
+        metrics.increment("deadline_exceeded_total", stage=current_stage() or "none")
+        raise DeadlineExceeded(f"{current_stage() or '요청'} 단계 호출이 마감 전에 끝나지 않음 ({left:.2f}초)")
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="deadline")
+        return _executor
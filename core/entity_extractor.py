@@ -1,32 +1,74 @@
 import json
-from typing import Dict, List
+import re
+from typing import Dict, List, Optional
 from .base_processor import BaseTemplateProcessor
+from .metrics import metrics
+from .micro_batch import MicroBatcher
 
-class EntityExtractor(BaseTemplateProcessor):
-    """엔티티 추출 전용 클래스"""
-    
-    def __init__(self, api_key: str, gemini_model: str = "gemini-2.0-flash-exp"):
-        super().__init__(api_key, gemini_model)
-    
-    def extract_entities(self, user_input: str) -> Dict:
-        """사용자 입력에서 엔티티 추출"""
-        prompt = self._create_entity_extraction_prompt(user_input)
-        
-        try:
-            response = self.generate_with_gemini(prompt)
-            return self.parse_json_response(response)
-        except Exception as e:
-            print(f"엔티티 추출 오류: {e}")
-            return self._create_fallback_entities(user_input)
-    
-    def _create_entity_extraction_prompt(self, user_input: str) -> str:
-        """엔티티 추출 프롬프트 생성"""
-        return f"""
-다음 사용자 입력에서 구체적인 정보들을 추출해서 JSON 형태로 반환해주세요:
+# 규칙 기반 추출 (LLM 호출 실패 또는 마감 시간 부족 시 사용)
+_DATE_PATTERN = re.compile(
+    r"\d{4}[./-]\s*\d{1,2}[./-]\s*\d{1,2}"
+    r"|\d{1,2}월\s*\d{1,2}일"
+    r"|(?:오전|오후)\s*\d{1,2}시(?:\s*\d{1,2}분)?"
+    r"|오늘|내일|모레|글피"
+)
+_NAME_PATTERN = re.compile(r"([가-힣]{2,4}?)(?:님|씨|에게)")
+_NOT_NAMES = {"고객", "고객들", "회원", "회원들", "여러분", "어머", "아버", "선생", "사장", "담당자", "기존"}
+_LOCATION_PATTERN = re.compile(
+    r"(?:[가-힣A-Za-z0-9]{2,}?(?:점|지점|센터|매장|병원|학교|호텔|역)|[가-힣A-Za-z0-9]*어린이집)"
+    r"(?=$|[^가-힣]|에서|에|으로|로|을|를|의|은|는|이|가)"
+)
+_EVENT_PATTERN = re.compile(r"[가-힣A-Za-z0-9]*(?:이벤트|행사|세미나|바자회|설명회|프로모션|축제|캠페인)")
+_INTENT_KEYWORDS = [
+    ("예약확인", ("예약",)),
+    ("결제알림", ("결제", "청구", "납부")),
+    ("배송안내", ("배송", "택배", "출고")),
+    ("가격변경안내", ("가격", "요금")),
+    ("행사안내", ("이벤트", "행사", "세미나", "바자회", "설명회", "축제")),
+]
+_AD_KEYWORDS = ("광고", "홍보", "할인", "쿠폰", "프로모션")
+DEFAULT_INTENT = "일반안내"
+CANONICAL_INTENTS = dict(_INTENT_KEYWORDS)   # 정규화된 의도 이름 → 키워드 (의도별 사전 계산 검색에 사용)
+# 같은 의도의 다른 표기 (공백 제거 후 비교). 여기 없는 표현은 사전 계산 결과를 쓰지 않음
+INTENT_ALIASES = {
+    "예약안내": "예약확인",
+    "예약확인안내": "예약확인",
+    "예약완료": "예약확인",
+    "결제안내": "결제알림",
+    "결제완료": "결제알림",
+    "결제완료알림": "결제알림",
+    "배송알림": "배송안내",
+    "배송시작안내": "배송안내",
+    "출고안내": "배송안내",
+    "가격변경": "가격변경안내",
+    "가격변경알림": "가격변경안내",
+    "요금변경안내": "가격변경안내",
+    "이벤트안내": "행사안내",
+    "행사알림": "행사안내",
+    "세미나안내": "행사안내",
+}
 
-사용자 입력: "{user_input}"
 
-다음 정보들을 찾아서 추출해주세요:
+def canonical_intent(intent: str) -> str:
+    """모델이 돌려준 의도 표현("예약 확인", "행사 안내 메시지" 등)을 규칙 기반 의도 이름으로 정규화
+
+    키워드 부분 일치라 "예약취소"도 예약확인이 되므로 추측 초안 일치 판단처럼 대략적인 비교에만 사용
+    """
+    text = re.sub(r"\s+", "", intent or "")
+    for name, keywords in _INTENT_KEYWORDS:
+        if text == name or any(keyword in text for keyword in keywords):
+            return name
+    return text or DEFAULT_INTENT
+
+
+def exact_intent(intent: str) -> Optional[str]:
+    """정규화된 의도 이름 또는 INTENT_ALIASES 표기와 (공백만 무시하고) 정확히 같을 때의 의도 이름, 아니면 None"""
+    text = re.sub(r"\s+", "", intent or "")
+    if text in CANONICAL_INTENTS:
+        return text
+    return INTENT_ALIASES.get(text)
+
+_ENTITY_FIELDS_GUIDE = """다음 정보들을 찾아서 추출해주세요:
 - 날짜/시간 정보 (예: 2025.8.26, 오후 2시 등)
 - 사람 이름 (예: 홍길동 등)
 - 장소/위치 (예: 강남점 등)
@@ -34,37 +76,123 @@ class EntityExtractor(BaseTemplateProcessor):
 - 기타 중요 정보 (가격, 상품명, 서비스명 등)
 
 JSON 형태:
-{{
-    "extracted_info": {{
+{
+    "extracted_info": {
         "dates": ["추출된 날짜들"],
         "names": ["추출된 이름들"], 
         "locations": ["추출된 장소들"],
         "events": ["추출된 이벤트들"],
         "others": ["기타 중요 정보들"]
-    }},
+    },
     "message_intent": "메시지의 주요 목적 (예: 행사안내, 예약확인, 결제알림 등)",
     "context": "전체적인 상황/맥락 설명",
     "message_type": "메시지 유형 (정보성/광고성 판단)",
     "urgency_level": "긴급도 (높음/보통/낮음)",
     "target_audience": "대상 고객층"
-}}
+}
 """
+
+class EntityExtractor(BaseTemplateProcessor):
+    """엔티티 추출 전용 클래스"""
+    
+    def __init__(self, api_key: str, gemini_model: str = "gemini-2.0-flash-exp", provider=None, router=None):
+        super().__init__(api_key, gemini_model, provider, router)
+        self.batcher = None  # enable_batching으로 켜면 동시 요청의 추출을 한 번의 호출로 묶음
+    
+    def enable_batching(self, window: float = 0.01, max_size: int = 8) -> None:
+        """window초 동안 들어온 추출 요청을 최대 max_size개까지 묶어 한 번에 호출"""
+        self.batcher = MicroBatcher(self._extract_entities_batch, window=window, max_size=max_size, name="entities")
+    
+    def extract_entities(self, user_input: str) -> Dict:
+        """사용자 입력에서 엔티티 추출"""
+        try:
+            if self.batcher is not None:
+                try:
+                    return self.batcher.submit(user_input)
+                except ValueError as e:
+                    # 묶음 응답을 파싱할 수 없으면 요청마다 개별 호출 (호출 자체의 실패는 아래 폴백)
+                    print(f"⚠️ 엔티티 묶음 응답 파싱 실패 - 개별 호출로 전환: {e}")
+                    metrics.increment("fallbacks_total", kind="entity_batch")
+            return self._extract_entities_single(user_input)
+        except Exception as e:
+            print(f"엔티티 추출 오류: {e}")
+            metrics.increment("fallbacks_total", kind="entities")
+            return self._create_fallback_entities(user_input)
+    
+    def _extract_entities_single(self, user_input: str) -> Dict:
+        response = self.generate_with_gemini(self._create_entity_extraction_prompt(user_input))
+        return self.parse_json_response(response)
+    
+    def _extract_entities_batch(self, user_inputs: List[str]) -> List[Dict]:
+        """묶음 추출 (하나뿐이면 개별 프롬프트). 응답이 입력과 하나씩 대응하지 않으면 ValueError"""
+        if len(user_inputs) == 1:
+            return [self._extract_entities_single(user_inputs[0])]
+        
+        response = self.generate_with_gemini(self._create_batch_entity_extraction_prompt(user_inputs))
+        text = response[response.find('['):response.rfind(']') + 1]
+        items = json.loads(text) if text else None
+        if not isinstance(items, list) or len(items) != len(user_inputs):
+            raise ValueError(f"묶음 응답이 {len(user_inputs)}개 항목의 배열이 아닙니다.")
+        
+        results = [None] * len(user_inputs)
+        for position, item in enumerate(items):
+            if not isinstance(item, dict) or "extracted_info" not in item:
+                raise ValueError("묶음 응답 항목 형식 오류")
+            index = item.pop("index", position + 1)
+            if not isinstance(index, int) or not 1 <= index <= len(results) or results[index - 1] is not None:
+                raise ValueError(f"묶음 응답 index 오류: {index}")
+            results[index - 1] = item
+        return results
+    
+    def _create_entity_extraction_prompt(self, user_input: str) -> str:
+        """엔티티 추출 프롬프트 생성"""
+        return f"""
+다음 사용자 입력에서 구체적인 정보들을 추출해서 JSON 형태로 반환해주세요:
+
+사용자 입력: "{user_input}"
+
+{_ENTITY_FIELDS_GUIDE}"""
+    
+    def _create_batch_entity_extraction_prompt(self, user_inputs: List[str]) -> str:
+        """여러 입력을 한 번에 추출하는 프롬프트 (결과는 입력 순서의 JSON 배열)"""
+        numbered = "\n".join(
+            f"{i}. {json.dumps(user_input, ensure_ascii=False)}" for i, user_input in enumerate(user_inputs, 1)
+        )
+        return f"""
+다음 {len(user_inputs)}개 사용자 입력 각각에서 구체적인 정보들을 추출해서 JSON 배열로 반환해주세요.
+배열에는 입력마다 원소 하나씩, 입력 번호를 "index"에 넣어 입력 순서대로 담아주세요.
+
+사용자 입력 목록:
+{numbered}
+
+각 입력에 대해 {_ENTITY_FIELDS_GUIDE.replace("JSON 형태:", "원소의 JSON 형태 (index 포함):", 1)}"""
     
     def _create_fallback_entities(self, user_input: str) -> Dict:
-        """오류 시 기본 엔티티 반환"""
+        """오류 시 기본 엔티티 반환 (규칙 기반 추출)"""
+        return self.extract_entities_by_rules(user_input)
+    
+    @staticmethod
+    def extract_entities_by_rules(user_input: str) -> Dict:
+        """정규식/키워드 규칙으로 엔티티 추출 (모델 호출 없음)"""
+        names = [name for name in _NAME_PATTERN.findall(user_input) if name not in _NOT_NAMES]
+        intent = next(
+            (intent for intent, keywords in _INTENT_KEYWORDS if any(k in user_input for k in keywords)),
+            DEFAULT_INTENT,
+        )
         return {
             "extracted_info": {
-                "dates": [],
-                "names": [],
-                "locations": [],
-                "events": [],
+                "dates": list(dict.fromkeys(_DATE_PATTERN.findall(user_input))),
+                "names": list(dict.fromkeys(names)),
+                "locations": list(dict.fromkeys(_LOCATION_PATTERN.findall(user_input))),
+                "events": list(dict.fromkeys(e for e in _EVENT_PATTERN.findall(user_input) if e)),
                 "others": []
             },
-            "message_intent": "일반안내",
+            "message_intent": intent,
             "context": user_input,
-            "message_type": "정보성",
+            "message_type": "광고성" if any(k in user_input for k in _AD_KEYWORDS) else "정보성",
             "urgency_level": "보통",
-            "target_audience": "일반고객"
+            "target_audience": "일반고객",
+            "extraction_method": "rules"
         }
     
     def enhance_entities(self, entities: Dict, additional_context: str = "") -> Dict:
@@ -0,0 +1,170 @@
+"""
+요청 헤징 (tail latency 단축)
+호출이 최근 지연의 백분위(예: p95)까지 끝나지 않으면 같은 호출을 하나 더 보내고 먼저 끝난 결과를 쓴다.
+추가 호출은 예산(전체 호출 대비 비율)으로 제한하고, 헤징 비율과 승률(헤지 호출이 먼저 끝난 비율)을 기록한다.
+
+진 쪽 호출은 아직 시작 전이면 취소하고, 이미 실행 중이면 결과만 버린다 (SDK 호출은 중단 불가).
+지연 분포는 단계(core.metrics.current_stage)별로 따로 유지한다.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional
+
+from .metrics import current_stage, metrics, submit_with_context
+
+
+class LatencyWindow:
+    """최근 지연 샘플(초) 고정 크기 창"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Hedger:
+    """백분위 지연 초과 시 중복 호출 (예산 내에서만)
+
+    예산: 호출마다 budget만큼 적립되고 헤지 한 번에 1 차감 (적립 상한 burst)
+    """
+
+    def __init__(
+        self,
+        kind: str = "generate",
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        burst: float = 5.0,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        window: int = 200,
+        max_workers: int = 64,
+    ):
+        self.kind = kind
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window_size = window
+
+        self._lock = threading.Lock()
+        self._windows: Dict[str, LatencyWindow] = {}
+        self._credit = 0.0
+        self._calls = 0
+        self._hedged = 0
+        self._wins = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hedge-{kind}")
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """fn(*args, **kwargs) 실행 (필요하면 헤지). 헤지한 두 호출이 모두 실패하면 나중 예외 전달"""
+        stage = current_stage() or "none"
+        delay = self._hedge_delay(stage)
+        start = time.perf_counter()
+
+        if delay is None:
+            result = fn(*args, **kwargs)
+            self._observe(stage, time.perf_counter() - start)
+            return result
+
+        primary = submit_with_context(self._executor, fn, *args, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_budget():
+            if not done:
+                metrics.increment("hedge_skipped_total", kind=self.kind, stage=stage, reason="budget")
+            result = primary.result()
+            self._observe(stage, time.perf_counter() - start)
+            return result
+
+        metrics.increment("hedges_total", kind=self.kind, stage=stage)
+        hedge = submit_with_context(self._executor, fn, *args, **kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    loser.cancel()
+                if future is hedge:
+                    with self._lock:
+                        self._wins += 1
+                    metrics.increment("hedge_wins_total", kind=self.kind, stage=stage)
+                self._observe(stage, time.perf_counter() - start)
+                return future.result()
+        raise error
+
+    def _hedge_delay(self, stage: str) -> Optional[float]:
+        """헤지 전 대기 시간 (샘플이 부족하면 None = 헤징 안 함)"""
+        with self._lock:
+            self._calls += 1
+            self._credit = min(self.burst, self._credit + self.budget)
+            window = self._windows.get(stage)
+            if window is None or len(window) < self.min_samples:
+                return None
+            return max(self.min_delay, window.percentile(self.percentile))
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._credit < 1.0:
+                return False
+            self._credit -= 1.0
+            self._hedged += 1
+            return True
+
+    def _observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            window = self._windows.get(stage)
+            if window is None:
+                window = self._windows[stage] = LatencyWindow(self.window_size)
+            window.add(seconds)
+
+    def stats(self) -> Dict[str, float]:
+        """헤징 비율(헤지 수/호출 수)과 승률(헤지가 먼저 끝난 비율)"""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "hedged": self._hedged,
+                "hedge_wins": self._wins,
+                "hedge_rate": round(self._hedged / self._calls, 4) if self._calls else 0.0,
+                "win_rate": round(self._wins / self._hedged, 4) if self._hedged else 0.0,
+            }
+
+
+_hedgers: Dict[str, Optional[Hedger]] = {}
+_hedgers_lock = threading.Lock()
+
+
+def configure_hedging(**options: Optional[Dict]) -> None:
+    """종류별 헤징 재구성 (예: generate={"percentile": 0.9, "budget": 0.1}, None이면 끔)"""
+    with _hedgers_lock:
+        for kind, kind_options in options.items():
+            _hedgers[kind] = Hedger(kind, **kind_options) if kind_options is not None else None
+
+
+def get_hedger(kind: str) -> Optional[Hedger]:
+    """종류별 프로세스 전역 헤저 (설정에서 꺼져 있으면 None)"""
+    with _hedgers_lock:
+        if kind not in _hedgers:
+            _hedgers[kind] = _build_hedger(kind)
+        return _hedgers[kind]
+
+
+def _build_hedger(kind: str) -> Optional[Hedger]:
+    from config import HEDGE_BUDGET, HEDGE_GENERATION, HEDGE_MIN_SAMPLES, HEDGE_PERCENTILE
+
+    if kind != "generate" or not HEDGE_GENERATION:
+        return None
+    return Hedger(kind, percentile=HEDGE_PERCENTILE, budget=HEDGE_BUDGET, min_samples=HEDGE_MIN_SAMPLES)
@@ -0,0 +1,116 @@
+"""
+의도별 사전 계산 가이드라인 검색 결과
+가이드라인 검색 질의(사용자 입력 + 의도)의 상위 청크는 의도에 따라 거의 정해지므로,
+정규화된 의도(CANONICAL_INTENTS)마다 대표 질의로 미리 검색해 인덱스 번들에 함께 저장한다.
+요청의 의도가 의도 이름이나 별칭(INTENT_ALIASES)과 정확히 같으면 질의 임베딩과 벡터 검색 없이 저장된 청크를 쓰고,
+그 밖의 의도("예약취소" 등)는 실시간 검색.
+
+번들 파일(intent_guidelines.json):
+    {"version": 1, "top_k": 3, "queries": {의도: 대표 질의}, "results": {의도: [청크 번호, ...]}}
+질의 목록이나 top_k가 바뀌면(의도 키워드 수정 등) 다시 계산한다.
+
+인덱스 번들을 만들 때(prefork 워밍업, 시작 시 가이드라인 인덱스 구축) 함께 계산되며, 미리 만들어 확인하려면:
+    python -m core.intent_guidelines            # INDEX_CACHE_DIR 번들에 계산/저장 후 의도별 결과 출력
+    python -m core.intent_guidelines --fake     # FakeProvider 임베딩
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .entity_extractor import CANONICAL_INTENTS, exact_intent
+
+INTENT_GUIDELINES_FILE = "intent_guidelines.json"
+INTENT_GUIDELINES_VERSION = 1
+
+
+def intent_queries(intents: Mapping[str, Sequence[str]] = CANONICAL_INTENTS) -> Dict[str, str]:
+    """의도별 대표 질의 (의도 이름 + 키워드)"""
+    return {intent: " ".join([intent, *keywords]) for intent, keywords in intents.items()}
+
+
+class IntentGuidelines:
+    """의도 → 사전 계산된 상위 가이드라인 청크"""
+
+    def __init__(self, results: Mapping[str, List[int]], texts: Sequence[str]):
+        self.results = dict(results)
+        self.texts = texts
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def lookup(self, intent: str) -> Optional[List[str]]:
+        """의도 이름/별칭과 정확히 같은 의도의 청크 목록 (사전 계산되지 않은 의도면 None)"""
+        name = exact_intent(intent)
+        ids = self.results.get(name) if name is not None else None
+        if ids is None:
+            return None
+        return [self.texts[i] for i in ids if 0 <= i < len(self.texts)]
+
+    @classmethod
+    def load_or_build(
+        cls,
+        bundle_dir: Optional[Path],
+        texts: Sequence[str],
+        search: Callable[[str, int], List[Tuple[int, float]]],
+        top_k: int = 3,
+        queries: Optional[Dict[str, str]] = None,
+    ) -> "IntentGuidelines":
+        """번들에 저장된 결과를 열거나, 없으면 search(질의, top_k) -> [(청크 번호, 점수)]로 계산해 저장
+
+        bundle_dir이 None이면(인덱스를 저장하지 못한 경우) 메모리에서만 사용
+        """
+        queries = queries if queries is not None else intent_queries()
+        path = Path(bundle_dir) / INTENT_GUIDELINES_FILE if bundle_dir else None
+
+        if path is not None and path.exists():
+            try:
+                stored = json.loads(path.read_text(encoding="utf-8"))
+                if (
+                    stored.get("version") == INTENT_GUIDELINES_VERSION
+                    and stored.get("top_k") == top_k
+                    and stored.get("queries") == queries
+                ):
+                    return cls(stored["results"], texts)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 의도별 가이드라인 결과 읽기 실패 - 다시 계산: {e}")
+
+        results = {intent: [int(i) for i, _ in search(query, top_k)] for intent, query in queries.items()}
+        if path is not None:
+            payload = {"version": INTENT_GUIDELINES_VERSION, "top_k": top_k, "queries": queries, "results": results}
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"⚠️ 의도별 가이드라인 결과 저장 실패: {e}")
+        return cls(results, texts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="의도별 가이드라인 검색 결과 사전 계산")
+    parser.add_argument("--cache-dir", type=Path, help="인덱스 번들 디렉터리 (기본 INDEX_CACHE_DIR)")
+    parser.add_argument("--fake", action="store_true", help="FakeProvider 임베딩 사용")
+    args = parser.parse_args(argv)
+
+    from main import TemplateSystem
+
+    provider = None
+    if args.fake:
+        from benchmarks import FakeProvider
+        provider = FakeProvider()
+    system = TemplateSystem(provider=provider, index_cache_dir=args.cache_dir, background_index=False)
+    intent_guidelines = system._guideline_backend[3] if system._guideline_backend[0] == "vector" else None
+    if intent_guidelines is None:
+        raise SystemExit("❌ 가이드라인 벡터 인덱스 또는 사전 계산 결과가 없습니다.")
+
+    print(json.dumps(
+        {intent: [text[:60] for text in intent_guidelines.lookup(intent)] for intent in intent_guidelines.results},
+        ensure_ascii=False, indent=2,
+    ))
+
+
+if __name__ == "__main__":
+    main()
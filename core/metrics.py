@@ -0,0 +1,196 @@
+"""
+파이프라인 계측 (단계별 타이밍 스팬 + 카운터)
+- 요청 ID는 contextvars로 전파되며, 스레드 풀에 넘길 때는 submit_with_context 사용
+- Prometheus 텍스트 포맷 또는 JSON Lines로 내보내기
+"""
+
+import contextvars
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 스팬 지연 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+_current_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("stage", default=None)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def current_request_id() -> Optional[str]:
+    """현재 컨텍스트의 요청 ID"""
+    return _request_id.get()
+
+
+def current_stage() -> Optional[str]:
+    """현재 실행 중인 스팬(단계) 이름"""
+    return _current_stage.get()
+
+
+@contextmanager
+def request_context(request_id: str = None) -> Iterator[str]:
+    """요청 ID를 컨텍스트에 설정 (하위 단계와 모델 호출에 자동 전파)"""
+    request_id = request_id or _request_id.get() or uuid.uuid4().hex[:12]
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    """현재 컨텍스트(요청 ID, 단계)를 유지한 채 스레드 풀에 작업 제출"""
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Dict[str, str] = None) -> str:
+    pairs = list(key) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{str(value).replace(chr(34), chr(39))}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+class MetricsRegistry:
+    """카운터/히스토그램/스팬 이벤트 저장소 (스레드 안전)"""
+
+    def __init__(self, namespace: str = "jober", max_events: int = 10000):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Dict]] = {}
+        self.events: deque = deque(maxlen=max_events)
+        self._jsonl_path: Optional[str] = None
+
+    def configure(self, jsonl_path: str = None) -> None:
+        """스팬 이벤트를 JSON Lines 파일로도 기록"""
+        self._jsonl_path = jsonl_path
+
+    def reset(self) -> None:
+        """모든 지표 초기화 (벤치마크 구간 분리용)"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.events.clear()
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        """카운터 증가"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """히스토그램 관측값 기록"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.setdefault(key, {"buckets": [0] * len(DEFAULT_BUCKETS), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(DEFAULT_BUCKETS):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    @contextmanager
+    def span(self, stage: str, **labels) -> Iterator[Dict]:
+        """단계 실행 시간 측정 (예외 발생 여부도 기록)"""
+        token = _current_stage.set(stage)
+        event = {"request_id": _request_id.get(), "stage": stage, **labels}
+        start = time.perf_counter()
+        try:
+            yield event
+            event.setdefault("error", False)
+        except BaseException:
+            event["error"] = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_stage.reset(token)
+            event["ts"] = time.time()
+            event["duration_ms"] = round(elapsed * 1000, 3)
+            self.observe("stage_duration_seconds", elapsed, stage=stage)
+            self._record_event(event)
+
+    def counter_value(self, name: str, **labels) -> float:
+        """카운터 현재 값 (라벨 미지정 시 전체 합)"""
+        with self._lock:
+            series = self._counters.get(name, {})
+            if labels:
+                return series.get(_label_key(labels), 0)
+            return sum(series.values())
+
+    def stage_durations(self) -> Dict[str, List[float]]:
+        """단계별 스팬 지연 목록 (밀리초)"""
+        durations: Dict[str, List[float]] = {}
+        for event in list(self.events):
+            durations.setdefault(event["stage"], []).append(event["duration_ms"])
+        return durations
+
+    def _record_event(self, event: Dict) -> None:
+        self.events.append(event)
+        if self._jsonl_path:
+            line = json.dumps(event, ensure_ascii=False)
+            with self._lock:
+                with open(self._jsonl_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+    def snapshot(self) -> Dict:
+        """카운터/히스토그램 요약 (JSON 직렬화 가능)"""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [
+                    {"labels": dict(key), "count": h["count"], "sum": round(h["sum"], 6)}
+                    for key, h in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 포맷으로 내보내기"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in series.items():
+                    lines.append(f"{metric}{_format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for key, h in series.items():
+                    for bound, count in zip(DEFAULT_BUCKETS, h["buckets"]):
+                        lines.append(f"{metric}_bucket{_format_labels(key, {'le': bound})} {count}")
+                    lines.append(f"{metric}_bucket{_format_labels(key, {'le': '+Inf'})} {h['count']}")
+                    lines.append(f"{metric}_sum{_format_labels(key)} {h['sum']}")
+                    lines.append(f"{metric}_count{_format_labels(key)} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+    def export_jsonl(self, path: str) -> int:
+        """현재 보관 중인 스팬 이벤트와 카운터를 JSON Lines로 저장"""
+        events = list(self.events)
+        with open(path, "w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps({"type": "span", **event}, ensure_ascii=False) + "\n")
+            f.write(json.dumps({"type": "snapshot", "ts": time.time(), **self.snapshot()}, ensure_ascii=False) + "\n")
+        return len(events)
+
+
+# 프로세스 전역 레지스트리
+metrics = MetricsRegistry()
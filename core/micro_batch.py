@@ -0,0 +1,82 @@
+"""
+요청 간 마이크로 배칭
+짧은 시간 창(window) 동안 들어온 호출을 최대 max_size개까지 모아 묶음 함수 한 번으로 처리하고 결과를 나눠 준다.
+
+별도 스레드 없이 묶음을 연 첫 호출(리더)이 창이 끝나거나 묶음이 찰 때까지 기다린 뒤 실행하므로
+리더의 요청 컨텍스트(request id, 마감)가 그대로 묶음 호출에 적용된다. 나머지 호출은 자기 마감까지만 기다린다.
+묶음 함수가 실패하면 같은 묶음의 모든 호출에 예외가 전달되고, 개별 호출로의 전환은 호출 측이 정한다.
+"""
+
+import threading
+import time
+from typing import Any, Callable, List, Sequence
+
+from .deadline import DeadlineExceeded, bounded
+from .metrics import metrics
+
+
+class _Batch:
+    __slots__ = ("items", "results", "error", "done", "full")
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+        self.full = threading.Event()
+
+
+class MicroBatcher:
+    """fn(items) -> 같은 순서의 결과 목록"""
+
+    def __init__(self, fn: Callable[[List[Any]], Sequence[Any]], window: float = 0.01, max_size: int = 8,
+                 name: str = "batch"):
+        self.fn = fn
+        self.window = window
+        self.max_size = max_size
+        self.name = name
+        self._lock = threading.Lock()
+        self._open = None   # 아직 항목을 받는 묶음
+
+    def submit(self, item: Any) -> Any:
+        """item을 묶음에 넣고 그 결과 반환 (묶음 실패 시 예외)"""
+        start = time.perf_counter()
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            position = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_size:
+                self._open = None
+                batch.full.set()
+
+        if not leader:
+            if not batch.done.wait(bounded(None)):
+                raise DeadlineExceeded(f"{self.name} 묶음 결과 대기 중 마감 시각 초과")
+            metrics.observe("micro_batch_wait_seconds", time.perf_counter() - start, batch=self.name)
+            if batch.error is not None:
+                raise batch.error
+            return batch.results[position]
+
+        batch.full.wait(bounded(self.window))
+        with self._lock:
+            if self._open is batch:
+                self._open = None
+        metrics.observe("micro_batch_wait_seconds", time.perf_counter() - start, batch=self.name)
+        metrics.increment("micro_batch_items_total", len(batch.items), batch=self.name)  # ÷ micro_batch_total = 평균 묶음 크기
+
+        try:
+            results = list(self.fn(list(batch.items)))
+            if len(results) != len(batch.items):
+                raise ValueError(f"{self.name} 묶음 결과 수 불일치: {len(results)}/{len(batch.items)}")
+            batch.results = results
+        except BaseException as e:
+            metrics.increment("micro_batch_total", batch=self.name, result="error")
+            batch.error = e
+            raise
+        finally:
+            batch.done.set()
+        metrics.increment("micro_batch_total", batch=self.name, result="ok")
+        return results[0]
@@ -0,0 +1,137 @@
+"""
+단계별 모델 라우팅
+- 단계(엔티티 추출/생성/판정 등)마다 후보 모델 목록을 두고, 단계별 지연 EWMA가 가장 짧은 후보부터 호출
+- 후보 호출이 제한 시간을 넘기거나 실패하면 다음 후보로 전환 (마지막 후보는 제한 없이 대기)
+- 단계/모델별 지연과 추정 비용을 지표로 남겨 라우팅 설정을 데이터로 조정
+
+단계 이름은 현재 계측 스팬(core.metrics.current_stage)을 그대로 쓴다.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .deadline import bounded, check
+from .metrics import current_stage, metrics, submit_with_context
+from .resilience import estimate_tokens
+
+DEFAULT_ROUTE = "default"
+
+
+class ModelRouter:
+    """단계 → 후보 모델 라우터 (모델별 프로바이더는 처음 쓸 때 생성해 재사용)"""
+
+    def __init__(
+        self,
+        routes: Dict[str, Sequence[str]],
+        provider_factory: Callable[[str], object],
+        timeouts: Optional[Dict[str, float]] = None,
+        prices: Optional[Dict[str, Tuple[float, float]]] = None,
+        alpha: float = 0.2,
+        explore: float = 0.05,
+        max_workers: int = 64,
+        seed: Optional[int] = None,
+    ):
+        if DEFAULT_ROUTE not in routes:
+            raise ValueError(f"'{DEFAULT_ROUTE}' 경로가 필요합니다.")
+        self.routes = {stage: list(models) for stage, models in routes.items()}
+        self.provider_factory = provider_factory
+        self.timeouts = timeouts or {}
+        self.prices = prices or {}
+        self.alpha = alpha
+        self.explore = explore
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._providers: Dict[str, object] = {}
+        self._latency: Dict[Tuple[str, str], float] = {}   # (단계, 모델) -> 지연 EWMA(초)
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-route")
+
+    def provider(self, model: str):
+        with self._lock:
+            if model not in self._providers:
+                self._providers[model] = self.provider_factory(model)
+            return self._providers[model]
+
+    def candidates(self, stage: str) -> List[str]:
+        """호출 순서 (측정된 후보는 지연 순, 미측정 후보는 뒤. explore 확률로 다른 후보를 먼저 시험)"""
+        models = self.routes.get(stage) or self.routes[DEFAULT_ROUTE]
+        with self._lock:
+            known = [m for m in models if (stage, m) in self._latency]
+            if not known:
+                return list(models)
+            ordered = sorted(known, key=lambda m: self._latency[(stage, m)])
+            ordered += [m for m in models if m not in known]
+            if len(ordered) > 1 and self._random.random() < self.explore:
+                ordered.insert(0, ordered.pop(self._random.randrange(1, len(ordered))))
+            return ordered
+
+    def generate(self, call: Callable[[object], str], tokens: int = 1, stage: Optional[str] = None) -> str:
+        """call(provider)을 후보 순서대로 실행해 첫 성공 결과 반환 (모두 실패하면 마지막 예외)"""
+        stage = stage or current_stage() or DEFAULT_ROUTE
+        # 요청 마감이 더 가까우면 그 안에서 다음 후보로 전환
+        timeout = bounded(self.timeouts.get(stage, self.timeouts.get(DEFAULT_ROUTE)))
+        models = self.candidates(stage)
+
+        for i, model in enumerate(models):
+            last = i == len(models) - 1
+            start = time.perf_counter()
+            future = submit_with_context(self._executor, call, self.provider(model))
+            try:
+                result = future.result(timeout=None if last else timeout)
+            except FutureTimeoutError:
+                # 호출은 백그라운드에서 끝나도록 두고 다음 후보로 전환 (요청 마감이 지났으면 중단)
+                self._record(stage, model, timeout, "timeout")
+                check()
+                print(f"⏱️ {stage} 단계 {model} 응답 지연 ({timeout}초) - {models[i + 1]}로 전환")
+                continue
+            except Exception as e:
+                self._record(stage, model, max(timeout or 0.0, time.perf_counter() - start), "error")
+                if last:
+                    raise
+                print(f"⚠️ {stage} 단계 {model} 호출 실패 - {models[i + 1]}로 전환: {e}")
+                continue
+
+            self._record(stage, model, time.perf_counter() - start, "ok")
+            self._record_cost(stage, model, tokens, estimate_tokens(result or ""))
+            if i:
+                metrics.increment("model_route_fallbacks_total", stage=stage, model=model)
+            return result
+
+    def _record(self, stage: str, model: str, seconds: float, result: str) -> None:
+        """지연 EWMA 갱신 (시간 초과/실패는 제한 시간을 벌점 지연으로 반영)"""
+        key = (stage, model)
+        with self._lock:
+            previous = self._latency.get(key)
+            self._latency[key] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+            self._calls[key] = self._calls.get(key, 0) + 1
+        metrics.increment("model_route_calls_total", stage=stage, model=model, result=result)
+        metrics.observe("model_route_seconds", seconds, stage=stage, model=model)
+
+    def _record_cost(self, stage: str, model: str, input_tokens: int, output_tokens: int) -> None:
+        input_price, output_price = self.prices.get(model, (0.0, 0.0))
+        cost = (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+        if cost:
+            metrics.increment("model_cost_usd_total", cost, stage=stage, model=model)
+
+    def stats(self) -> Dict[str, Dict[str, Dict]]:
+        """단계 → 모델 → {지연 EWMA, 호출 수}"""
+        with self._lock:
+            stats: Dict[str, Dict[str, Dict]] = {}
+            for (stage, model), latency in self._latency.items():
+                stats.setdefault(stage, {})[model] = {
+                    "latency_ewma": round(latency, 4),
+                    "calls": self._calls.get((stage, model), 0),
+                }
+            return stats
+
+
+def build_router(provider_factory: Callable[[str], object]) -> ModelRouter:
+    """설정(MODEL_ROUTES 등)으로 라우터 생성"""
+    from config import MODEL_PRICES, MODEL_ROUTE_TIMEOUTS, MODEL_ROUTES
+
+    return ModelRouter(MODEL_ROUTES, provider_factory, timeouts=MODEL_ROUTE_TIMEOUTS, prices=MODEL_PRICES)
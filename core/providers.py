@@ -0,0 +1,178 @@
+"""
+모델 프로바이더
+BaseTemplateProcessor가 호출하는 생성/임베딩 API를 한 곳으로 모은 어댑터.
+같은 인터페이스(generate_content, embed_content)를 구현하면 다른 백엔드로 교체할 수 있다.
+
+프롬프트 접두 캐시: 고정 지침(접두부)을 한 번 등록해 두고 요청마다 바뀌는 부분만 보낸다.
+프로바이더에 prefix_cache 속성이 없으면 PromptPrefixCache(no-op)가 둘을 이어 보낸다.
+"""
+
+import hashlib
+import threading
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Tuple
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import caching
+
+from .metrics import metrics
+from .resilience import estimate_tokens
+
+EMBEDDING_MODEL_NAME = "models/text-embedding-004"
+# CachedContent 최소 입력 토큰 수 (모델 이름 접두사별, 나머지는 기본값). 미달이면 등록 요청을 보내지 않음
+CACHED_CONTENT_MIN_TOKENS = {"gemini-2.5-flash": 1024}
+DEFAULT_CACHED_CONTENT_MIN_TOKENS = 4096
+
+
+class GeminiProvider:
+    """google.generativeai 기반 기본 프로바이더"""
+
+    def __init__(self, api_key: str, model_name: str = "gemini-1.5-flash"):
+        self.model_name = model_name
+        self.embedding_model = EMBEDDING_MODEL_NAME
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+        self.prefix_cache = GeminiPrefixCache(self)
+
+        print(f"✅ Gemini 모델 초기화: {model_name}")
+        print("✅ Gemini Embedding API 사용 준비 완료")
+
+    def generate_content(self, prompt: str) -> str:
+        """프롬프트로 텍스트 생성"""
+        return self._text_with_usage(self.model.generate_content(prompt))
+
+    @staticmethod
+    def _text_with_usage(response) -> str:
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            metrics.increment("model_tokens_total", usage.prompt_token_count, direction="input")
+            metrics.increment("model_tokens_total", usage.candidates_token_count, direction="output")
+            cached = getattr(usage, "cached_content_token_count", 0)
+            if cached:
+                metrics.increment("model_tokens_total", cached, direction="cached_input")
+        return response.text
+
+    def embed_content(self, text: str, task_type: str = "retrieval_document") -> List[float]:
+        """텍스트 하나를 임베딩 벡터로 변환"""
+        result = genai.embed_content(
+            model=EMBEDDING_MODEL_NAME,
+            content=text,
+            task_type=task_type
+        )
+        return result['embedding']
+
+
+class PromptPrefixCache:
+    """접두 캐시를 지원하지 않는 프로바이더용 (no-op): 접두부와 요청부를 이어 한 번에 전송"""
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def generate(self, prefix: str, suffix: str) -> str:
+        return self.provider.generate_content(prefix + suffix)
+
+
+def prefix_cache_for(provider) -> PromptPrefixCache:
+    """프로바이더의 접두 캐시 (없으면 no-op)"""
+    return getattr(provider, "prefix_cache", None) or PromptPrefixCache(provider)
+
+
+class GeminiPrefixCache(PromptPrefixCache):
+    """Gemini CachedContent로 접두부를 시스템 지침으로 등록하고 만료 전에 다시 등록
+
+    접두부가 모델의 최소 토큰 수보다 짧으면 등록하지 않고(too_small) 항상 전체 프롬프트를 보낸다.
+    (현재 TEMPLATE_PROMPT_PREAMBLE은 약 300토큰이라 모든 생성 모델에서 이 경우에 해당)
+    등록에 실패하면(캐시 미지원 모델 등) retry_after 동안은 전체 프롬프트를 보낸다.
+    등록 호출은 잠금 밖에서 키별로 하나만 실행하고, 그동안 다른 요청은 기다리지 않고 기존 캐시나 전체 프롬프트를 쓴다.
+    """
+
+    def __init__(
+        self,
+        provider: GeminiProvider,
+        ttl: float = 3600.0,
+        refresh_margin: float = 60.0,
+        retry_after: float = 600.0,
+        clock: Callable[[], float] = time.time,
+        min_tokens: int = None,
+    ):
+        super().__init__(provider)
+        if min_tokens is None:
+            min_tokens = next(
+                (tokens for model, tokens in CACHED_CONTENT_MIN_TOKENS.items() if provider.model_name.startswith(model)),
+                DEFAULT_CACHED_CONTENT_MIN_TOKENS,
+            )
+        self.min_tokens = min_tokens
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.retry_after = retry_after
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._models: Dict[str, Tuple[genai.GenerativeModel, float]] = {}   # 접두부 해시 -> (모델, 만료 시각)
+        self._unavailable: Dict[str, float] = {}                            # 접두부 해시 -> 재시도 시각
+        self._registering = set()                                          # 등록 호출 진행 중인 접두부 해시
+
+    def _cached_model(self, prefix: str):
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        now = self.clock()
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry[1] - self.refresh_margin > now:
+                return key, entry[0]
+            if self._unavailable.get(key, 0.0) > now:
+                return key, None
+            # 만료가 가까워 다시 등록 중이면 아직 유효한 기존 캐시 사용
+            current = entry[0] if entry is not None and entry[1] > now else None
+            if key in self._registering:
+                return key, current
+            if estimate_tokens(prefix) < self.min_tokens:
+                # 같은 접두부는 길이가 바뀌지 않으므로 다시 시도하지 않음
+                print(
+                    f"⚠️ 프롬프트 접두부(약 {estimate_tokens(prefix)}토큰)가 {self.provider.model_name} 캐시 최소 "
+                    f"{self.min_tokens}토큰보다 짧아 접두 캐시 미사용 - 전체 프롬프트 전송"
+                )
+                metrics.increment("prefix_cache_total", result="too_small")
+                self._unavailable[key] = float("inf")
+                return key, None
+            self._registering.add(key)
+
+        try:
+            cached = caching.CachedContent.create(
+                model=f"models/{self.provider.model_name}",
+                display_name=f"jober-prefix-{key[:12]}",
+                system_instruction=prefix,
+                ttl=timedelta(seconds=self.ttl),
+            )
+            model = genai.GenerativeModel.from_cached_content(cached_content=cached)
+        except Exception as e:
+            print(f"⚠️ 프롬프트 접두 캐시 등록 실패 - 전체 프롬프트 전송: {e}")
+            metrics.increment("prefix_cache_total", result="unavailable")
+            with self._lock:
+                self._registering.discard(key)
+                self._unavailable[key] = now + self.retry_after
+            return key, current
+
+        with self._lock:
+            self._registering.discard(key)
+            self._models[key] = (model, now + self.ttl)
+        metrics.increment("prefix_cache_total", result="registered")
+        return key, model
+
+    def generate(self, prefix: str, suffix: str) -> str:
+        key, model = self._cached_model(prefix)
+        if model is None:
+            return super().generate(prefix, suffix)
+
+        try:
+            response = model.generate_content(suffix)
+        except google_exceptions.NotFound:
+            # 서버 쪽에서 먼저 만료/삭제됨 → 이번 호출은 전체 프롬프트, 다음 호출에서 다시 등록
+            with self._lock:
+                self._models.pop(key, None)
+            metrics.increment("prefix_cache_total", result="expired")
+            return super().generate(prefix, suffix)
+
+        metrics.increment("prefix_cache_total", result="hit")
+        return GeminiProvider._text_with_usage(response)
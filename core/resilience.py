@@ -0,0 +1,289 @@
+"""
+모델 호출 보호 장치
+- TokenBucket/RateLimiter: 분당 요청 수(RPM)와 분당 토큰 수(TPM) 클라이언트 측 제한
+- backoff_delay: 지터를 섞은 지수 백오프
+- CircuitBreaker: 연속 실패 시 일정 시간 즉시 실패 (호출 측은 기존 폴백으로 전환)
+- AdaptiveConcurrency: 오류율에 따라 동시 호출 수를 늘리고 줄임 (AIMD)
+- ModelCallGuard: 위 장치를 묶어 호출 하나를 감싼다. 종류(generate/embed)별로 프로세스 전역 공유
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .deadline import DeadlineExceeded, bounded, has_time
+from .metrics import current_stage, metrics
+
+
+class CircuitOpenError(RuntimeError):
+    """회로가 열려 있어 호출하지 않고 즉시 실패"""
+
+
+class RateLimitTimeout(RuntimeError):
+    """제한 시간 안에 호출 허용량을 얻지 못함"""
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (한국어 기준 대략 2자당 1토큰)"""
+    return max(1, len(text) // 2)
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random = random) -> float:
+    """지터 지수 백오프 (0 ~ min(cap, base * 2^attempt) 균등 분포)"""
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷 (용량 = 1분 허용량)"""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """허용량을 차감하고 사용 가능해질 때까지 기다려야 할 시간(초) 반환"""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """reserve로 차감했지만 쓰지 않은 허용량 반환"""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """RPM/TPM 동시 제한 (0 또는 None이면 해당 제한 없음)"""
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_wait: float = 60.0, sleep: Callable[[float], None] = time.sleep):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_wait = max_wait
+        self.sleep = sleep
+
+    def acquire(self, tokens: int = 1) -> float:
+        """호출 하나에 필요한 허용량 확보 (대기한 시간 반환, 요청 마감까지만 대기)
+
+        대기 한도를 넘어 거절하면 차감한 허용량을 돌려주므로 거절된 호출이 이후 호출을 막지 않는다
+        """
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        if wait > bounded(self.max_wait):
+            if self.requests:
+                self.requests.refund(1)
+            if self.tokens:
+                self.tokens.refund(tokens)
+            raise RateLimitTimeout(f"호출 허용량 대기 시간 초과 ({wait:.1f}초)")
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """closed → (연속 실패) → open → (대기 후) half_open → 성공 시 closed"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half_open에서는 시험 호출 하나만 허용)"""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = self.clock()
+                self._probing = False
+
+
+class AdaptiveConcurrency:
+    """동시 호출 상한을 성공 시 +1, 실패 시 절반으로 조정 (AIMD)"""
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """빈자리가 날 때까지 대기 (요청 마감이 지나면 DeadlineExceeded)"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                timeout = bounded(None)
+                if timeout is not None and timeout <= 0:
+                    metrics.increment("timeouts_total", stage="concurrency_wait")
+                    raise DeadlineExceeded(f"동시 호출 대기 중 요청 마감 초과 (상한 {int(self.limit)})")
+                self._cond.wait(timeout)
+            self.in_flight += 1
+
+    def release(self, success: bool) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if success:
+                # 상한 1회분 성공마다 +1
+                self.limit = min(self.maximum, self.limit + 1.0 / max(self.limit, 1.0))
+            else:
+                self.limit = max(self.minimum, self.limit / 2)
+            self._cond.notify_all()
+
+
+class ModelCallGuard:
+    """제한 → 동시성 → 회로 차단 → 재시도(백오프) 순으로 모델 호출을 감싼다"""
+
+    def __init__(
+        self,
+        kind: str,
+        limiter: Optional[RateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        sleep: Callable[[float], None] = time.sleep,
+        seed: Optional[int] = None,
+    ):
+        self.kind = kind
+        self.limiter = limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.sleep = sleep
+        self._random = random.Random(seed)
+
+    def call(self, fn: Callable, *args, tokens: int = 1, **kwargs):
+        """fn(*args, **kwargs) 실행. 모든 재시도가 실패하면 마지막 예외를 그대로 전달"""
+        stage = current_stage() or "none"
+        for attempt in range(self.max_retries):
+            if not self.breaker.allow():
+                metrics.increment("circuit_open_total", kind=self.kind, stage=stage)
+                raise CircuitOpenError(f"{self.kind} 호출 회로 열림 - 폴백 사용")
+
+            waited = self.limiter.acquire(tokens)
+            if waited:
+                metrics.observe("rate_limit_wait_seconds", waited, kind=self.kind)
+
+            self.concurrency.acquire()
+            start = time.perf_counter()
+            try:
+                metrics.increment("model_calls_total", kind=self.kind, stage=stage)
+                result = fn(*args, **kwargs)
+            except Exception:
+                self.concurrency.release(success=False)
+                self.breaker.record_failure()
+                metrics.increment("model_errors_total", kind=self.kind, stage=stage)
+                if attempt == self.max_retries - 1:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, self._random)
+                if not has_time(delay):
+                    # 재시도 대기가 요청 마감을 넘기면 재시도하지 않음
+                    raise DeadlineExceeded(f"{self.kind} 재시도 대기({delay:.1f}초)가 요청 마감을 넘김")
+                metrics.increment("model_retries_total", kind=self.kind, stage=stage)
+                self.sleep(delay)
+                continue
+
+            self.concurrency.release(success=True)
+            self.breaker.record_success()
+            metrics.observe("model_call_seconds", time.perf_counter() - start, kind=self.kind, stage=stage)
+            return result
+
+
+_guards: Dict[str, ModelCallGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def configure_call_guards(**limits: Dict) -> None:
+    """종류별 보호 장치 재구성 (예: generate={"rpm": 60}, embed={"rpm": 0})"""
+    with _guards_lock:
+        for kind, options in limits.items():
+            _guards[kind] = _build_guard(kind, **options)
+
+
+def reset_call_guards() -> None:
+    """모든 보호 장치를 버림 (다음 get_call_guard에서 설정값으로 새로 생성, 테스트 간 차단기/할당량 격리용)
+
+    이미 만들어진 프로세서는 이전 보호 장치를 계속 쓰므로 프로세서를 만들기 전에 호출
+    """
+    with _guards_lock:
+        _guards.clear()
+
+
+def get_call_guard(kind: str) -> ModelCallGuard:
+    """종류별 프로세스 전역 보호 장치 (프로세서 인스턴스 간 할당량 공유)"""
+    with _guards_lock:
+        if kind not in _guards:
+            _guards[kind] = _build_guard(kind)
+        return _guards[kind]
+
+
+def _build_guard(kind: str, rpm: float = None, tpm: float = None, max_concurrency: int = None,
+                 **options) -> ModelCallGuard:
+    from config import (
+        CIRCUIT_FAILURE_THRESHOLD,
+        CIRCUIT_RESET_TIMEOUT,
+        EMBED_RPM_LIMIT,
+        GENERATE_RPM_LIMIT,
+        GENERATE_TPM_LIMIT,
+        MAX_CONCURRENT_MODEL_CALLS,
+        MODEL_BACKOFF_BASE,
+        MODEL_BACKOFF_MAX,
+    )
+
+    if rpm is None:
+        rpm = EMBED_RPM_LIMIT if kind == "embed" else GENERATE_RPM_LIMIT
+    if tpm is None:
+        tpm = None if kind == "embed" else GENERATE_TPM_LIMIT
+    maximum = max_concurrency or MAX_CONCURRENT_MODEL_CALLS
+
+    options.setdefault("backoff_base", MODEL_BACKOFF_BASE)
+    options.setdefault("backoff_max", MODEL_BACKOFF_MAX)
+    return ModelCallGuard(
+        kind,
+        limiter=RateLimiter(rpm, tpm),
+        breaker=CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT),
+        concurrency=AdaptiveConcurrency(initial=maximum, maximum=maximum),
+        **options,
+    )
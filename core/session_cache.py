@@ -0,0 +1,70 @@
+"""
+세션 문맥 캐시 (반복 수정용)
+세션별로 마지막 요청의 엔티티, 검색 결과, 생성된 템플릿을 크기 제한 LRU에 보관한다.
+"더 짧게"처럼 직전 템플릿을 고치는 요청은 추출/검색을 다시 하지 않고 이 문맥을 재사용한다.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class SessionContext:
+    """세션의 마지막 생성 문맥"""
+
+    user_input: str
+    entities: Dict
+    similar_templates: List[Tuple[str, float]]
+    guidelines: List[str]
+    template: str
+    revisions: int = 0
+    updated_at: float = 0.0
+
+    def revised(self, template: str) -> "SessionContext":
+        """수정된 템플릿으로 교체한 새 문맥 (검색 결과는 그대로 유지)"""
+        return replace(self, template=template, revisions=self.revisions + 1)
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex
+
+
+class SessionCache:
+    """세션 ID → SessionContext LRU (오래 쓰지 않은 세션은 만료)"""
+
+    def __init__(self, max_sessions: int = 256, ttl: float = 1800.0, clock: Callable[[], float] = time.monotonic):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, SessionContext]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[SessionContext]:
+        with self._lock:
+            context = self._sessions.get(session_id)
+            if context is None:
+                return None
+            if self.ttl and self.clock() - context.updated_at > self.ttl:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return context
+
+    def put(self, session_id: str, context: SessionContext) -> None:
+        with self._lock:
+            self._sessions[session_id] = replace(context, updated_at=self.clock())
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
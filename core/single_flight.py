@@ -0,0 +1,75 @@
+"""
+동일 요청 합치기 (single-flight)
+같은 키로 동시에 들어온 호출은 첫 호출(리더)의 실행 결과를 함께 받는다.
+실행이 끝나면 키가 비워지므로 결과를 캐시하지는 않는다.
+대기자는 자기 요청 마감까지만 기다리고, 넘기면 DeadlineExceeded (리더는 계속 실행).
+"""
+
+import threading
+import unicodedata
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .deadline import DeadlineExceeded, bounded
+from .metrics import metrics
+
+
+def coalesce_key(user_input: str, today: date = None) -> Tuple[str, str]:
+    """정규화한 입력 + 날짜 ("내일" 같은 상대 날짜 해석이 날짜에 따라 달라짐)"""
+    normalized = " ".join(unicodedata.normalize("NFKC", user_input).split())
+    return normalized, (today or date.today()).isoformat()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """키별 진행 중 호출 하나만 실행"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """(결과, 다른 호출의 결과를 공유했는지) 반환. 리더의 예외는 대기자에게도 전달
+
+        대기자는 자기 마감(core.deadline)까지만 기다리며, 리더가 그 안에 끝내지 못하면 DeadlineExceeded
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            if not call.done.wait(bounded(None)):
+                metrics.increment("timeouts_total", stage="coalesced_wait")
+                raise DeadlineExceeded("동일 요청 결과 대기 중 마감 시각 초과")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """현재 실행 중인 키 수"""
+        with self._lock:
+            return len(self._calls)
@@ -1,14 +1,57 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from typing import Dict, List, Tuple
+from config import MAX_TEMPLATE_LENGTH
 from .base_processor import BaseTemplateProcessor
+from .compiled_template import compile_template
+from .metrics import metrics, submit_with_context
+
+# 다중 생성 시 스타일별 추가 지침
+TEMPLATE_STYLES = {
+    "정중형": "격식 있고 공손한 안내 톤으로, 각 항목을 빠짐없이 상세하게 작성하세요.",
+    "간결형": "핵심 정보만 짧은 문장과 목록으로 간결하게 작성하세요.",
+    "친근형": "부드럽고 친근한 톤으로 작성하되 필요한 정보와 법적 고지는 모두 포함하세요.",
+}
+
+# 로컬 점수 (길이/변수 반영/법적 고지) 기준 (최대 길이는 config.MAX_TEMPLATE_LENGTH)
+MIN_TEMPLATE_CHARS = 200
+SCORE_WEIGHTS = {"length": 30, "coverage": 40, "legal_notice": 30}
+
+# 모든 생성 요청에 공통인 고정 지침 (프롬프트 접두 캐시로 한 번만 등록)
+TEMPLATE_PROMPT_PREAMBLE = f"""
+아래 문서는 카카오 알림톡 및 관련 비즈니스 메시지 가이드의 예시들입니다.
+사용자의 요청에 따라 이 문서의 형식과 내용을 참고하여 창의적이고 새로운 메시지 템플릿을 만들어 주세요.
+
+**중요 지침:**
+1. 사용자 요청에 포함된 날짜는 이미 정확하게 계산되어 있습니다. 템플릿에 날짜와 요일을 포함시킬 때, 반드시 제공된 날짜와 요일 정보를 정확히 사용하세요.
+2. 답변은 {MAX_TEMPLATE_LENGTH}자 이내로 작성해 주세요.
+3. 문서에 직접적인 내용이 없더라도, 문서의 톤과 스타일을 바탕으로 답변을 완성하세요.
+4. 카카오 알림톡의 형식과 규정에 맞는 템플릿을 작성해주세요.
+
+필수 준수사항:
+1. 정보통신망법 준수 (정보성 메시지 기준)
+2. 추출된 구체적 정보들을 #{{변수명}} 형태로 포함
+3. 수신자에게 필요한 모든 정보 포함
+4. 명확하고 정중한 안내 톤
+5. 메시지 끝에 발송 사유 및 법적 근거 명시
+6. 충분한 설명과 안내사항 포함 (최대 30자 이내)
+
+템플릿 구조:
+- 인사말 및 발신자 소개
+- 주요 안내 내용 (상세히)
+- 구체적인 정보 (일시, 장소, 방법 등)
+- 추가 안내사항 또는 주의사항
+- 문의처 또는 연락방법
+- 발송 사유 및 법적 근거
+"""
 
 
 class TemplateGenerator(BaseTemplateProcessor):
     """템플릿 생성 전용 클래스"""
 
-    def __init__(self, api_key: str, gemini_model: str = "gemini-2.0-flash-exp"):
-        super().__init__(api_key, gemini_model)
+    def __init__(self, api_key: str, gemini_model: str = "gemini-2.0-flash-exp", provider=None, router=None):
+        super().__init__(api_key, gemini_model, provider, router)
     
     def preprocess_query(self, query: str) -> str:
         """
@@ -44,6 +87,7 @@ class TemplateGenerator(BaseTemplateProcessor):
         entities: Dict,
         similar_templates: List[Tuple[str, float]],
         guidelines: List[str] = None,
+        style: str = None,
     ) -> Tuple[str, str]:
         """템플릿 생성"""
         
@@ -54,11 +98,11 @@ class TemplateGenerator(BaseTemplateProcessor):
         # 2. 기본 템플릿 생성 (전처리된 입력 사용)
         if guidelines:
             template = self._generate_guideline_based_template(
-                processed_input, entities, similar_templates, guidelines
+                processed_input, entities, similar_templates, guidelines, style
             )
         else:
             template = self._generate_basic_template(
-                processed_input, entities, similar_templates
+                processed_input, entities, similar_templates, style
             )
 
         # 실제 값으로 채워진 미리보기 생성
@@ -72,31 +116,28 @@ class TemplateGenerator(BaseTemplateProcessor):
         entities: Dict,
         similar_templates: List[Tuple[str, float]],
         guidelines: List[str],
+        style: str = None,
     ) -> str:
         """가이드라인 기반 템플릿 생성"""
 
         template_examples = self._format_template_examples(similar_templates)
         guidelines_text = "\n".join(guidelines[:3]) if guidelines else ""
 
-        prompt = self._create_template_generation_prompt(
+        prefix, suffix = self._create_template_generation_prompt(
             user_input,
             entities,
             template_examples,
             guidelines_text,
             use_guidelines=True,
+            style=style,
         )
 
         try:
-            response = self.generate_with_gemini(prompt)
-            print(f"🔍 Gemini 원본 응답 길이: {len(response)}")
-            print(f"🔍 Gemini 원본 응답 (처음 200자): {response[:200]}...")
-            
-            cleaned_response = response.replace("```", "").strip()
-            print(f"🔍 정리된 응답 길이: {len(cleaned_response)}")
-            
-            return cleaned_response
+            response = self.generate_with_prefix(prefix, suffix)
+            return response.replace("```", "").strip()
         except Exception as e:
             print(f"가이드라인 기반 템플릿 생성 오류: {e}")
+            metrics.increment("fallbacks_total", kind="template")
             return self._generate_fallback_template(user_input, entities)
 
     def _generate_basic_template(
@@ -104,26 +145,22 @@ class TemplateGenerator(BaseTemplateProcessor):
         user_input: str,
         entities: Dict,
         similar_templates: List[Tuple[str, float]],
+        style: str = None,
     ) -> str:
         """기본 템플릿 생성"""
 
         template_examples = self._format_template_examples(similar_templates)
 
-        prompt = self._create_template_generation_prompt(
-            user_input, entities, template_examples, "", use_guidelines=False
+        prefix, suffix = self._create_template_generation_prompt(
+            user_input, entities, template_examples, "", use_guidelines=False, style=style
         )
 
         try:
-            response = self.generate_with_gemini(prompt)
-            print(f"🔍 기본 템플릿 - Gemini 원본 응답 길이: {len(response)}")
-            print(f"🔍 기본 템플릿 - Gemini 원본 응답 (처음 200자): {response[:200]}...")
-            
-            cleaned_response = response.replace("```", "").strip()
-            print(f"🔍 기본 템플릿 - 정리된 응답 길이: {len(cleaned_response)}")
-            
-            return cleaned_response
+            response = self.generate_with_prefix(prefix, suffix)
+            return response.replace("```", "").strip()
         except Exception as e:
             print(f"기본 템플릿 생성 오류: {e}")
+            metrics.increment("fallbacks_total", kind="template")
             return self._generate_fallback_template(user_input, entities)
 
     def _create_template_generation_prompt(
@@ -133,8 +170,9 @@ class TemplateGenerator(BaseTemplateProcessor):
         template_examples: str,
         guidelines: str,
         use_guidelines: bool = False,
-    ) -> str:
-        """템플릿 생성 프롬프트 생성"""
+        style: str = None,
+    ) -> Tuple[str, str]:
+        """템플릿 생성 프롬프트 (고정 접두부, 요청별 본문)"""
 
         extracted_info = entities.get("extracted_info", {})
         intent = entities.get("message_intent", "일반안내")
@@ -143,15 +181,6 @@ class TemplateGenerator(BaseTemplateProcessor):
         urgency = entities.get("urgency_level", "보통")
 
         base_prompt = f"""
-아래 문서는 카카오 알림톡 및 관련 비즈니스 메시지 가이드의 예시들입니다.
-사용자의 요청에 따라 이 문서의 형식과 내용을 참고하여 창의적이고 새로운 메시지 템플릿을 만들어 주세요.
-
-**중요 지침:**
-1. 사용자 요청에 포함된 날짜는 이미 정확하게 계산되어 있습니다. 템플릿에 날짜와 요일을 포함시킬 때, 반드시 제공된 날짜와 요일 정보를 정확히 사용하세요.
-2. 답변은 1000자 이내로 작성해 주세요.
-3. 문서에 직접적인 내용이 없더라도, 문서의 톤과 스타일을 바탕으로 답변을 완성하세요.
-4. 카카오 알림톡의 형식과 규정에 맞는 템플릿을 작성해주세요.
-
 추출된 정보:
 - 날짜: {', '.join(extracted_info.get('dates', [])) if extracted_info.get('dates') else '없음'}
 - 이름: {', '.join(extracted_info.get('names', [])) if extracted_info.get('names') else '없음'}
@@ -177,33 +206,122 @@ class TemplateGenerator(BaseTemplateProcessor):
             base_prompt += f"""
 참고 템플릿 예시:
 {template_examples}
+"""
+
+        if style in TEMPLATE_STYLES:
+            base_prompt += f"""
+작성 스타일 ({style}): {TEMPLATE_STYLES[style]}
 """
 
         base_prompt += f"""
 사용자 요청: {user_input}
 
-위 요청에 맞는 알림톡 메시지 템플릿을 작성해주세요.
+위 요청에 맞는 알림톡 메시지 템플릿을 필수 준수사항과 템플릿 구조에 따라 작성해주세요.
 
-필수 준수사항:
-1. 정보통신망법 준수 (정보성 메시지 기준)
-2. 추출된 구체적 정보들을 #{{변수명}} 형태로 포함
-3. 수신자에게 필요한 모든 정보 포함
-4. 명확하고 정중한 안내 톤
-5. 메시지 끝에 발송 사유 및 법적 근거 명시
-6. 충분한 설명과 안내사항 포함 (최대 30자 이내)
+실용적이고 완성도 높은 템플릿을 생성해주세요:
+"""
 
-템플릿 구조:
-- 인사말 및 발신자 소개
-- 주요 안내 내용 (상세히)
-- 구체적인 정보 (일시, 장소, 방법 등)
-- 추가 안내사항 또는 주의사항
-- 문의처 또는 연락방법
-- 발송 사유 및 법적 근거
+        return TEMPLATE_PROMPT_PREAMBLE, base_prompt
 
-실용적이고 완성도 높은 템플릿을 생성해주세요:
+    def refine_template(
+        self,
+        template: str,
+        instruction: str,
+        entities: Dict,
+        guidelines: List[str] = None,
+    ) -> str:
+        """직전 템플릿을 수정 요청만 반영해 고침 (추출/검색 결과 재사용, 모델 호출 1회)"""
+        guidelines_text = "\n".join(guidelines[:3]) if guidelines else ""
+        processed_instruction = self.preprocess_query(instruction)
+
+        prompt = f"""
+아래 카카오 알림톡 템플릿을 수정 요청에 맞게 고쳐주세요.
+
+현재 템플릿:
+{template}
+
+메시지 의도: {entities.get("message_intent", "일반안내")}
+"""
+        if guidelines_text:
+            prompt += f"""
+---
+참고 문서 내용:
+{guidelines_text}
+---
+"""
+        prompt += f"""
+수정 요청: {processed_instruction}
+
+수정 지침:
+1. 수정 요청과 관련 없는 내용, #{{변수명}} 변수, 발송 사유 및 법적 근거는 그대로 유지
+2. 답변은 {MAX_TEMPLATE_LENGTH}자 이내
+3. 설명 없이 수정된 템플릿 본문만 출력
 """
 
-        return base_prompt
+        try:
+            response = self.generate_with_gemini(prompt)
+            refined = response.replace("```", "").strip()
+            return refined or template
+        except Exception as e:
+            print(f"템플릿 수정 오류: {e}")
+            metrics.increment("fallbacks_total", kind="refinement")
+            return template
+
+    def generate_variants(
+        self,
+        user_input: str,
+        entities: Dict,
+        similar_templates: List[Tuple[str, float]],
+        guidelines: List[str] = None,
+        styles: List[str] = None,
+    ) -> List[Dict]:
+        """스타일별 템플릿을 동시에 생성하고 로컬 점수 순으로 정렬 (검색 결과는 공유)"""
+        styles = styles or list(TEMPLATE_STYLES)
+
+        with ThreadPoolExecutor(max_workers=len(styles), thread_name_prefix="variant") as executor:
+            futures = [
+                submit_with_context(
+                    executor, self.generate_template, user_input, entities, similar_templates, guidelines, style
+                )
+                for style in styles
+            ]
+            generated = [future.result() for future in futures]
+
+        variants = []
+        for style, (template, _) in zip(styles, generated):
+            template = self.optimize_template(template, entities)
+            score, detail = self.score_template(template, entities)
+            variants.append({
+                "style": style,
+                "template": template,
+                "filled_template": self._fill_template_with_entities(template, entities),
+                "variables": self.extract_variables(template),
+                "score": score,
+                "score_detail": detail,
+            })
+
+        variants.sort(key=lambda variant: variant["score"], reverse=True)
+        return variants
+
+    def score_template(self, template: str, entities: Dict) -> Tuple[float, Dict[str, float]]:
+        """길이, 엔티티 변수 반영률, 법적 고지(※) 유무로 0~100점 계산"""
+        length = len(template)
+        if length > MAX_TEMPLATE_LENGTH:
+            length_score = 0.0
+        else:
+            length_score = min(1.0, length / MIN_TEMPLATE_CHARS)
+
+        # 추출된 엔티티 슬롯이 동의어 변수로 템플릿에 반영됐는지
+        extracted_info = entities.get("extracted_info", {})
+        needed = {slot for slot in ("dates", "names", "locations", "events") if extracted_info.get(slot)}
+        covered = needed & set(compile_template(template).slots.values())
+        coverage_score = len(covered) / len(needed) if needed else 1.0
+
+        legal_score = 1.0 if "※" in template else 0.0
+
+        detail = {"length": length_score, "coverage": coverage_score, "legal_notice": legal_score}
+        score = sum(SCORE_WEIGHTS[key] * value for key, value in detail.items())
+        return round(score, 1), detail
 
     def _format_template_examples(
         self, similar_templates: List[Tuple[str, float]]
@@ -219,55 +337,8 @@ class TemplateGenerator(BaseTemplateProcessor):
         return "\n".join(examples)
 
     def _fill_template_with_entities(self, template: str, entities: Dict) -> str:
-        """템플릿에 추출된 엔티티 정보 자동 입력"""
-        filled = template
-        extracted_info = entities.get("extracted_info", {})
-
-        # 날짜 정보 매핑
-        if extracted_info.get("dates"):
-            date_patterns = [
-                (
-                    r"#\{(일시|날짜|시간|적용일|방문일정|예약일정|행사일시)\}",
-                    extracted_info["dates"][0],
-                )
-            ]
-            for pattern, value in date_patterns:
-                filled = re.sub(pattern, value, filled, flags=re.IGNORECASE)
-
-        # 이름 정보 매핑
-        if extracted_info.get("names"):
-            name_patterns = [
-                (
-                    r"#\{(수신자명|수신자|고객명|보호자명|회원명)\}",
-                    extracted_info["names"][0],
-                )
-            ]
-            for pattern, value in name_patterns:
-                filled = re.sub(pattern, value, filled, flags=re.IGNORECASE)
-
-        # 장소 정보 매핑
-        if extracted_info.get("locations"):
-            location_patterns = [
-                (
-                    r"#\{(장소|매장명|주소|위치|행사장소)\}",
-                    extracted_info["locations"][0],
-                )
-            ]
-            for pattern, value in location_patterns:
-                filled = re.sub(pattern, value, filled, flags=re.IGNORECASE)
-
-        # 이벤트 정보 매핑
-        if extracted_info.get("events"):
-            event_patterns = [
-                (
-                    r"#\{(행사명|이벤트명|활동명|프로그램명)\}",
-                    extracted_info["events"][0],
-                )
-            ]
-            for pattern, value in event_patterns:
-                filled = re.sub(pattern, value, filled, flags=re.IGNORECASE)
-
-        return filled
+        """템플릿에 추출된 엔티티 정보 자동 입력 (날짜/이름/장소/이벤트 동의어 변수)"""
+        return compile_template(template).render_entities(entities)
 
     def _generate_fallback_template(self, user_input: str, entities: Dict) -> str:
         """오류 시 기본 템플릿 생성"""
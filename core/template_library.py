@@ -0,0 +1,396 @@
+"""
+승인 템플릿 라이브러리
+- 템플릿 본문과 분류(category), 업종(industry), 의도(intent) 패싯은 SQLite 한 파일에 저장
+- 임베딩은 임베딩 모델별 디렉터리에 shard_size 행 단위 샤드로 저장
+  (shard-NNNN/ids.npy, vectors.npy(mmap), index.faiss(작은 샤드는 Flat, 큰 샤드는 IVF))
+- 가져오기(import)는 행만 먼저 저장하고 sync_index가 아직 색인되지 않은 행을 이어서 임베딩하므로
+  중간에 중단돼도 다음 실행에서 이어서 진행
+- 패싯 필터 검색: 후보가 적으면 후보 벡터만 정확히 계산, 많으면 FAISS IDSelector로 샤드 검색
+
+사용 예:
+    python -m core.template_library import approved.jsonl          # Gemini 임베딩
+    python -m core.template_library import approved.jsonl --fake   # 오프라인 (FakeProvider)
+    python -m core.template_library stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+from .base_processor import BaseTemplateProcessor
+
+FACETS = ("category", "industry", "intent")
+DEFAULT_SHARD_SIZE = 65536
+IVF_MIN_ROWS = 8192          # 이보다 작은 샤드는 Flat 인덱스 (정확 검색)
+EXACT_FILTER_LIMIT = 2048    # 패싯 후보가 이 이하면 후보 벡터만 정확 계산
+
+_VARIABLE = re.compile(r"#\{[^}]+\}")
+
+Embedder = Callable[[List[str]], np.ndarray]
+
+
+def embedding_text(template: str) -> str:
+    """임베딩용 텍스트 (변수 이름 대신 공통 자리표시자로 바꿔 내용 위주로 비교)"""
+    return _VARIABLE.sub("[VARIABLE]", template)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class _Shard:
+    """읽기 전용 샤드 (ids/vectors는 mmap)"""
+
+    def __init__(self, path: Path, nprobe: int):
+        self.path = path
+        self.ids = np.load(path / "ids.npy", mmap_mode="r")
+        self.vectors = np.load(path / "vectors.npy", mmap_mode="r")
+        self.index = BaseTemplateProcessor._read_index(path / "index.faiss")
+        self.ivf = isinstance(self.index, faiss.IndexIVF)
+        if self.ivf:
+            self.index.nprobe = nprobe
+
+    def search(self, query: np.ndarray, top_k: int, selector=None, boost: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """FAISS 검색 (선택자가 걸러내는 만큼 boost배 더 많은 리스트를 탐색)"""
+        params = None
+        if selector is not None:
+            if self.ivf:
+                params = faiss.SearchParametersIVF(sel=selector, nprobe=self.index.nprobe * boost)
+            else:
+                params = faiss.SearchParameters(sel=selector)
+        scores, ids = self.index.search(query, top_k, params=params)
+        return scores[0], ids[0]
+
+    def exact(self, query: np.ndarray, candidate_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """후보 행만 정확히 내적 계산"""
+        # 샤드 id 범위 안의 후보만 (ids와 후보 모두 오름차순)
+        lo = np.searchsorted(candidate_ids, self.ids[0], side="left")
+        hi = np.searchsorted(candidate_ids, self.ids[-1], side="right")
+        candidate_ids = candidate_ids[lo:hi]
+        positions = np.searchsorted(self.ids, candidate_ids)
+        positions = positions[np.asarray(self.ids[positions]) == candidate_ids]
+        if not len(positions):
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        return self.vectors[positions] @ query[0], np.asarray(self.ids[positions])
+
+
+class TemplateLibrary:
+    """SQLite 템플릿 저장소 + 임베딩 모델별 샤드 벡터 인덱스"""
+
+    def __init__(
+        self,
+        root: Path,
+        embedding_key: str = "default",
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        nprobe: int = 32,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.nprobe = nprobe
+        self.vector_dir = self.root / "vectors" / re.sub(r"[^0-9A-Za-z._-]+", "_", embedding_key)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "templates.sqlite3", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS templates (
+                id INTEGER PRIMARY KEY,
+                text TEXT NOT NULL,
+                text_hash TEXT NOT NULL UNIQUE,
+                category TEXT,
+                industry TEXT,
+                intent TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_templates_category ON templates(category);
+            CREATE INDEX IF NOT EXISTS idx_templates_industry ON templates(industry);
+            CREATE INDEX IF NOT EXISTS idx_templates_intent ON templates(intent);
+            """
+        )
+        self._facet_table = self._load_facet_table()
+        self._manifest = self._read_manifest()
+        self._shards = [_Shard(self.vector_dir / shard["name"], nprobe) for shard in self._manifest["shards"]]
+
+    # ---- 저장소 ----
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM templates").fetchone()[0]
+
+    def add(self, records: Iterable[Dict]) -> Dict[str, int]:
+        """템플릿 행 추가 (본문이 같은 템플릿은 건너뜀). 임베딩은 sync_index에서"""
+        imported = skipped = 0
+        added = []
+        with self._lock, self._db:
+            for record in records:
+                text = (record.get("text") or record.get("template") or "").strip()
+                if not text:
+                    skipped += 1
+                    continue
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO templates (text, text_hash, category, industry, intent) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        text,
+                        hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                        *(record.get(facet) for facet in FACETS),
+                    ),
+                )
+                if cursor.rowcount:
+                    imported += 1
+                    added.append((cursor.lastrowid, *(record.get(facet) for facet in FACETS)))
+                else:
+                    skipped += 1
+            if added:
+                self._facet_table = self._extend_facet_table(self._facet_table, added)
+        return {"imported": imported, "skipped": skipped}
+
+    def texts(self, ids: Sequence[int]) -> Dict[int, str]:
+        if not len(ids):
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id, text FROM templates WHERE id IN ({','.join('?' * len(ids))})", [int(i) for i in ids]
+            ).fetchall()
+        return dict(rows)
+
+    def facet_values(self) -> Dict[str, Dict[str, int]]:
+        """패싯별 값과 템플릿 수"""
+        with self._lock:
+            return {
+                facet: dict(self._db.execute(
+                    f"SELECT {facet}, COUNT(*) FROM templates WHERE {facet} IS NOT NULL GROUP BY {facet}"
+                ).fetchall())
+                for facet in FACETS
+            }
+
+    # 패싯 필터는 검색마다 SQL을 돌리지 않도록 (id 배열, 패싯별 값 코드 배열, 값→코드) 표를 메모리에 유지
+    def _load_facet_table(self) -> Tuple:
+        with self._lock:
+            rows = self._db.execute(f"SELECT id, {', '.join(FACETS)} FROM templates ORDER BY id").fetchall()
+        empty = (np.empty(0, dtype=np.int64), {facet: np.empty(0, dtype=np.int32) for facet in FACETS},
+                 {facet: {} for facet in FACETS})
+        return self._extend_facet_table(empty, rows)
+
+    @staticmethod
+    def _extend_facet_table(table: Tuple, rows: Sequence[Tuple]) -> Tuple:
+        """행 (id, 패싯 값...)을 덧붙인 새 표 (검색 중인 스레드가 보는 표는 그대로)"""
+        ids, codes, vocab = table
+        vocab = {facet: dict(values) for facet, values in vocab.items()}
+        new_codes = {facet: [] for facet in FACETS}
+        for row in rows:
+            for facet, value in zip(FACETS, row[1:]):
+                new_codes[facet].append(-1 if value is None else vocab[facet].setdefault(value, len(vocab[facet])))
+        return (
+            np.concatenate([ids, np.array([row[0] for row in rows], dtype=np.int64)]),
+            {facet: np.concatenate([codes[facet], np.array(new_codes[facet], dtype=np.int32)]) for facet in FACETS},
+            vocab,
+        )
+
+    def _filter_ids(self, facets: Dict[str, Optional[str]]) -> np.ndarray:
+        """패싯 값이 모두 일치하는 템플릿 id (오름차순)"""
+        ids, codes, vocab = self._facet_table
+        mask = np.ones(len(ids), dtype=bool)
+        for facet, value in facets.items():
+            if value is None:
+                continue
+            code = vocab[facet].get(value)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= codes[facet] == code
+        return ids[mask]
+
+    # ---- 벡터 인덱스 ----
+
+    @property
+    def indexed_count(self) -> int:
+        return sum(shard["count"] for shard in self._manifest["shards"])
+
+    def sync_index(self, embed: Embedder, batch_size: int = 1024) -> int:
+        """색인되지 않은 행을 임베딩해 샤드에 추가 (추가한 행 수 반환)
+
+        샤드 하나를 채울 만큼 임베딩을 모은 뒤 한 번에 써서, 중단되면 마지막으로 쓴 샤드부터 다시 진행.
+        """
+        added = 0
+        while True:
+            shards = self._manifest["shards"]
+            extend = bool(shards) and shards[-1]["count"] < self.shard_size
+            room = self.shard_size - shards[-1]["count"] if extend else self.shard_size
+
+            ids, vectors = [], []
+            while len(ids) < room:
+                with self._lock:
+                    rows = self._db.execute(
+                        "SELECT id, text FROM templates WHERE id > ? ORDER BY id LIMIT ?",
+                        (ids[-1] if ids else self._manifest["max_id"], min(batch_size, room - len(ids))),
+                    ).fetchall()
+                if not rows:
+                    break
+                batch = _normalize(embed([embedding_text(text) for _, text in rows]))
+                if self._manifest["dimension"] not in (None, batch.shape[1]):
+                    raise ValueError(
+                        f"임베딩 차원 불일치: 저장 {self._manifest['dimension']}, 현재 {batch.shape[1]}"
+                    )
+                ids.extend(row_id for row_id, _ in rows)
+                vectors.append(batch)
+            if not ids:
+                return added
+
+            self._write(np.array(ids, dtype=np.int64), np.concatenate(vectors), extend)
+            added += len(ids)
+
+    def _write(self, ids: np.ndarray, vectors: np.ndarray, extend: bool) -> None:
+        """마지막 샤드에 이어 쓰거나(extend) 새 샤드 생성 후 매니페스트 갱신"""
+        shards = [dict(shard) for shard in self._manifest["shards"]]
+        if extend:
+            old = self._shards[-1]
+            ids = np.concatenate([np.asarray(old.ids), ids])
+            vectors = np.concatenate([np.asarray(old.vectors), vectors])
+            shard = shards[-1]
+        else:
+            shard = {"name": f"shard-{len(shards):04d}", "count": 0}
+            shards.append(shard)
+
+        self._write_shard(self.vector_dir / shard["name"], ids, vectors)
+        shard["count"] = len(ids)
+        self._manifest = {"dimension": int(vectors.shape[1]), "max_id": int(ids[-1]), "shards": shards}
+        self._write_manifest()
+        # 검색 중인 스레드가 보는 목록은 그대로 두고 새 목록으로 교체
+        loaded = _Shard(self.vector_dir / shard["name"], self.nprobe)
+        self._shards = self._shards[:-1] + [loaded] if extend else self._shards + [loaded]
+
+    @staticmethod
+    def _write_shard(path: Path, ids: np.ndarray, vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        dimension = vectors.shape[1]
+        if len(ids) >= IVF_MIN_ROWS:
+            nlist = max(1, min(int(4 * np.sqrt(len(ids))), len(ids) // 39))
+            index = faiss.IndexIVFFlat(faiss.IndexFlatIP(dimension), dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+            index.add_with_ids(vectors, ids)
+        else:
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+            index.add_with_ids(vectors, ids)
+
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        np.save(tmp / "ids.npy", ids)
+        np.save(tmp / "vectors.npy", vectors)
+        faiss.write_index(index, str(tmp / "index.faiss"))
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+
+    def _read_manifest(self) -> Dict:
+        try:
+            with open(self.vector_dir / "manifest.json", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"dimension": None, "max_id": 0, "shards": []}
+
+    def _write_manifest(self) -> None:
+        self.vector_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.vector_dir / f"manifest.json.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f)
+        os.replace(tmp, self.vector_dir / "manifest.json")
+
+    # ---- 검색 ----
+
+    def search(self, query_vector: np.ndarray, top_k: int = 3, **facets: Optional[str]) -> List[Tuple[str, float]]:
+        """유사 템플릿 [(본문, 점수)] (패싯 값이 주어지면 일치하는 템플릿 중에서만)"""
+        shards = self._shards
+        if not shards:
+            return []
+        query = _normalize(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))
+        unknown = set(facets) - set(FACETS)
+        if unknown:
+            raise ValueError(f"알 수 없는 패싯: {sorted(unknown)}")
+
+        scores, ids = [], []
+        if any(facets.values()):
+            candidates = self._filter_ids(facets)
+            if not len(candidates):
+                return []
+            if len(candidates) <= EXACT_FILTER_LIMIT:
+                for shard in shards:
+                    shard_scores, shard_ids = shard.exact(query, candidates)
+                    scores.append(shard_scores)
+                    ids.append(shard_ids)
+            else:
+                # id 비트맵 선택자 (후보가 많아도 만들기 싸고 조회가 O(1))
+                bits = np.zeros(int(candidates[-1]) + 1, dtype=bool)
+                bits[candidates] = True
+                bitmap = np.packbits(bits, bitorder="little")
+                selector = faiss.IDSelectorBitmap(len(bits), faiss.swig_ptr(bitmap))
+                boost = min(4, -(-len(self._facet_table[0]) // len(candidates)))
+                for shard in shards:
+                    shard_scores, shard_ids = shard.search(query, top_k, selector, boost)
+                    scores.append(shard_scores)
+                    ids.append(shard_ids)
+        else:
+            for shard in shards:
+                shard_scores, shard_ids = shard.search(query, top_k)
+                scores.append(shard_scores)
+                ids.append(shard_ids)
+
+        scores, ids = np.concatenate(scores), np.concatenate(ids)
+        valid = ids >= 0
+        scores, ids = scores[valid], ids[valid]
+        top = np.argsort(-scores)[:top_k]
+        texts = self.texts(ids[top])
+        return [(texts[int(i)], float(s)) for i, s in zip(ids[top], scores[top]) if int(i) in texts]
+
+
+def read_jsonl(path: Path) -> Iterator[Dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="승인 템플릿 라이브러리")
+    parser.add_argument("command", choices=["import", "stats"])
+    parser.add_argument("files", nargs="*", type=Path, help="JSONL (text, category, industry, intent)")
+    parser.add_argument("--root", type=Path, help="라이브러리 디렉터리 (기본 TEMPLATE_LIBRARY_DIR)")
+    parser.add_argument("--fake", action="store_true", help="FakeProvider 임베딩 사용")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    from config import GEMINI_API_KEY, TEMPLATE_LIBRARY_DIR
+    from .template_generator import TemplateGenerator
+
+    provider = None
+    if args.fake:
+        from benchmarks import FakeProvider
+        provider = FakeProvider()
+    processor = TemplateGenerator(GEMINI_API_KEY, provider=provider)
+    library = TemplateLibrary(args.root or Path(TEMPLATE_LIBRARY_DIR), embedding_key=processor.embedding_key)
+
+    if args.command == "import":
+        for path in args.files:
+            summary = library.add(read_jsonl(path))
+            print(f"📥 {path}: {summary['imported']}개 추가, {summary['skipped']}개 건너뜀")
+        added = library.sync_index(processor.encode_texts_strict, batch_size=args.batch_size)
+        print(f"✅ {added}개 임베딩 색인")
+    print(json.dumps(
+        {"templates": len(library), "indexed": library.indexed_count, "facets": library.facet_values()},
+        ensure_ascii=False, indent=2,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,146 @@
+import copy
 import json
-import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from pathlib import Path
 from typing import Dict
 
-from config import GEMINI_API_KEY
+from agents import Agent2, GuidelineJudgeAgent
+from config import (
+    CASSETTE_RECORD_PATH,
+    CASSETTE_REPLAY_PATH,
+    CASSETTE_REPLAY_TIMING,
+    DEADLINE_RESPONSE_MARGIN,
+    DEGRADE_GUIDELINE_SEARCH_BELOW,
+    DEGRADE_LLM_ENTITIES_BELOW,
+    DEGRADE_LLM_GENERATION_BELOW,
+    ENTITY_BATCH_MAX_SIZE,
+    ENTITY_BATCH_WINDOW_MS,
+    GEMINI_API_KEY,
+    JUDGE_TIMEOUT,
+    MAX_CONCURRENT_VALIDATIONS,
+    MAX_REGENERATION_ATTEMPTS,
+    GUIDELINE_PDF_DIR,
+    INDEX_CACHE_DIR,
+    METRICS_JSONL_PATH,
+    MODEL_ROUTING_ENABLED,
+    PDF_CACHE_DIR,
+    PRECOMPUTED_INTENT_GUIDELINES,
+    REQUEST_DEADLINE_SECONDS,
+    SESSION_CACHE_SIZE,
+    SESSION_TTL_SECONDS,
+    SPECULATIVE_GENERATION,
+    TEMPLATE_LIBRARY_DIR,
+    TEMPLATE_LIBRARY_SEED,
+    VALIDATION_RESERVE_SECONDS,
+    VALIDATION_STAGE_TIMEOUT,
+)
 from core import EntityExtractor, TemplateGenerator
+from core.template_generator import TEMPLATE_STYLES
+from core.cassette import CassetteWriter, RecordingProvider, ReplayProvider
+from core.chunk_store import ChunkStore
+from core.deadline import DeadlineExceeded, bounded, deadline_scope, has_time, remaining
+from core.entity_extractor import canonical_intent
+from core.intent_guidelines import IntentGuidelines
+from core.metrics import metrics, request_context, submit_with_context
+from core.model_router import build_router
+from core.providers import GeminiProvider, prefix_cache_for
+from core.session_cache import SessionCache, SessionContext, new_session_id
+from core.single_flight import SingleFlight, coalesce_key
+from core.template_library import TemplateLibrary, read_jsonl
 from utils import DataProcessor
+from utils.lexical_index import LexicalIndex
+from utils.near_dedup import dedupe_chunks
+from utils.pdf_ingest import ingest_pdfs
 
 
 class TemplateSystem:
 
-    def __init__(self):
-        self.entity_extractor = EntityExtractor(GEMINI_API_KEY)
-        self.template_generator = TemplateGenerator(GEMINI_API_KEY)
+    def __init__(self, provider=None, index_cache_dir=None, background_index=True, template_library_dir=None):
+        """index_cache_dir만 따로 주면(테스트/벤치마크) 템플릿 라이브러리도 그 아래에 둠"""
+        if METRICS_JSONL_PATH:
+            metrics.configure(jsonl_path=METRICS_JSONL_PATH)
+
+        # 모델 호출 녹화/재생 (재생 중에는 네트워크 없이 녹화 파일로 응답)
+        if provider is None and CASSETTE_REPLAY_PATH:
+            provider = ReplayProvider(CASSETTE_REPLAY_PATH, timing=CASSETTE_REPLAY_TIMING)
+        self.recorder = CassetteWriter(CASSETTE_RECORD_PATH) if CASSETTE_RECORD_PATH else None
+
+        # 주입된 프로바이더(가짜 백엔드 등)가 없으면 단계별로 설정된 Gemini 모델 사용
+        router = None
+        if provider is None and MODEL_ROUTING_ENABLED:
+            router = build_router(lambda model: self._recording(GeminiProvider(GEMINI_API_KEY, model)))
+        self.router = router
+
+        self.entity_extractor = EntityExtractor(GEMINI_API_KEY, provider=provider, router=router)
+        self.template_generator = TemplateGenerator(GEMINI_API_KEY, provider=provider, router=router)
+        if ENTITY_BATCH_WINDOW_MS > 0:
+            self.entity_extractor.enable_batching(ENTITY_BATCH_WINDOW_MS / 1000, ENTITY_BATCH_MAX_SIZE)
+        if self.recorder:
+            for processor in (self.entity_extractor, self.template_generator):
+                processor.provider = self._recording(processor.provider)
+                processor.prefix_cache = prefix_cache_for(processor.provider)
         self.data_processor = DataProcessor()
-
-        self.templates = self._load_sample_templates()
+        self.agent2 = Agent2(
+            judge=GuidelineJudgeAgent(self.template_generator),
+            stage_timeout=VALIDATION_STAGE_TIMEOUT,
+            judge_timeout=JUDGE_TIMEOUT,
+            max_concurrent=MAX_CONCURRENT_VALIDATIONS,
+        )
+        self.in_flight = SingleFlight()
+        self._draft_pool = None
+        if SPECULATIVE_GENERATION:
+            self.enable_speculation()
+        self.sessions = SessionCache(max_sessions=SESSION_CACHE_SIZE, ttl=SESSION_TTL_SECONDS)
+        self.index_cache_dir = Path(index_cache_dir or INDEX_CACHE_DIR)
+
+        if template_library_dir is None:
+            template_library_dir = self.index_cache_dir / "template_library" if index_cache_dir else TEMPLATE_LIBRARY_DIR
+        self.template_library = self._open_template_library(Path(template_library_dir))
         self.guidelines = self._load_guidelines()
 
-        self._build_indexes()
-
-    def _load_sample_templates(self) -> list:
-        """샘플 템플릿 로드"""
-        return [
-            "[가격 변경 안내]\n\n안녕하세요, #{수신자명}님.\n#{서비스명} 서비스 가격 변경을 안내드립니다.\n\n▶ 변경 적용일: #{적용일}\n▶ 기존 가격: #{기존가격}원\n▶ 변경 가격: #{변경가격}원\n\n[변경 사유 및 개선사항]\n#{변경사유}에 따라 서비스 품질 개선을 위해 가격을 조정합니다.\n주요 개선사항: #{개선사항}\n\n[기존 이용자 안내]\n- 현재 이용 중인 서비스: #{유예기간}까지 기존 가격 적용\n- 자동 연장 서비스: 변경된 가격으로 갱신\n- 서비스 해지 희망: #{해지마감일}까지 신청 가능\n\n[문의 및 지원]\n- 고객센터: #{고객센터번호}\n- 상담시간: 평일 09:00-18:00\n- 온라인 문의: #{문의링크}\n\n※ 본 메시지는 정보통신망법에 따라 서비스 약관 변경 안내를 위해 발송된 정보성 메시지입니다.",
-            "[#{매장명} 방문 예약 확인]\n\n#{고객명}님, 안녕하세요.\n#{매장명} 방문 예약이 완료되었습니다.\n\n▶ 예약 정보\n- 예약번호: #{예약번호}\n- 방문일시: #{방문일시}\n- 예상 소요시간: #{소요시간}\n- 담당 직원: #{담당자명}\n\n▶ 매장 정보\n- 위치: #{매장주소}\n- 연락처: #{매장전화번호}\n- 주차: #{주차안내}\n\n[방문 전 준비사항]\n- 신분증 지참 필수 (본인 확인)\n- 예약 10분 전 도착 권장\n- 마스크 착용 협조\n- 예약 확인 문자 제시\n\n[교통 및 위치 안내]\n- 대중교통: #{교통편안내}\n- 자가용: #{길찾기정보}\n- 주변 랜드마크: #{랜드마크}\n\n[예약 변경 및 취소]\n방문 예정일 1일 전까지 변경/취소 가능\n- 전화: #{매장전화번호}\n- 온라인: #{변경링크}\n- 문자 회신으로도 변경 가능\n\n※ 본 메시지는 매장 방문 예약 신청고객에게 발송되는 예약 확인 메시지입니다.",
-            "[#{행사명} 참가 안내]\n\n#{수신자명}님, 안녕하세요.\n#{주최기관}에서 개최하는 #{행사명} 참가를 안내드립니다.\n\n▶ 행사 개요\n- 행사명: #{행사명}\n- 일시: #{행사일시}\n- 장소: #{행사장소}\n- 대상: #{참가대상}\n- 참가비: #{참가비}\n\n▶ 프로그램 일정\n#{프로그램일정상세}\n\n▶ 참가 신청\n- 신청 방법: #{신청방법}\n- 신청 마감: #{신청마감일}\n- 신청 문의: #{신청문의전화}\n- 온라인 신청: #{신청링크}\n\n[준비물 및 복장]\n- 필수 준비물: #{필수준비물}\n- 권장 복장: #{복장안내}\n- 개인 준비물: #{개인준비물}\n\n[행사장 안내]\n- 상세 주소: #{상세주소}\n- 교통편: #{교통편}\n- 주차 시설: #{주차정보}\n- 편의 시설: #{편의시설}\n\n[주의사항 및 안내]\n- 코로나19 방역수칙 준수\n- 행사 당일 발열체크 실시\n- 우천 시 일정: #{우천시대안}\n- 기타 문의: #{기타문의처}\n\n※ 본 메시지는 #{행사명} 관심 등록자에게 발송되는 행사 안내 메시지입니다.",
-        ]
+        # 템플릿 인덱스는 바로 만들고, 가이드라인은 어휘 검색으로 먼저 서비스한 뒤
+        # 벡터 인덱스가 준비되면 교체 (콜드 스타트가 임베딩을 기다리지 않음)
+        self._index_state = {"templates": "pending", "guidelines": "lexical"}
+        self._index_ready = threading.Event()
+        self._guideline_backend = ("lexical", LexicalIndex(list(self.guidelines)))
+
+        self._build_template_index()
+        self._index_state["templates"] = "ready"
+
+        if background_index and self.guidelines:
+            threading.Thread(
+                target=self._build_guideline_index_in_background, name="guideline-index", daemon=True
+            ).start()
+        elif self.guidelines:
+            self._build_guideline_index()
+        else:
+            self._index_ready.set()
+
+    def enable_speculation(self, max_workers: int = MAX_CONCURRENT_VALIDATIONS) -> None:
+        """엔티티 추출과 동시에 규칙 기반 엔티티로 검색/생성 초안을 시작 (_speculate)"""
+        if self._draft_pool is None:
+            self._draft_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative")
+
+    def _recording(self, provider):
+        """녹화 중이면 프로바이더를 녹화 래퍼로 감쌈"""
+        return RecordingProvider(provider, self.recorder) if self.recorder else provider
+
+    def _open_template_library(self, library_dir: Path) -> TemplateLibrary:
+        """승인 템플릿 라이브러리 열기 (비어 있으면 시드 템플릿으로 초기화)"""
+        library = TemplateLibrary(library_dir, embedding_key=self.template_generator.embedding_key)
+        seed = Path(TEMPLATE_LIBRARY_SEED)
+        if not len(library) and seed.exists():
+            summary = library.add(read_jsonl(seed))
+            print(f"📥 시드 템플릿 {summary['imported']}개로 라이브러리 초기화: {library_dir}")
+        return library
 
     def _load_guidelines(self) -> list:
         """predata 폴더의 모든 파일 로드 및 임베딩"""
         all_chunks = []
+        all_sources = []
+        self.guideline_sources = []
         predata_dir = Path("predata")
         
         if not predata_dir.exists():
@@ -53,6 +163,17 @@ class TemplateSystem:
                 "pdf_extraction_results.txt"
             ]
             
+            # 원본 PDF를 모두 수집했으면 페이지 태그 청크를 쓰고 통짜 텍스트 덤프는 건너뜀
+            # (하나라도 실패하면 그 내용이 빠지지 않도록 덤프 유지)
+            pdf_files = sorted(Path(GUIDELINE_PDF_DIR).glob("*.pdf"))
+            pdf_chunks = {}
+            if pdf_files:
+                pdf_chunks = ingest_pdfs(pdf_files, self.entity_extractor.chunk_text, Path(PDF_CACHE_DIR))
+                if len(pdf_chunks) == len(pdf_files):
+                    predata_files.remove("pdf_extraction_results.txt")
+                else:
+                    print(f"⚠️ PDF {len(pdf_files) - len(pdf_chunks)}개 수집 실패 - pdf_extraction_results.txt 유지")
+            
             print(f"📁 predata 폴더에서 {len(predata_files)}개 파일 로딩 중...")
             
             for filename in predata_files:
@@ -66,6 +187,7 @@ class TemplateSystem:
                         # 청킹
                         chunks = self.entity_extractor.chunk_text(content, 800, 100)
                         all_chunks.extend(chunks)
+                        all_sources.extend([filename] * len(chunks))
                         print(f"✅ {filename}: {len(chunks)}개 청크 생성")
                         
                     except Exception as e:
@@ -73,82 +195,433 @@ class TemplateSystem:
                 else:
                     print(f"⚠️ {filename} 파일이 존재하지 않습니다.")
             
+            for filename, chunks in pdf_chunks.items():
+                all_chunks.extend(chunks)
+                all_sources.extend([filename] * len(chunks))
+                print(f"✅ {filename}: {len(chunks)}개 페이지 태그 청크 생성")
+            
             print(f"🔄 총 {len(all_chunks)}개 청크를 predata에서 로드 완료")
-            return all_chunks
+            
+            # 임베딩 전에 준중복 청크를 하나로 합침 (출처 목록은 유지)
+            unique_chunks, self.guideline_sources = dedupe_chunks(all_chunks, all_sources)
+            print(f"🧹 준중복 제거: {len(all_chunks)}개 → {len(unique_chunks)}개 청크")
+            return unique_chunks
             
         except Exception as e:
             print(f"가이드라인 로드 오류: {e}")
             return []
 
     def _build_indexes(self):
-        """인덱스 구축"""
-        # 템플릿 인덱스
-        if self.templates:
-            clean_templates = []
-            for template in self.templates:
-                clean_template = re.sub(r"#\{[^}]+\}", "[VARIABLE]", template)
-                clean_templates.append(clean_template)
-
-            template_embeddings = self.template_generator.encode_texts(clean_templates)
-            self.template_generator.template_index = (
-                self.template_generator.build_faiss_index(template_embeddings)
-            )
-            self.template_generator.templates = self.templates
+        """인덱스 구축 (같은 코퍼스는 저장된 인덱스/청크 저장소를 mmap으로 공유)"""
+        self._build_template_index()
+        self._build_guideline_index()
+
+    def _build_template_index(self):
+        """템플릿 라이브러리에서 아직 색인되지 않은 템플릿만 임베딩 (대량 가져오기는 CLI로 미리)"""
+        try:
+            added = self.template_library.sync_index(self.template_generator.encode_texts_strict)
+            if added:
+                print(f"✅ 템플릿 {added}개 색인 (총 {self.template_library.indexed_count}개)")
+        except Exception as e:
+            # 색인된 템플릿만으로 검색 (다음 시작 때 이어서 색인)
+            print(f"⚠️ 템플릿 색인 실패 - 색인된 {self.template_library.indexed_count}개만 검색: {e}")
+
+    def _build_guideline_index(self):
+        """가이드라인 벡터 인덱스 구축 후 검색 백엔드를 한 번에 교체"""
+        if not self.guidelines:
+            return
 
-        # 가이드라인 인덱스
-        if self.guidelines:
-            guideline_embeddings = self.entity_extractor.encode_texts(self.guidelines)
-            self.entity_extractor.guideline_index = (
-                self.entity_extractor.build_faiss_index(guideline_embeddings)
+        start = time.perf_counter()
+        index, guidelines = self.entity_extractor.load_or_build_index(
+            "guidelines", self.guidelines, self.index_cache_dir, sources=self.guideline_sources
+        )
+        if not isinstance(guidelines, ChunkStore) and self.entity_extractor.embedding_degraded:
+            # 폴백(TF-IDF) 벡터 인덱스는 모델 임베딩 질의와 차원/공간이 달라 검색이 안 되므로 어휘 검색 유지
+            print("⚠️ 가이드라인 임베딩 실패 - 벡터 인덱스 대신 어휘 검색 유지")
+            self._index_state.update(
+                guidelines="degraded", guideline_build_seconds=round(time.perf_counter() - start, 3)
             )
-            self.entity_extractor.guidelines = self.guidelines
+            self._index_ready.set()
+            return
+
+        self.entity_extractor.guideline_index = index
+        self.entity_extractor.guidelines = guidelines
+        self.entity_extractor.guideline_sources = getattr(guidelines, "sources", self.guideline_sources)
+
+        # 힙의 청크 문자열은 버리고 mmap 저장소 하나만 유지
+        self.guidelines = self.entity_extractor.guidelines
+        self.guideline_sources = self.entity_extractor.guideline_sources
+
+        # 의도별 상위 청크는 번들에 저장해 두고 재사용 (워밍업 프로세스가 계산하면 워커는 읽기만 함)
+        intent_guidelines = None
+        if PRECOMPUTED_INTENT_GUIDELINES:
+            try:
+                intent_guidelines = IntentGuidelines.load_or_build(
+                    guidelines.path.parent if isinstance(guidelines, ChunkStore) else None,
+                    guidelines,
+                    lambda query, top_k: self.entity_extractor.search_index(query, index, top_k),
+                )
+            except Exception as e:
+                print(f"⚠️ 의도별 가이드라인 사전 계산 실패 - 실시간 검색만 사용: {e}")
 
-    def generate_template(self, user_input: str) -> dict:
-        """템플릿 생성"""
+        # 튜플 하나를 교체하므로 검색 중인 요청은 이전/새 백엔드 중 하나를 온전히 사용
+        self._guideline_backend = ("vector", index, guidelines, intent_guidelines)
+        self._index_state.update(guidelines="ready", guideline_build_seconds=round(time.perf_counter() - start, 3))
+        self._index_ready.set()
 
-        # 1. 엔티티 추출
-        entities = self.entity_extractor.extract_entities(user_input)
+    def _build_guideline_index_in_background(self):
+        """백그라운드 스레드 진입점 (실패 시 어휘 검색 유지)"""
+        self._index_state["guidelines"] = "building"
+        try:
+            self._build_guideline_index()
+            if self._index_state["guidelines"] == "ready":
+                print(f"✅ 가이드라인 인덱스 준비 완료 ({self._index_state.get('guideline_build_seconds')}초)")
+        except Exception as e:
+            print(f"⚠️ 가이드라인 인덱스 구축 실패 - 어휘 검색 유지: {e}")
+            self._index_state["guidelines"] = "failed"
+        finally:
+            self._index_ready.set()
+
+    def readiness(self) -> dict:
+        """준비 상태 (guidelines: lexical → building → ready | degraded(임베딩 실패, 어휘 검색 유지) | failed)"""
+        state = dict(self._index_state)
+        state["ready"] = state["guidelines"] == "ready"
+        state["guideline_backend"] = self._guideline_backend[0]
+        state["guideline_chunks"] = len(self.guidelines)
+        return state
+
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """가이드라인 벡터 인덱스 준비(또는 실패)까지 대기"""
+        self._index_ready.wait(timeout)
+        return self._index_state["guidelines"] == "ready"
+
+    def generate_template(
+        self, user_input: str, request_id: str = None, session_id: str = None, deadline: float = None
+    ) -> dict:
+        """템플릿 생성 (요청 ID가 모든 단계 스팬과 모델 호출 지표에 전파됨)
+
+        session_id를 주면 생성 문맥을 세션 캐시에 저장해 refine_template으로 이어서 수정 가능.
+        deadline(초, 기본 REQUEST_DEADLINE_SECONDS) 안에 끝나도록 남은 시간에 따라 단계를 줄임
+        """
+        if deadline is None:
+            deadline = REQUEST_DEADLINE_SECONDS or None
+        with request_context(request_id) as request_id, deadline_scope(self._internal_deadline(deadline)):
+            metrics.increment("requests_total")
+            with metrics.span("request"):
+                # 같은 입력이 동시에 들어오면 파이프라인은 한 번만 실행하고 결과 공유
+                try:
+                    (result, context), shared = self.in_flight.do(
+                        coalesce_key(user_input), lambda: self._run_pipeline(user_input)
+                    )
+                except DeadlineExceeded:
+                    # 리더를 기다리다 마감을 넘기면 혼자 처리할 때처럼 남은 시간만큼 축소해 직접 처리 (기본 템플릿)
+                    (result, context), shared = self._run_pipeline(user_input), False
+            if shared:
+                metrics.increment("coalesced_requests_total")
+                result = copy.deepcopy(result)
+            else:
+                result = dict(result)
+            if session_id:
+                self.sessions.put(session_id, context)
+                result["session_id"] = session_id
+            result["request_id"] = request_id
+            result["coalesced"] = shared
+            return result
+
+    def refine_template(self, session_id: str, instruction: str, request_id: str = None) -> dict:
+        """세션의 직전 템플릿을 수정 (엔티티/검색 결과 재사용, 생성 호출 1회 + 검증)
+
+        세션이 없거나 만료됐으면 KeyError
+        """
+        context = self.sessions.get(session_id)
+        if context is None:
+            metrics.increment("session_cache_misses_total")
+            raise KeyError(session_id)
+
+        with request_context(request_id) as request_id, \
+                deadline_scope(self._internal_deadline(REQUEST_DEADLINE_SECONDS or None)):
+            metrics.increment("requests_total", kind="refine")
+            metrics.increment("session_cache_hits_total")
+            with metrics.span("request", kind="refine"):
+                with metrics.span("generation", kind="refine"):
+                    template = self.template_generator.refine_template(
+                        context.template, instruction, context.entities, context.guidelines
+                    )
+                with metrics.span("optimization"):
+                    template = self.template_generator.optimize_template(template, context.entities)
+                with metrics.span("validation"):
+                    validation = self.agent2.validate(template, context.entities, context.guidelines)
+
+            # 반려된 수정본은 세션에 반영하지 않아 다음 수정이 통과한 템플릿에서 출발
+            if validation["approved"]:
+                context = context.revised(template)
+            self.sessions.put(session_id, context)
+
+            return {
+                **self._build_result(context.user_input, template, context.entities, validation),
+                "instruction": instruction,
+                "revision": context.revisions,
+                "session_id": session_id,
+                "request_id": request_id,
+            }
+
+    def generate_variants(self, user_input: str, count: int = 3, request_id: str = None) -> dict:
+        """스타일별 템플릿 여러 개를 동시에 생성해 점수 순 목록 반환 (1위 템플릿만 검증)
+
+        스타일이 TEMPLATE_STYLES 수만큼이므로 count는 1 ~ len(TEMPLATE_STYLES), 범위를 벗어나면 ValueError
+        """
+        if not 1 <= count <= len(TEMPLATE_STYLES):
+            raise ValueError(f"count는 1~{len(TEMPLATE_STYLES)} 사이여야 합니다 (스타일 {len(TEMPLATE_STYLES)}종): {count}")
+        with request_context(request_id) as request_id, \
+                deadline_scope(self._internal_deadline(REQUEST_DEADLINE_SECONDS or None)):
+            metrics.increment("requests_total", kind="variants")
+            with metrics.span("request", kind="variants"):
+                degraded = []
+                entities, similar_templates, guidelines = self._retrieve(user_input, degraded)
+
+                with metrics.span("generation"):
+                    variants = self.template_generator.generate_variants(
+                        user_input, entities, similar_templates, guidelines,
+                        styles=list(TEMPLATE_STYLES)[:count],
+                    )
+
+                with metrics.span("validation"):
+                    validation = self.agent2.validate(variants[0]["template"], entities, guidelines)
+
+            return {
+                "user_input": user_input,
+                "variants": variants,
+                "entities": entities,
+                "validation": validation,
+                "degraded": degraded,
+                "request_id": request_id,
+            }
+
+    def _retrieve(self, user_input: str, degraded: list = None) -> tuple:
+        """엔티티 추출 + 유사 템플릿/가이드라인 검색 (생성 단계들이 공유하는 문맥)
+
+        요청 마감이 가까우면 가이드라인 검색 생략 → 규칙 기반 엔티티 순으로 줄이고 degraded에 기록
+        """
+        degraded = degraded if degraded is not None else []
+        entities = self._extract_entities(user_input, degraded)
+        similar_templates, guidelines = self._search(user_input, entities, degraded)
+        return entities, similar_templates, guidelines
+
+    def _extract_entities(self, user_input: str, degraded: list) -> dict:
+        """1. 엔티티 추출 (시간이 부족하면 규칙 기반)"""
+        with metrics.span("entity_extraction"):
+            if has_time(DEGRADE_LLM_ENTITIES_BELOW):
+                with deadline_scope(self._budget_after(self._generation_reserve())):
+                    return self.entity_extractor.extract_entities(user_input)
+            self._degrade(degraded, "llm_entities")
+            return self.entity_extractor.extract_entities_by_rules(user_input)
+
+    def _search(self, user_input: str, entities: dict, degraded: list) -> tuple:
+        """2~3. 유사 템플릿/가이드라인 검색 (유사 템플릿, 가이드라인) 반환"""
+        # 검색 단계들은 생성과 검증에 쓸 시간을 남겨두고 실행
+        generation_reserve = self._generation_reserve()
 
         # 2. 유사 템플릿 검색
-        similar_templates = self.template_generator.search_similar(
-            user_input,
-            self.template_generator.template_index,
-            self.template_generator.templates,
-            top_k=3,
+        budget = self._budget_after(generation_reserve)
+        if budget == 0.0:
+            self._degrade(degraded, "template_search")
+            similar_templates = []
+        else:
+            with metrics.span("template_search"), deadline_scope(budget):
+                similar_templates = self._search_templates(user_input, entities)
+
+        # 3. 관련 가이드라인 검색 (의도별 사전 계산 결과 → 벡터 검색, 벡터 인덱스 준비 전에는 어휘 검색)
+        if not has_time(DEGRADE_GUIDELINE_SEARCH_BELOW):
+            self._degrade(degraded, "guideline_search")
+            return similar_templates, []
+
+        backend = self._guideline_backend
+        if backend[0] == "vector" and backend[3] is not None:
+            with metrics.span("guideline_search", backend="precomputed"):
+                precomputed = backend[3].lookup(entities.get("message_intent", ""))
+            metrics.increment("precomputed_guidelines_total", result="miss" if precomputed is None else "hit")
+            if precomputed is not None:
+                return similar_templates, precomputed
+
+        query = user_input + " " + entities.get("message_intent", "")
+        with metrics.span("guideline_search", backend=backend[0]):
+            if backend[0] == "vector":
+                with deadline_scope(self._budget_after(generation_reserve)):
+                    relevant_guidelines = self.entity_extractor.search_similar(
+                        query, backend[1], backend[2], top_k=3
+                    )
+            else:
+                metrics.increment("lexical_fallback_total")
+                relevant_guidelines = backend[1].search(query, top_k=3)
+        guidelines = [guideline for guideline, _ in relevant_guidelines]
+        return similar_templates, guidelines
+
+    def _generate(self, user_input: str, entities: dict, similar_templates: list, guidelines: list,
+                  degraded: list) -> str:
+        """4. 템플릿 생성 (시간이 부족하면 모델 호출 없이 기본 템플릿)"""
+        with metrics.span("generation"):
+            if has_time(DEGRADE_LLM_GENERATION_BELOW):
+                with deadline_scope(self._budget_after(VALIDATION_RESERVE_SECONDS)):
+                    template, _ = self.template_generator.generate_template(
+                        user_input, entities, similar_templates, guidelines
+                    )
+                return template
+            self._degrade(degraded, "llm_generation")
+            return self.template_generator._generate_fallback_template(user_input, entities)
+
+    def _speculate(self, user_input: str, degraded: list) -> tuple:
+        """규칙 기반 엔티티로 검색+생성 초안을 엔티티 추출과 동시에 실행
+
+        추출된 엔티티와 의도/메시지 유형이 같으면 초안을 그대로 쓰고, 다르면 추출 결과로 검색/생성을 다시 함.
+        speculative_drafts_total{result=accepted|rejected|failed}로 채택률 확인
+        """
+        draft_entities = self.entity_extractor.extract_entities_by_rules(user_input)
+        draft_degraded = []
+        draft = submit_with_context(self._draft_pool, self._draft, user_input, draft_entities, draft_degraded)
+
+        entities = self._extract_entities(user_input, degraded)
+        if self._draft_agrees(entities, draft_entities):
+            try:
+                similar_templates, guidelines, template = draft.result(timeout=bounded(None))
+            except FuturesTimeout:
+                result = "failed"
+            except Exception as e:
+                print(f"⚠️ 추측 초안 실패 - 다시 생성: {e}")
+                result = "failed"
+            else:
+                metrics.increment("speculative_drafts_total", result="accepted")
+                degraded.extend(draft_degraded)
+                return entities, similar_templates, guidelines, template
+        else:
+            result = "rejected"
+            draft.cancel()   # 아직 시작 전이면 호출 절약, 이미 실행 중이면 결과만 버림
+
+        metrics.increment("speculative_drafts_total", result=result)
+        similar_templates, guidelines = self._search(user_input, entities, degraded)
+        template = self._generate(user_input, entities, similar_templates, guidelines, degraded)
+        return entities, similar_templates, guidelines, template
+
+    def _draft(self, user_input: str, entities: dict, degraded: list) -> tuple:
+        with metrics.span("speculative_draft"):
+            similar_templates, guidelines = self._search(user_input, entities, degraded)
+            template = self._generate(user_input, entities, similar_templates, guidelines, degraded)
+        return similar_templates, guidelines, template
+
+    @staticmethod
+    def _draft_agrees(entities: dict, draft_entities: dict) -> bool:
+        """초안을 쓸 수 있는지 (정규화한 의도와 광고성 여부가 같으면 생성 프롬프트의 방향이 같음)"""
+        def is_ad(entities: dict) -> bool:
+            return "광고" in str(entities.get("message_type", ""))
+
+        return (
+            canonical_intent(entities.get("message_intent")) == canonical_intent(draft_entities.get("message_intent"))
+            and is_ad(entities) == is_ad(draft_entities)
         )
 
-        # 3. 관련 가이드라인 검색
-        relevant_guidelines = self.entity_extractor.search_similar(
-            user_input + " " + entities.get("message_intent", ""),
-            self.entity_extractor.guideline_index,
-            self.entity_extractor.guidelines,
-            top_k=3,
-        )
-        guidelines = [guideline for guideline, _ in relevant_guidelines]
+    def _search_templates(self, user_input: str, entities: dict, top_k: int = 3) -> list:
+        """같은 의도의 승인 템플릿 우선 검색 (부족하면 전체에서 보충)"""
+        try:
+            query = self.template_generator.embed_query(user_input)
+            results = self.template_library.search(query, top_k, intent=entities.get("message_intent"))
+            if len(results) < top_k:
+                seen = {text for text, _ in results}
+                results += [
+                    item for item in self.template_library.search(query, top_k) if item[0] not in seen
+                ][:top_k - len(results)]
+                metrics.increment("template_search_unfiltered_total")
+            return results
+        except Exception as e:
+            print(f"❌ 템플릿 검색 오류: {e}")
+            return []
 
-        # 4. 템플릿 생성
-        template, filled_template = self.template_generator.generate_template(
-            user_input, entities, similar_templates, guidelines
-        )
+    @staticmethod
+    def _internal_deadline(deadline: float = None):
+        """단계들이 쓸 마감 (응답 조립 여유를 뺌)"""
+        return None if deadline is None else max(0.0, deadline - DEADLINE_RESPONSE_MARGIN)
+
+    @staticmethod
+    def _generation_reserve() -> float:
+        return DEGRADE_LLM_GENERATION_BELOW + VALIDATION_RESERVE_SECONDS
+
+    @staticmethod
+    def _budget_after(reserve: float):
+        """뒤 단계에 reserve초를 남기고 쓸 수 있는 시간 (마감이 없으면 None)"""
+        left = remaining()
+        return None if left is None else max(0.0, left - reserve)
+
+    @staticmethod
+    def _degrade(degraded: list, step: str) -> None:
+        print(f"⏳ 요청 마감 임박 - {step} 단계 축소")
+        metrics.increment("degraded_total", step=step)
+        degraded.append(step)
+
+    def _run_pipeline(self, user_input: str) -> tuple:
+        """엔티티 추출 → 검색 → 생성 → 최적화 → 검증 (결과, 세션 문맥) 반환"""
+        degraded = []
+        if self._draft_pool is not None:
+            entities, similar_templates, guidelines, template = self._speculate(user_input, degraded)
+        else:
+            entities, similar_templates, guidelines = self._retrieve(user_input, degraded)
+            template = self._generate(user_input, entities, similar_templates, guidelines, degraded)
 
         # 5. 템플릿 최적화
-        optimized_template = self.template_generator.optimize_template(
-            template, entities
-        )
+        with metrics.span("optimization"):
+            optimized_template = self.template_generator.optimize_template(
+                template, entities
+            )
 
-        # 6. 변수 추출
-        variables = self.template_generator.extract_variables(optimized_template)
+        # 6. 템플릿 검증 (반려 시 사유를 반영해 제한된 횟수만큼 재생성)
+        with metrics.span("validation"):
+            validation = self.agent2.validate(optimized_template, entities, guidelines)
+        attempts = 0
+        while not validation["approved"] and attempts < MAX_REGENERATION_ATTEMPTS:
+            if not has_time(DEGRADE_LLM_GENERATION_BELOW + VALIDATION_RESERVE_SECONDS):
+                self._degrade(degraded, "regeneration")
+                break
+            attempts += 1
+            metrics.increment("regenerations_total", stage=validation["stage"])
+            print(f"🔁 검증 반려 ({validation['stage']}) - 재생성 {attempts}/{MAX_REGENERATION_ATTEMPTS}")
+            with metrics.span("generation", attempt=attempts), \
+                    deadline_scope(self._budget_after(VALIDATION_RESERVE_SECONDS)):
+                template, _ = self.template_generator.generate_template(
+                    self._with_feedback(user_input, validation), entities, similar_templates, guidelines
+                )
+            with metrics.span("optimization", attempt=attempts):
+                optimized_template = self.template_generator.optimize_template(
+                    template, entities
+                )
+            with metrics.span("validation", attempt=attempts):
+                validation = self.agent2.validate(optimized_template, entities, guidelines)
+
+        # 7. 변수 추출
+        result = self._build_result(user_input, optimized_template, entities, validation)
+        result["regeneration_attempts"] = attempts
+        result["degraded"] = degraded
+
+        context = SessionContext(
+            user_input=user_input,
+            entities=entities,
+            similar_templates=similar_templates,
+            guidelines=guidelines,
+            template=optimized_template,
+        )
+        return result, context
 
+    def _build_result(self, user_input: str, template: str, entities: dict, validation: dict) -> dict:
         return {
             "user_input": user_input,
-            "generated_template": optimized_template,
-            "filled_template": self.template_generator._fill_template_with_entities(
-                optimized_template, entities
-            ),
-            "variables": variables,
+            "generated_template": template,
+            "filled_template": self.template_generator._fill_template_with_entities(template, entities),
+            "variables": self.template_generator.extract_variables(template),
             "entities": entities,
+            "validation": validation,
         }
 
+    def _with_feedback(self, user_input: str, validation: dict) -> str:
+        """반려 사유를 재생성 요청에 덧붙임"""
+        feedback = "\n".join(f"- {item}" for item in validation["issues"] + validation["suggestions"])
+        return f"{user_input}\n\n[이전 템플릿 반려 사유 - 반드시 수정]\n{feedback}"
+
 
 def main():
     """메인 실행 함수 - 간단한 템플릿 생성"""
@@ -157,13 +630,14 @@ def main():
 
     try:
         system = TemplateSystem()
-        print("✅ 시스템 준비 완료\n")
+        session_id = new_session_id()
+        print("✅ 시스템 준비 완료 (가이드라인 인덱스는 백그라운드에서 구축, 그동안 어휘 검색 사용)\n")
     except Exception as e:
         print(f"❌ 시스템 초기화 실패: {e}")
         return
 
     while True:
-        print("💬 알림톡 내용을 설명해주세요:")
+        print("💬 알림톡 내용을 설명해주세요: ('/variants 설명' 입력 시 스타일별 3개 생성, '/refine 요청' 입력 시 직전 템플릿 수정)")
 
         user_input = input("\n➤ ").strip()
 
@@ -171,17 +645,69 @@ def main():
             print("👋 시스템을 종료합니다.")
             break
 
+        if user_input.lower() == "metrics":
+            print(metrics.to_prometheus())
+            continue
+
+        if user_input.startswith("/variants "):
+            print("\n🔄 스타일별 템플릿 동시 생성 중...")
+            try:
+                result = system.generate_variants(user_input[len("/variants "):].strip())
+            except Exception as e:
+                print(f"❌ 오류: {e}\n")
+                continue
+            for rank, variant in enumerate(result["variants"], 1):
+                print(f"\n#{rank} [{variant['style']}] {variant['score']}점")
+                print("=" * 50)
+                print(variant["template"])
+                print("=" * 50)
+            print(f"\n{'✅' if result['validation']['approved'] else '⚠️'} 1위 템플릿 검증: {result['validation']['stage']}\n")
+            continue
+
+        if user_input.startswith("/refine "):
+            instruction = user_input[len("/refine "):].strip()
+            print("\n🔄 직전 템플릿 수정 중 (추출/검색 결과 재사용)...")
+            try:
+                result = system.refine_template(session_id, instruction)
+            except KeyError:
+                print("❌ 수정할 템플릿이 없습니다. 먼저 템플릿을 생성해주세요.\n")
+                continue
+            except Exception as e:
+                print(f"❌ 오류: {e}\n")
+                continue
+            print(f"\n✨ 수정된 템플릿 (수정 {result['revision']}회):")
+            print("=" * 50)
+            print(result["generated_template"])
+            print("=" * 50)
+            validation = result["validation"]
+            if validation["approved"]:
+                print(f"\n✅ 검증 통과 ({validation['stage']})\n")
+            else:
+                print(f"\n⚠️ 검증 미통과 ({validation['stage']}) - 세션에는 이전 템플릿 유지:")
+                for issue in validation["issues"]:
+                    print(f"   - {issue}")
+                print()
+            continue
+
         if user_input:
             try:
                 print(f"\n💬 사용자 입력: '{user_input}'")
                 print("\n🔄 템플릿 생성 중...")
-                result = system.generate_template(user_input)
+                result = system.generate_template(user_input, session_id=session_id)
 
                 print("\n✨ 생성된 템플릿:")
                 print("=" * 50)
                 print(result["generated_template"])
                 print("=" * 50)
 
+                validation = result["validation"]
+                if validation["approved"]:
+                    print(f"\n✅ 검증 통과 ({validation['stage']}, {validation['elapsed']}초)")
+                else:
+                    print(f"\n⚠️ 검증 미통과 ({validation['stage']}):")
+                    for issue in validation["issues"]:
+                        print(f"   - {issue}")
+
                 print(f"\n📝 추출된 변수 ({len(result['variables'])}개):")
                 print(f"   {', '.join(result['variables'])}")
 
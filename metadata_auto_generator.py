@@ -3,10 +3,13 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any
 
+from utils.keyword_matcher import KeywordScan, get_keyword_matcher
+from utils.page_urls import PAGE_URLS
+
 # Google AI 없이 작동하는 버전
 try:
     import google.generativeai as genai
-    from config import GEMINI_API_KEY
+    from config import GEMINI_API_KEY, MODEL_ROUTES
     USE_AI = True
 except ImportError:
     USE_AI = False
@@ -18,23 +21,15 @@ class MetadataAutoGenerator:
     def __init__(self):
         if USE_AI:
             genai.configure(api_key=GEMINI_API_KEY)
-            self.model = genai.GenerativeModel("gemini-1.5-flash")
+            self.model = genai.GenerativeModel(MODEL_ROUTES["metadata"][0])
         else:
             self.model = None
         
+        # 메타데이터 감지용 다중 패턴 매처
+        self.keyword_matcher = get_keyword_matcher()
+        
         # 파일별 페이지 URL 매핑 (간단하게!)
-        self.page_urls = {
-            "cleaned_add_infotalk.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend",
-            "cleaned_black_list.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/audit/black-list", 
-            "cleaned_white_list.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/audit/white-list",
-            "cleaned_content-guide.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/infotalk/content-guide",
-            "cleaned_message_yuisahang.md": "https://kakaobusiness.gitbook.io/main/ad/moment/start/messagead/operations",
-            "cleaned_info_simsa.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/audit",
-            "cleaned_alrimtalk.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend",
-            "cleaned_message.md": "https://kakaobusiness.gitbook.io/main/channel/run/message",
-            "cleaned_run_message.md": "https://kakaobusiness.gitbook.io/main/channel/run/message",
-            "cleaned_zipguide.md": "https://kakaobusiness.gitbook.io/main/"
-        }
+        self.page_urls = PAGE_URLS
 
         # 파일별 기본 메타데이터 템플릿 (기존대로)
         self.file_templates = {
@@ -82,95 +77,36 @@ class MetadataAutoGenerator:
         if subsection_match:
             metadata["subsection"] = subsection_match.group(1).strip()
             
+        # 모든 키워드 테이블을 한 번에 스캔
+        scan = self.keyword_matcher.scan(content)
+
         # 페이지 정보 자동 감지 (섹션 기반)
-        page_info = self._detect_page_info(content)
+        page_info = self._detect_page_info(content, scan)
         if page_info:
             metadata["page_reference"] = page_info
             
         # 심각도 감지
-        if any(word in content for word in ["영구적으로", "차단", "중지", "금지"]):
-            metadata["severity"] = "critical"
-        elif any(word in content for word in ["제한", "반려", "위반"]):
-            metadata["severity"] = "high"
-        elif any(word in content for word in ["권장", "주의", "확인"]):
-            metadata["severity"] = "medium"
-        else:
-            metadata["severity"] = "low"
+        metadata["severity"] = scan.first("severity", "low")
             
         # 콘텐츠 타입 감지
-        if "| " in content and "---|" in content:
+        if scan.has("table_syntax", "cell") and scan.has("table_syntax", "rule"):
             metadata["content_type"] = "table"
-        elif re.search(r'{% hint style="danger" %}', content):
-            metadata["content_type"] = "warning"
-        elif re.search(r'{% hint style="success" %}', content):
-            metadata["content_type"] = "example"
-        elif re.search(r'{% hint style="info" %}', content):
-            metadata["content_type"] = "info"
-        elif any(word in content for word in ["단계", "방법", "절차"]):
-            metadata["content_type"] = "procedure"
-        elif any(word in content for word in ["정의", "개념", "이란"]):
-            metadata["content_type"] = "definition"
         else:
-            metadata["content_type"] = "general"
+            metadata["content_type"] = scan.first("content_type", "general")
             
         # 컴플라이언스 레벨 감지
-        if any(word in content for word in ["필수", "반드시", "의무"]):
-            metadata["compliance_level"] = "mandatory"
-        elif any(word in content for word in ["권장", "바람직"]):
-            metadata["compliance_level"] = "recommended"
-        else:
-            metadata["compliance_level"] = "optional"
+        metadata["compliance_level"] = scan.first("compliance_level", "optional")
             
         # 키워드 추출
-        keywords = []
-        keyword_patterns = [
-            r'알림톡', r'친구톡', r'정보성', r'광고성', r'템플릿', 
-            r'심사', r'승인', r'반려', r'발송', r'채널',
-            r'정보통신망법', r'컴플라이언스', r'위반', r'차단'
-        ]
-        
-        for pattern in keyword_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                keywords.append(pattern)
-        
-        metadata["keywords"] = keywords[:5]  # 최대 5개
+        metadata["keywords"] = scan.matched("keywords")[:5]  # 최대 5개
         
         return metadata
     
-    def _detect_page_info(self, content: str) -> str:
+    def _detect_page_info(self, content: str, scan: KeywordScan = None) -> str:
         """콘텐츠에서 페이지 정보 자동 감지"""
-        # 회원가입 관련
-        if any(keyword in content for keyword in ["회원가입", "가입", "회원"]):
-            return "회원가입 가이드"
-        # 주문/배송 관련  
-        elif any(keyword in content for keyword in ["주문", "배송", "택배", "결제"]):
-            return "주문/배송 가이드"
-        # 예약 관련
-        elif any(keyword in content for keyword in ["예약", "신청", "방문"]):
-            return "예약/신청 가이드"
-        # 쿠폰/포인트 관련
-        elif any(keyword in content for keyword in ["쿠폰", "포인트", "마일리지", "적립"]):
-            return "쿠폰/포인트 가이드"
-        # 금융 관련
-        elif any(keyword in content for keyword in ["은행", "대출", "이자", "증권", "카드"]):
-            return "금융 서비스 가이드"
-        # 보안 관련
-        elif any(keyword in content for keyword in ["보안", "안전", "OTP", "비밀번호"]):
-            return "보안/안전 가이드"
-        # 심사 관련
-        elif any(keyword in content for keyword in ["심사", "승인", "반려", "검토"]):
-            return "심사 정책"
-        # 블랙리스트 관련
-        elif any(keyword in content for keyword in ["블랙리스트", "금지", "불가", "위반"]):
-            return "블랙리스트 정책"
-        # 화이트리스트 관련
-        elif any(keyword in content for keyword in ["화이트리스트", "허용", "가능", "발송"]):
-            return "화이트리스트 정책"
-        # 템플릿 제작 관련
-        elif any(keyword in content for keyword in ["템플릿", "제작", "가이드", "유형"]):
-            return "템플릿 제작 가이드"
-        else:
-            return "일반 가이드"
+        if scan is None:
+            scan = self.keyword_matcher.scan(content)
+        return scan.first("page_info", "일반 가이드")
     
     def extract_metadata_with_ai(self, content_chunk: str) -> Dict[str, Any]:
         """AI로 메타데이터 추출"""
@@ -0,0 +1,11 @@
+"""
+서빙 모듈
+
+- TemplateHTTPServer: TemplateSystem HTTP 엔드포인트
+- PreforkSupervisor: 인덱스를 한 번 구축한 뒤 워커를 fork하고 감시하는 감독 프로세스
+"""
+
+from .http_server import TemplateHTTPServer
+from .prefork import PreforkSupervisor
+
+__all__ = ['TemplateHTTPServer', 'PreforkSupervisor']
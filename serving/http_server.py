@@ -0,0 +1,101 @@
+"""
+TemplateSystem HTTP 엔드포인트 (표준 라이브러리 http.server 기반)
+
+- POST /generate  {"user_input": "..."}  → generate_template 결과 JSON
+                  {"user_input": "...", "variants": 3} → 스타일별 템플릿 점수 순 목록 (최대 스타일 수, 넘으면 400)
+- GET  /healthz                           → {"status": "ok", "pid": ...}
+- GET  /readyz                            → 인덱스 준비 상태 (ready, guideline_backend 등)
+- GET  /metrics                           → 워커 프로세스의 Prometheus 텍스트
+"""
+
+import json
+import os
+import socket
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.metrics import metrics
+from core.template_generator import TEMPLATE_STYLES
+
+MAX_BODY_BYTES = 64 * 1024
+
+
+class TemplateRequestHandler(BaseHTTPRequestHandler):
+    """요청 하나 처리 (스레드별 실행)"""
+
+    server_version = "JoberTemplate/1.0"
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok", "pid": os.getpid()})
+        elif self.path == "/readyz":
+            # 가이드라인 인덱스 구축 중에도 어휘 검색으로 요청은 처리 가능
+            self._send_json(200, {"pid": os.getpid(), **self.server.system.readiness()})
+        elif self.path == "/metrics":
+            self._send(200, metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(400, {"error": "요청 본문이 비었거나 너무 큽니다."})
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+            user_input = str(body["user_input"]).strip()
+            variants = int(body.get("variants") or 0)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self._send_json(400, {"error": '{"user_input": "..."} 형식이어야 합니다.'})
+            return
+        if not user_input:
+            self._send_json(400, {"error": "입력이 비어있습니다."})
+            return
+        if variants > len(TEMPLATE_STYLES):
+            self._send_json(400, {"error": f"variants는 최대 {len(TEMPLATE_STYLES)}개입니다 (스타일 {len(TEMPLATE_STYLES)}종)."})
+            return
+
+        try:
+            if variants > 1:
+                result = self.server.system.generate_variants(
+                    user_input, count=variants, request_id=self.headers.get("X-Request-ID")
+                )
+            else:
+                result = self.server.system.generate_template(
+                    user_input, request_id=self.headers.get("X-Request-ID")
+                )
+        except Exception as e:
+            metrics.increment("http_errors_total", path=self.path)
+            self._send_json(500, {"error": str(e)})
+            return
+        result["worker_pid"] = os.getpid()
+        self._send_json(200, result)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 요청 로그 대신 계측 지표 사용
+        pass
+
+
+class TemplateHTTPServer(ThreadingHTTPServer):
+    """이미 열린(공유) 리스닝 소켓으로 동작하는 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, listen_socket: socket.socket, system):
+        super().__init__(listen_socket.getsockname()[:2], TemplateRequestHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = listen_socket
+        self.system = system
@@ -0,0 +1,200 @@
+"""
+Pre-fork 멀티 프로세스 서빙
+1. 감독 프로세스가 리스닝 소켓을 열고, 워밍업 프로세스 하나로 인덱스 번들을 구축/저장
+2. 워커 N개를 fork → 각 워커는 저장된 인덱스와 청크 저장소를 mmap으로 열어 읽기 전용 공유
+3. 같은 소켓에서 커널이 연결을 워커에 분배하고, 감독 프로세스는 죽은 워커를 재시작
+4. API 키 단위 RPM/TPM 제한은 워커 수로 나눠 각 워커에 적용
+
+모델 클라이언트(gRPC 등)는 fork 이후 각 워커에서 만들어야 하므로 감독 프로세스는
+TemplateSystem을 직접 만들지 않는다. (os.fork를 쓰므로 POSIX 전용)
+
+사용 예:
+    python -m serving.prefork --workers 4 --port 8080
+    python -m serving.prefork --workers 4 --fake --fake-latency-ms 50   # 오프라인 부하 테스트 (호출 제한 없음)
+"""
+
+import argparse
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config import EMBED_RPM_LIMIT, GENERATE_RPM_LIMIT, GENERATE_TPM_LIMIT
+from core.resilience import configure_call_guards
+
+from .http_server import TemplateHTTPServer
+
+RESTART_BACKOFF_MAX = 30.0   # 연속 크래시 시 최대 재시작 대기(초)
+CRASH_WINDOW = 5.0           # 시작 후 이 시간 안에 죽으면 연속 크래시로 간주
+
+
+def create_listen_socket(host: str, port: int, backlog: int = 512) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+def _build_system(provider_factory: Optional[Callable], background_index: bool = True):
+    from main import TemplateSystem
+
+    return TemplateSystem(
+        provider=provider_factory() if provider_factory else None, background_index=background_index
+    )
+
+
+class PreforkSupervisor:
+    """워커 프로세스 생성/감시/재시작"""
+
+    def __init__(
+        self,
+        listen_socket: socket.socket,
+        workers: int,
+        provider_factory: Optional[Callable] = None,
+        rate_limited: bool = True,
+    ):
+        self.socket = listen_socket
+        self.workers = workers
+        self.provider_factory = provider_factory
+        self.rate_limited = rate_limited
+        self.children: Dict[int, float] = {}   # pid -> 시작 시각
+        self.crashes = 0
+        self.running = True
+
+    def _fork(self, target: Callable[[], None], mask=None) -> int:
+        """자식 프로세스에서 target 실행 (mask: 자식이 신호 처리기를 바꾼 뒤 되돌릴 신호 마스크)"""
+        # 버퍼에 남은 출력이 자식 프로세스에서 중복 출력되지 않도록 비움
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                if mask is not None:
+                    signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+                target()
+            except BaseException as e:
+                print(f"❌ 워커 {os.getpid()} 오류: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        return pid
+
+    def warm_up(self) -> bool:
+        """인덱스 번들을 한 번만 구축해 디스크에 저장 (워커는 이를 mmap으로 로드)"""
+        pid = self._fork(lambda: _build_system(self.provider_factory, background_index=False))
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status) == 0
+
+    def _limit_share(self) -> Dict[str, Dict]:
+        """API 키 단위 호출 제한을 워커 수로 나눈 워커별 제한 (0이면 제한 없음)"""
+        if not self.rate_limited:
+            return {"generate": {"rpm": 0, "tpm": 0}, "embed": {"rpm": 0}}
+        return {
+            "generate": {"rpm": GENERATE_RPM_LIMIT / self.workers, "tpm": GENERATE_TPM_LIMIT / self.workers},
+            "embed": {"rpm": EMBED_RPM_LIMIT / self.workers},
+        }
+
+    def _serve(self) -> None:
+        configure_call_guards(**self._limit_share())
+        system = _build_system(self.provider_factory)
+        server = TemplateHTTPServer(self.socket, system)
+
+        def stop(signum, frame):
+            # shutdown은 serve_forever가 끝날 때까지 기다리므로 별도 스레드에서 호출
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        print(f"✅ 워커 {os.getpid()} 준비 완료")
+        server.serve_forever(poll_interval=0.5)
+
+    def spawn(self) -> Optional[int]:
+        """워커 하나 실행 (종료 중이면 None)"""
+        # 새 워커 pid를 children에 기록하기 전에 stop이 실행되면 그 워커는 종료 신호를 받지 못해
+        # 감독 프로세스가 끝나지 않으므로, 확인부터 기록까지 종료 신호를 막아 둠
+        mask = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM, signal.SIGINT})
+        try:
+            if not self.running:
+                return None
+            pid = self._fork(self._serve, mask)
+            self.children[pid] = time.monotonic()
+            return pid
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+
+    def stop(self, signum=None, frame=None) -> None:
+        self.running = False
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        """워커를 띄우고 종료 신호가 올 때까지 감시"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        if not self.warm_up():
+            print("⚠️ 인덱스 워밍업 실패 - 워커가 각자 구축합니다.")
+        for _ in range(self.workers):
+            self.spawn()
+        print(f"🚀 워커 {self.workers}개 실행 중 (감독 프로세스 {os.getpid()})")
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            started = self.children.pop(pid, None)
+            if started is None or not self.running:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            self.crashes = self.crashes + 1 if time.monotonic() - started < CRASH_WINDOW else 0
+            delay = min(RESTART_BACKOFF_MAX, 0.5 * (2 ** self.crashes)) if self.crashes else 0.0
+            print(f"⚠️ 워커 {pid} 종료 (코드 {code}) - {delay:.1f}초 후 재시작")
+            time.sleep(delay)
+            self.spawn()
+
+        print("👋 모든 워커 종료")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="TemplateSystem pre-fork 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--fake", action="store_true", help="FakeProvider 사용 (API 키 없이 부하 테스트)")
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    provider_factory = None
+    if args.fake:
+        from benchmarks import FakeProvider
+
+        def provider_factory():
+            return FakeProvider(generate_latency=args.fake_latency_ms / 1000)
+
+    listen_socket = create_listen_socket(args.host, args.port)
+    print(f"📡 {args.host}:{listen_socket.getsockname()[1]} 에서 대기")
+    PreforkSupervisor(listen_socket, args.workers, provider_factory, rate_limited=not args.fake).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Agent2 검증 단계 테스트 스크립트"""
+
+from agents import Agent2
+
+class CountingJudge:
+    """호출 횟수만 기록하는 판정기"""
+    def __init__(self):
+        self.calls = 0
+
+    def judge(self, template, tool_results, guidelines=None):
+        self.calls += 1
+        return {"tool": "guideline_judge", "pass": True, "score": 90, "issues": [], "suggestions": []}
+
+INFO_TEMPLATE = """[예약 확인 안내]
+#{고객명}님, 예약이 완료되었습니다.
+- 예약일시: #{예약일시}
+- 문의: 고객센터 #{고객센터번호}
+
+※ 본 메시지는 예약을 신청하신 분께 발송되는 정보성 메시지입니다."""
+
+AD_TEMPLATE = """#{고객명}님, 이번 주말 특가 세일! 전 품목 50% 할인 쿠폰을 드립니다.
+- 문의: 고객센터 #{고객센터번호}
+※ 수신거부: #{수신거부번호}"""
+
+def test_agent2_calls_judge_only_after_tools_pass():
+    judge = CountingJudge()
+    agent2 = Agent2(judge=judge)
+    
+    result = agent2.validate(INFO_TEMPLATE, {"message_type": "정보성"})
+    print(f"정보성 템플릿: {result['approved']} ({result['stage']}) {result['issues']}")
+    assert result["approved"] and result["stage"] == "judge"
+    assert judge.calls == 1
+
+def test_agent2_short_circuits_on_missing_ad_marker():
+    judge = CountingJudge()
+    agent2 = Agent2(judge=judge)
+    
+    result = agent2.validate(AD_TEMPLATE, {"message_type": "광고성"})
+    print(f"광고 표기 누락: {result['approved']} ({result['stage']}) {result['issues']}")
+    assert not result["approved"] and result["stage"] == "tools"
+    assert any(r["hard_fail"] for r in result["tool_results"])
+    assert judge.calls == 0
+
+def test_agent2_runs_policy_engine_once_per_template(monkeypatch):
+    agent2 = Agent2(judge=CountingJudge())
+    calls = []
+    validate = agent2.engine.validate
+    monkeypatch.setattr(agent2.engine, "validate", lambda template: calls.append(template) or validate(template))
+
+    result = agent2.validate(INFO_TEMPLATE, {"message_type": "정보성"})
+    assert result["approved"]
+    assert len(calls) == 1   # 블랙리스트/화이트리스트 도구가 같은 판정 결과 공유
+
+if __name__ == "__main__":
+    test_agent2_calls_judge_only_after_tools_pass()
+    test_agent2_short_circuits_on_missing_ad_marker()
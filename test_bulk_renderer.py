@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""대량 메일머지(core.bulk_renderer) 테스트 스크립트"""
+
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from core import BulkRenderer
+
+TEMPLATE = "#{고객명}님, #{일시}에 #{매장명}에서 뵙겠습니다."
+
+def test_bulk_render_streams_chunks_and_flags_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        recipients = Path(tmp) / "recipients.csv"
+        output = Path(tmp) / "messages.csv"
+        pd.DataFrame({
+            "수신번호": ["010-1", "010-2", "010-3"],
+            "수신자명": ["홍길동", "", "김철수"],
+            "일시": ["8/26", "8/27", "8/28" * 10],
+            "매장명": ["강남점", "강남점", "강남점"],
+        }).to_csv(recipients, index=False)
+
+        renderer = BulkRenderer(TEMPLATE, chunk_size=2, keep_columns=["수신번호"], max_length=40)
+        summary = renderer.run(recipients, output)
+        result = pd.read_csv(output, dtype=str, keep_default_na=False)
+
+    print(summary)
+    assert summary["rows"] == 3 and summary["chunks"] == 2
+    assert summary["missing_by_variable"] == {"고객명": 1}
+    assert result["message"][0] == "홍길동님, 8/26에 강남점에서 뵙겠습니다."
+    assert result["message"][1].startswith("#{고객명}님")
+    assert list(result["valid"]) == ["True", "False", "False"]
+    assert result["too_long"][2] == "True"
+
+if __name__ == "__main__":
+    test_bulk_render_streams_chunks_and_flags_rows()
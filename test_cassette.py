@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""모델 호출 녹화/재생(core.cassette) 테스트 스크립트"""
+
+import pytest
+
+import main
+from benchmarks import FakeProvider
+from core.cassette import CassetteMiss, CassetteWriter, RecordingProvider, ReplayProvider, ReplayedError, read_cassette
+from main import TemplateSystem
+
+def test_replay_reproduces_recorded_pipeline(tmp_path, monkeypatch):
+    cassette = tmp_path / "traffic.jsonl.gz"
+    monkeypatch.setattr(main, "CASSETTE_RECORD_PATH", str(cassette))
+    recorded = TemplateSystem(provider=FakeProvider(), index_cache_dir=tmp_path / "a", background_index=False)
+    expected = recorded.generate_template("강남점 방문 예약 확인 메시지를 김철수님에게 보내려고 해")
+    recorded.recorder.close()
+
+    entries = read_cassette(cassette)
+    assert {entry["op"] for entry in entries} == {"generate", "embed"}
+
+    monkeypatch.setattr(main, "CASSETTE_RECORD_PATH", None)
+    replay = ReplayProvider(cassette, timing="fast")
+    system = TemplateSystem(provider=replay, index_cache_dir=tmp_path / "b", background_index=False)
+    result = system.generate_template("강남점 방문 예약 확인 메시지를 김철수님에게 보내려고 해")
+
+    print(replay.stats())
+    assert replay.misses == 0
+    assert result["generated_template"] == expected["generated_template"]
+
+def test_replay_timing_errors_and_misses(tmp_path):
+    writer = CassetteWriter(tmp_path / "calls.jsonl.gz")
+    recorder = RecordingProvider(FakeProvider(generate_latency=0.02), writer)
+    recorder.generate_content("안녕")
+    recorder.provider.error_rate = 1.0
+    with pytest.raises(Exception):
+        recorder.generate_content("실패")
+    writer.close()
+
+    slept = []
+    replay = ReplayProvider(tmp_path / "calls.jsonl.gz", timing="recorded", speed=2.0, sleep=slept.append)
+    assert replay.generate_content("안녕")
+    assert slept and 0.009 <= slept[0] < 0.1      # 녹화 지연 ÷ 배속
+    with pytest.raises(ReplayedError):
+        replay.generate_content("실패")
+    with pytest.raises(CassetteMiss):
+        replay.generate_content("녹화 안 된 요청")
+    assert replay.stats()["misses"] == 1
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""mmap 청크 저장소(core.chunk_store) 테스트 스크립트"""
+
+import tempfile
+from pathlib import Path
+
+from core.chunk_store import ChunkStore, write_chunk_store
+
+def test_chunk_store_round_trip():
+    texts = ["알림톡 심사 기준", "", "광고성 정보 (광고) 표기 🚫"]
+    sources = [["cleaned_message.md", "cleaned_run_message.md"], [], ["cleaned_black_list.md"]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "chunks.bin"
+        write_chunk_store(path, texts, sources)
+        store = ChunkStore(path)
+
+        print(f"{len(store)}개 청크: {list(store)}")
+        assert len(store) == 3
+        assert list(store) == texts and store[-1] == texts[2]
+        assert list(store.sources) == sources
+        assert store[1:] == texts[1:]
+
+if __name__ == "__main__":
+    test_chunk_store_round_trip()
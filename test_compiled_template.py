@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""컴파일된 템플릿(core.compiled_template) 테스트 스크립트"""
+
+from core import compile_template
+
+TEMPLATE = """[#{행사명} 안내]
+#{고객명}님, #{행사명}이 #{일시}에 #{장소}에서 열립니다.
+- 문의: #{연락처}"""
+
+def test_parse_keeps_variable_order_and_slots():
+    compiled = compile_template(TEMPLATE)
+    print(f"변수: {compiled.variables}, 슬롯: {compiled.slots}")
+    assert compiled.variables == ("행사명", "고객명", "일시", "장소", "연락처")
+    assert compiled.fields.count("행사명") == 2
+    assert compiled.slots["고객명"] == "names" and "연락처" not in compiled.slots
+    assert compile_template(TEMPLATE) is compiled
+
+def test_render_entities_keeps_unknown_variables():
+    entities = {"extracted_info": {"names": ["홍길동"], "events": ["바자회"], "dates": [], "locations": ["강남점"]}}
+    rendered = compile_template(TEMPLATE).render_entities(entities)
+    print(rendered)
+    assert rendered.startswith("[바자회 안내]\n홍길동님, 바자회이 #{일시}에 강남점에서")
+    assert rendered.endswith("#{연락처}")
+
+if __name__ == "__main__":
+    test_parse_keeps_variable_order_and_slots()
+    test_render_entities_keeps_unknown_variables()
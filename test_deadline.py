@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""요청 마감(core.deadline)과 단계적 성능 저하 테스트 스크립트"""
+
+import threading
+import time
+
+import pytest
+
+from benchmarks import FakeProvider
+from core.deadline import DeadlineExceeded, call_with_deadline, deadline_scope, remaining
+from core.entity_extractor import EntityExtractor
+from main import TemplateSystem
+
+def test_inner_scope_cannot_extend_outer_deadline():
+    assert remaining() is None
+    with deadline_scope(0.5):
+        with deadline_scope(10):
+            assert remaining() <= 0.5
+        with pytest.raises(DeadlineExceeded):
+            call_with_deadline(time.sleep, 1.0)
+
+def test_rule_based_entities():
+    entities = EntityExtractor.extract_entities_by_rules("강남점 방문 예약 확인 메시지를 김철수님에게 12월 3일에 보내줘")
+    info = entities["extracted_info"]
+    assert info["locations"] == ["강남점"] and info["names"] == ["김철수"] and info["dates"] == ["12월 3일"]
+    assert entities["message_intent"] == "예약확인"
+
+@pytest.fixture(scope="module")
+def slow_system(tmp_path_factory):
+    provider = FakeProvider(generate_latency=1.5)
+    return TemplateSystem(provider=provider, index_cache_dir=tmp_path_factory.mktemp("index"), background_index=False)
+
+@pytest.mark.parametrize("deadline, expected", [
+    (9.0, ["guideline_search"]),
+    (5.0, ["llm_entities", "guideline_search"]),
+    (1.5, ["llm_entities", "template_search", "guideline_search", "llm_generation"]),
+])
+def test_pipeline_degrades_in_steps_within_deadline(slow_system, deadline, expected):
+    start = time.perf_counter()
+    result = slow_system.generate_template(f"강남점 예약 확인 안내 {deadline}", deadline=deadline)
+    elapsed = time.perf_counter() - start
+
+    print(f"마감 {deadline}초: {elapsed:.2f}초, 축소 {result['degraded']}")
+    assert elapsed < deadline
+    assert result["degraded"][:len(expected)] == expected
+    assert result["generated_template"]
+
+def test_coalesced_follower_degrades_at_its_own_deadline(slow_system):
+    user_input = "강남점 예약 확인 안내 (합치기)"
+    leader_started = threading.Event()
+    leader_result = {}
+
+    def leader():
+        leader_started.set()
+        leader_result.update(slow_system.generate_template(user_input, deadline=9.0))
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    leader_started.wait()
+    time.sleep(0.1)   # 리더가 먼저 파이프라인을 잡도록
+
+    start = time.perf_counter()
+    result = slow_system.generate_template(user_input, deadline=1.0)
+    elapsed = time.perf_counter() - start
+    thread.join()
+
+    print(f"대기자 {elapsed:.2f}초, 축소 {result['degraded']}")
+    assert elapsed < 1.5
+    assert not result["coalesced"]
+    assert "llm_generation" in result["degraded"]
+    assert result["generated_template"]
+    assert not leader_result["coalesced"] and "llm_generation" not in leader_result["degraded"]
+
+if __name__ == "__main__":
+    test_inner_scope_cannot_extend_outer_deadline()
+    test_rule_based_entities()
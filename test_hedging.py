@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""요청 헤징(core.hedging) 테스트 스크립트"""
+
+import itertools
+import time
+
+from core.hedging import Hedger, LatencyWindow
+
+def _warm(hedger: Hedger, samples: int = 20):
+    for _ in range(samples):
+        hedger.call(lambda: "ok")
+
+def test_latency_window_percentile():
+    window = LatencyWindow(size=100)
+    for i in range(100):
+        window.add(i / 1000)
+    assert window.percentile(0.95) == 0.095
+
+def test_slow_call_is_hedged_and_hedge_wins():
+    hedger = Hedger(percentile=0.9, budget=1.0, min_samples=20, min_delay=0.01)
+    _warm(hedger)
+
+    counter = itertools.count()
+
+    def sometimes_slow():
+        if next(counter) == 0:
+            time.sleep(0.5)      # 첫 호출(원본)만 느림
+            return "slow"
+        return "fast"
+
+    start = time.perf_counter()
+    assert hedger.call(sometimes_slow) == "fast"
+    assert time.perf_counter() - start < 0.3
+
+    stats = hedger.stats()
+    print(stats)
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1 and stats["win_rate"] == 1.0
+
+def test_budget_caps_extra_calls():
+    hedger = Hedger(percentile=0.5, budget=0.0, min_samples=5, min_delay=0.01)
+    _warm(hedger, 5)
+
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "done"
+
+    assert hedger.call(slow) == "done"
+    assert len(calls) == 1 and hedger.stats()["hedged"] == 0
+
+def test_failed_primary_uses_hedge_result():
+    hedger = Hedger(percentile=0.5, budget=1.0, min_samples=5, min_delay=0.01)
+    _warm(hedger, 5)
+    counter = itertools.count()
+
+    def flaky():
+        if next(counter) == 0:
+            time.sleep(0.05)
+            raise RuntimeError("429")
+        time.sleep(0.1)
+        return "ok"
+
+    assert hedger.call(flaky) == "ok"
+
+if __name__ == "__main__":
+    test_latency_window_percentile()
+    test_slow_call_is_hedged_and_hedge_wins()
+    test_budget_caps_extra_calls()
+    test_failed_primary_uses_hedge_result()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""의도별 사전 계산 가이드라인(core.intent_guidelines) 테스트 스크립트"""
+
+from benchmarks import FakeProvider
+from core.intent_guidelines import INTENT_GUIDELINES_FILE
+from core.metrics import metrics
+from core.resilience import reset_call_guards
+from main import TemplateSystem
+
+def _lookups(result: str) -> int:
+    samples = metrics.snapshot()["counters"].get("precomputed_guidelines_total", [])
+    return sum(sample["value"] for sample in samples if sample["labels"]["result"] == result)
+
+def test_matching_intent_skips_guideline_search(tmp_path):
+    reset_call_guards()   # 다른 테스트가 열어 둔 차단기 영향 제거
+    provider = FakeProvider()
+    system = TemplateSystem(provider=provider, index_cache_dir=tmp_path, background_index=False)
+    assert list(tmp_path.glob(f"guidelines-*/{INTENT_GUIDELINES_FILE}"))
+    intent_guidelines = system._guideline_backend[3]
+    precomputed = intent_guidelines.lookup("행사 안내")   # 공백만 다른 행사안내
+    assert len(precomputed) == 3
+    assert intent_guidelines.lookup("이벤트 안내") == precomputed   # 별칭
+
+    # 키워드만 겹치는 다른 의도는 다른 의도의 결과를 쓰지 않고 실시간 검색
+    for intent in ("예약취소", "결제취소안내", "행사 안내 메시지"):
+        assert intent_guidelines.lookup(intent) is None
+
+    # 같은 번들을 여는 두 번째 프로세스는 의도별 질의를 다시 임베딩하지 않음
+    provider = FakeProvider()
+    system = TemplateSystem(provider=provider, index_cache_dir=tmp_path, background_index=False)
+    assert provider.embed_calls == 0
+
+    # 모델 추출 의도가 행사안내 → 사전 계산 결과, 일반안내 → 실시간 검색
+    metrics.reset()
+    system.generate_template("신제품 출시 기념 이벤트 안내", session_id="s1")
+    assert _lookups("hit") == 1
+    assert system.sessions.get("s1").guidelines == precomputed
+    embeds = provider.embed_calls
+    system.generate_template("매장 영업시간 변경을 알려주고 싶어")
+    assert _lookups("miss") == 1
+    assert provider.embed_calls - embeds == 2     # 템플릿 검색 + 가이드라인 검색 질의
+    assert embeds == 1                            # 첫 요청은 템플릿 검색 질의만
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""어휘 검색(utils.lexical_index)과 가이드라인 인덱스 점진적 준비 테스트 스크립트"""
+
+import tempfile
+import threading
+from pathlib import Path
+
+from benchmarks import FakeProvider
+from benchmarks.fake_provider import FakeProviderError
+from core.metrics import metrics
+from core.resilience import configure_call_guards, reset_call_guards
+from main import TemplateSystem
+from utils.lexical_index import LexicalIndex, bigrams
+
+def test_bigrams_match_korean_with_particles():
+    assert bigrams("예약을") == ["예약", "약을"]
+    assert bigrams("A 쿠폰") == ["a", "쿠폰"]
+
+def test_lexical_index_ranks_relevant_chunk_first():
+    index = LexicalIndex([
+        "광고성 정보는 (광고) 표기가 필요합니다.",
+        "예약 확인 메시지는 예약 일시와 장소를 포함합니다.",
+        "쿠폰 발급 안내는 유효기간을 명시합니다.",
+    ])
+    results = index.search("강남점 예약 확인 메시지", top_k=2)
+
+    print(results)
+    assert results[0][0].startswith("예약 확인")
+    assert len(results) <= 2
+    assert LexicalIndex([]).search("예약") == []
+
+def test_system_serves_lexical_until_vector_index_ready(tmp_path):
+    release = threading.Event()
+
+    class GatedEmbedding(FakeProvider):
+        """백그라운드 가이드라인 인덱스 구축의 임베딩을 release까지 막음"""
+
+        def embed_content(self, text, task_type="retrieval_document"):
+            if threading.current_thread().name == "guideline-index":
+                release.wait(60)
+            return super().embed_content(text, task_type=task_type)
+
+    reset_call_guards()
+    metrics.reset()
+    system = TemplateSystem(provider=GatedEmbedding(), index_cache_dir=tmp_path)
+
+    # 콜드 스타트 직후: 가이드라인은 어휘 검색으로 처리
+    try:
+        state = system.readiness()
+        print(state)
+        assert state["templates"] == "ready"
+        assert not state["ready"] and state["guideline_backend"] == "lexical"
+        system.generate_template("강남점 방문 예약 확인 메시지 만들어줘")
+        assert metrics.counter_value("lexical_fallback_total") >= 1
+    finally:
+        release.set()
+
+    assert system.wait_until_ready(timeout=60)
+    state = system.readiness()
+    assert state["ready"] and state["guideline_backend"] == "vector"
+
+    before = metrics.counter_value("lexical_fallback_total")
+    system.generate_template("쿠폰 발급 안내 메시지 만들어줘")
+    assert metrics.counter_value("lexical_fallback_total") == before
+
+def test_embedding_failure_keeps_lexical_backend(tmp_path):
+    class NoEmbedding(FakeProvider):
+        def embed_content(self, text, task_type="retrieval_document"):
+            raise FakeProviderError("embedding unavailable")
+
+    configure_call_guards(embed={"max_retries": 1})   # 재시도 백오프 없이 바로 폴백
+    system = TemplateSystem(provider=NoEmbedding(), index_cache_dir=tmp_path, background_index=False)
+    reset_call_guards()   # 열린 embed 차단기를 다른 테스트에 남기지 않음
+
+    # 폴백(TF-IDF) 벡터 인덱스로 바꾸지 않고 어휘 검색으로 가이드라인 제공
+    state = system.readiness()
+    assert state["guidelines"] == "degraded" and state["guideline_backend"] == "lexical"
+    assert not system.wait_until_ready(timeout=0)
+    _, guidelines = system._search("강남점 방문 예약 확인 메시지", {"message_intent": "예약확인"}, [])
+    assert len(guidelines) == 3
+
+if __name__ == "__main__":
+    test_bigrams_match_korean_with_particles()
+    test_lexical_index_ranks_relevant_chunk_first()
+    test_system_serves_lexical_until_vector_index_ready(Path(tempfile.mkdtemp()))
+    test_embedding_failure_keeps_lexical_backend(Path(tempfile.mkdtemp()))
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""파이프라인 계측(core.metrics) 테스트 스크립트"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from core.metrics import MetricsRegistry, current_request_id, request_context, submit_with_context
+
+def test_spans_carry_request_id_across_threads():
+    registry = MetricsRegistry()
+
+    def stage():
+        with registry.span("generation"):
+            return current_request_id()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with request_context("req-1") as rid:
+            seen = submit_with_context(executor, stage).result()
+
+    print(f"요청 ID 전파: {rid} -> {seen}")
+    assert seen == "req-1"
+    assert [e["request_id"] for e in registry.events] == ["req-1"]
+    assert "generation" in registry.stage_durations()
+
+def test_prometheus_export():
+    registry = MetricsRegistry()
+    registry.increment("model_calls_total", kind="generate", stage="generation")
+    registry.increment("model_calls_total", kind="generate", stage="generation")
+    registry.observe("model_call_seconds", 0.2, kind="generate")
+
+    text = registry.to_prometheus()
+    print(text)
+    assert 'jober_model_calls_total{kind="generate",stage="generation"} 2' in text
+    assert 'jober_model_call_seconds_count{kind="generate"} 1' in text
+    assert registry.counter_value("model_calls_total") == 2
+
+if __name__ == "__main__":
+    test_spans_carry_request_id_across_threads()
+    test_prometheus_export()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""요청 간 마이크로 배칭(core.micro_batch) 테스트 스크립트"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import FakeProvider
+from core.entity_extractor import EntityExtractor
+from core.resilience import reset_call_guards
+
+INPUTS = [
+    "강남점 방문 예약 확인 메시지를 김철수님에게 보내려고 해",
+    "2025.8.26 어린이집 바자회 안내",
+    "주문하신 상품 배송이 시작되었습니다",
+    "다음 주 월요일 세미나 일정 안내",
+]
+
+def _extract_all(extractor):
+    with ThreadPoolExecutor(max_workers=len(INPUTS)) as executor:
+        return list(executor.map(extractor.extract_entities, INPUTS))
+
+def test_concurrent_extractions_share_one_call():
+    reset_call_guards()   # 다른 테스트가 열어 둔 차단기 영향 제거
+    provider = FakeProvider()
+    extractor = EntityExtractor(None, provider=provider)
+    expected = [extractor.extract_entities(user_input) for user_input in INPUTS]
+
+    provider.generate_calls = 0
+    extractor.enable_batching(window=0.5, max_size=len(INPUTS))
+    results = _extract_all(extractor)
+
+    print(f"generate 호출 {provider.generate_calls}회")
+    assert provider.generate_calls == 1
+    assert results == expected          # 입력 순서대로 자기 결과를 받음
+
+def test_malformed_batch_falls_back_to_single_calls():
+    reset_call_guards()
+    class BrokenBatch(FakeProvider):
+        def _batch_entity_response(self, prompt):
+            return '[{"extracted_info": {}}]'
+
+    provider = BrokenBatch()
+    extractor = EntityExtractor(None, provider=provider)
+    extractor.enable_batching(window=0.5, max_size=len(INPUTS))
+    results = _extract_all(extractor)
+
+    assert provider.generate_calls == 1 + len(INPUTS)
+    assert all(result["extracted_info"] for result in results)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""단계별 모델 라우팅(core.model_router) 테스트 스크립트"""
+
+import time
+
+from benchmarks import FakeProvider
+from core import EntityExtractor
+from core.metrics import metrics
+from core.model_router import ModelRouter
+from core.resilience import reset_call_guards
+
+def _router(latencies, **kwargs):
+    providers = {model: FakeProvider(generate_latency=latency) for model, latency in latencies.items()}
+    router = ModelRouter(
+        {"entity_extraction": ["small", "large"], "default": ["large"]},
+        lambda model: providers[model],
+        explore=0.0,
+        **kwargs,
+    )
+    return router, providers
+
+def test_timeout_falls_back_to_secondary_model():
+    reset_call_guards()   # 다른 테스트가 열어 둔 차단기 영향 제거
+    metrics.reset()
+    router, providers = _router({"small": 0.5, "large": 0.0}, timeouts={"entity_extraction": 0.05})
+
+    start = time.perf_counter()
+    result = router.generate(lambda p: p.generate_content("사용자 요청: 안내"), stage="entity_extraction")
+
+    assert result and time.perf_counter() - start < 0.4
+    assert providers["large"].generate_calls == 1
+    assert metrics.counter_value("model_route_calls_total", stage="entity_extraction", model="small", result="timeout") == 1
+    assert metrics.counter_value("model_route_fallbacks_total") == 1
+
+    # 시간 초과로 지연 EWMA가 커진 후보는 다음부터 뒤로 밀림
+    assert router.candidates("entity_extraction") == ["large", "small"]
+
+def test_routes_by_current_stage_and_records_cost():
+    reset_call_guards()
+    metrics.reset()
+    router, providers = _router({"small": 0.0, "large": 0.0}, prices={"small": (1.0, 2.0)})
+    extractor = EntityExtractor(None, provider=FakeProvider(), router=router)
+
+    with metrics.span("entity_extraction"):
+        entities = extractor.extract_entities("강남점 예약 확인")
+    extractor.generate_with_gemini("사용자 요청: 안내")   # 스팬 밖 → default 경로
+
+    print(router.stats())
+    assert entities["extracted_info"]["locations"] == ["강남점"]
+    assert providers["small"].generate_calls == 1 and providers["large"].generate_calls == 1
+    assert metrics.counter_value("model_cost_usd_total", stage="entity_extraction", model="small") > 0
+    assert set(router.stats()) == {"entity_extraction", "default"}
+
+if __name__ == "__main__":
+    test_timeout_falls_back_to_secondary_model()
+    test_routes_by_current_stage_and_records_cost()
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""청크 준중복 제거(utils.near_dedup) 테스트 스크립트"""
+
+from utils.near_dedup import dedupe_chunks
+
+BASE = "알림톡은 정보성 메시지만 발송할 수 있으며 광고성 정보가 포함되면 반려됩니다. 수신자가 요청한 정보만 포함해야 합니다."
+
+def test_near_duplicates_collapse_with_sources():
+    chunks = [
+        BASE,
+        "전혀 다른 내용: 친구톡은 광고성 메시지 발송이 가능하며 (광고) 표기와 수신거부 방법을 안내해야 합니다.",
+        BASE.replace("반려됩니다", "반려 됩니다"),
+        BASE,
+    ]
+    sources = ["cleaned_message.md", "cleaned_info_simsa.md", "cleaned_run_message.md", "cleaned_message.md"]
+
+    texts, merged = dedupe_chunks(chunks, sources)
+    print(merged)
+    assert texts == [chunks[0], chunks[1]]
+    assert merged == [["cleaned_message.md", "cleaned_run_message.md"], ["cleaned_info_simsa.md"]]
+
+if __name__ == "__main__":
+    test_near_duplicates_collapse_with_sources()
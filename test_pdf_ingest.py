@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""PDF 가이드 수집(utils.pdf_ingest) 테스트 스크립트"""
+
+import tempfile
+from pathlib import Path
+
+import fitz
+
+import main
+from benchmarks import FakeProvider
+from core.base_processor import BaseTemplateProcessor
+from utils.pdf_ingest import extract_pdf_pages, ingest_pdfs
+
+def make_pdf(path: Path, page_count: int) -> None:
+    doc = fitz.open()
+    for number in range(1, page_count + 1):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Spam prevention guide page {number}. " * 3)
+    doc.save(path)
+    doc.close()
+
+def test_pages_are_tagged_and_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = Path(tmp) / "guide.pdf"
+        cache_dir = Path(tmp) / "cache"
+        make_pdf(pdf, 20)
+
+        pages = extract_pdf_pages(pdf, cache_dir, max_workers=2)
+        assert [number for number, _ in pages] == list(range(1, 21))
+        assert "page 7." in pages[6][1]
+        assert len(list(cache_dir.glob("*.json"))) == 1
+
+        # 캐시에서 다시 읽어도 같은 결과
+        assert extract_pdf_pages(pdf, cache_dir) == pages
+
+        chunks = ingest_pdfs([pdf], BaseTemplateProcessor.chunk_text, cache_dir)["guide.pdf"]
+        print(chunks[0])
+        assert chunks[0].startswith("[guide p.1]\n") and len(chunks) == 20
+
+def test_failed_pdf_keeps_text_dump(tmp_path, monkeypatch):
+    make_pdf(tmp_path / "guide.pdf", 2)
+    (tmp_path / "broken.pdf").write_bytes(b"%PDF-1.4 not really a pdf")
+
+    # 파일별로 실패를 처리하므로 정상 PDF는 수집됨
+    chunks = ingest_pdfs(sorted(tmp_path.glob("*.pdf")), BaseTemplateProcessor.chunk_text, tmp_path / "cache")
+    assert list(chunks) == ["guide.pdf"]
+
+    # 하나라도 실패하면 PDF 텍스트 덤프를 가이드라인에서 빼지 않음
+    monkeypatch.setattr(main, "GUIDELINE_PDF_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "PDF_CACHE_DIR", str(tmp_path / "cache"))
+    system = main.TemplateSystem(provider=FakeProvider(), index_cache_dir=tmp_path / "index", background_index=False)
+    sources = {source for chunk_sources in system.guideline_sources for source in chunk_sources}
+    assert {"pdf_extraction_results.txt", "guide.pdf"} <= sources
+
+if __name__ == "__main__":
+    test_pages_are_tagged_and_cached()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""정책 규칙 엔진 테스트 스크립트"""
+
+from tools.policy_rule_engine import PolicyRuleEngine, extract_trigger_terms
+
+def test_policy_rule_engine():
+    engine = PolicyRuleEngine.from_predata("predata")
+    
+    # 테스트 케이스들 (입력, 기대 is_valid)
+    test_cases = [
+        ("포인트가 적립되었습니다", False),
+        ("주문이 완료되었습니다", True),
+        ("#{고객명}님, 생일을 축하드립니다!", False),
+        ("특가 상품 알림: 오늘만 50% 할인", False),
+        # 화이트리스트 금융 알림 (대출이자/대출만기) - 블랙리스트 '대출' 단어 하나로 걸리지 않아야 함
+        ("#{고객명}님의 대출 만기일이 #{만기일}입니다.", True),
+        ("대출이자 #{금액}원이 출금될 예정입니다.", True),
+        ("대출이자와 대출만기 일정을 안내드립니다.", True),
+        ("신규 대출 상품 안내: 저금리 대출을 지금 신청하세요", False),
+        # 화이트리스트 '수술 후 주의사항 알림'이 블랙리스트 '수술/진료/검사 후 안부 문자'보다 우선
+        ("안녕하세요. 수술 후 주의사항 안내드립니다. 검사 결과는 내원 시 확인하세요.", True),
+        ("수술 후 경과는 어떠신가요? 검사 후 안부 인사드립니다.", False),
+    ]
+    
+    print("🔍 정책 규칙 엔진 테스트")
+    print("=" * 50)
+    
+    results = engine.validate_many([content for content, _ in test_cases])
+    for (content, expected), result in zip(test_cases, results):
+        status = "✅" if result["is_valid"] == expected else "❌"
+        print(f"{status} '{content}' -> {[v['violation_type'] for v in result['violations']]}")
+        assert result["is_valid"] == expected
+        assert set(result) >= {"is_valid", "violations", "recommendations"}
+
+def test_extract_trigger_terms():
+    assert extract_trigger_terms("생일 축하 메시지 불가") == ["생일", "축하"]
+    assert extract_trigger_terms("특가 상품 알림 메시지 불가 (친구톡 사용 권장)") == ["특가"]
+    # 사전 용어는 조사처럼 끝나도 자르지 않고, 이/가는 제거
+    assert extract_trigger_terms("특정 사업장에 오염물질 측정결과 알림 메시지") == ["특정", "사업장", "오염물질", "측정결과"]
+    assert "수신동의" in extract_trigger_terms("2년 주기로 발송되는 수신동의 확인 메시지")
+    assert extract_trigger_terms("연령 인증이 필요하여 발송이 불가한 업종") == ["연령", "인증", "필요", "불가한", "업종"]
+    assert "정보가" not in extract_trigger_terms("광고성 정보가 연결된 URL")
+
+def test_whitelisted_finance_notice_keeps_allowed_pattern():
+    engine = PolicyRuleEngine.from_predata("predata")
+    result = engine.validate("대출이자 #{금액}원이 출금될 예정입니다.")
+    assert result["violations"] == []
+    assert any("대출이자" in pattern for pattern in result["allowed_patterns"])
+
+if __name__ == "__main__":
+    test_policy_rule_engine()
+    test_extract_trigger_terms()
+    test_whitelisted_finance_notice_keeps_allowed_pattern()
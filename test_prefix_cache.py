@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""프롬프트 접두 캐시(core.providers) 테스트 스크립트"""
+
+import threading
+from types import SimpleNamespace
+
+from google.generativeai import caching
+import google.generativeai as genai
+
+from benchmarks import FakeProvider
+from core import TemplateGenerator
+from core.metrics import metrics
+from core.providers import CACHED_CONTENT_MIN_TOKENS, GeminiPrefixCache, PromptPrefixCache, prefix_cache_for
+from core.resilience import estimate_tokens
+from core.template_generator import TEMPLATE_PROMPT_PREAMBLE
+
+class _CachedModel:
+    def __init__(self, prompts):
+        self.prompts = prompts
+
+    def generate_content(self, suffix):
+        self.prompts.append(suffix)
+        return SimpleNamespace(text="템플릿", usage_metadata=None)
+
+def test_generator_sends_static_preamble_as_prefix():
+    generator = TemplateGenerator(None, provider=FakeProvider())
+    assert isinstance(generator.prefix_cache, PromptPrefixCache)
+
+    prefix, suffix = generator._create_template_generation_prompt("예약 안내", {}, "", "")
+    assert prefix == TEMPLATE_PROMPT_PREAMBLE
+    assert "템플릿 구조:" not in suffix and "사용자 요청: 예약 안내" in suffix
+
+    # no-op 캐시는 이어 붙여 전송하므로 결과는 전체 프롬프트와 같음
+    assert generator.generate_with_prefix(prefix, suffix) == generator.generate_with_gemini(prefix + suffix)
+
+def test_gemini_prefix_cache_registers_once_and_refreshes(monkeypatch):
+    now = [0.0]
+    created, sent = [], []
+    monkeypatch.setattr(caching.CachedContent, "create", lambda **kwargs: created.append(kwargs) or kwargs)
+    monkeypatch.setattr(genai.GenerativeModel, "from_cached_content", lambda cached_content: _CachedModel(sent))
+
+    provider = SimpleNamespace(model_name="gemini-1.5-flash-001", generate_content=lambda prompt: "전체")
+    cache = GeminiPrefixCache(provider, ttl=100, refresh_margin=10, clock=lambda: now[0], min_tokens=1)
+
+    assert cache.generate("지침", "요청1") == "템플릿"
+    assert cache.generate("지침", "요청2") == "템플릿"
+    assert len(created) == 1 and sent == ["요청1", "요청2"]
+    assert created[0]["system_instruction"] == "지침"
+
+    now[0] = 95   # 만료 직전에는 다시 등록
+    cache.generate("지침", "요청3")
+    assert len(created) == 2
+
+def test_gemini_prefix_cache_falls_back_when_unavailable(monkeypatch):
+    def reject(**kwargs):
+        raise ValueError("cached content is too small")
+
+    monkeypatch.setattr(caching.CachedContent, "create", reject)
+    prompts = []
+    provider = SimpleNamespace(model_name="gemini-2.0-flash-exp", generate_content=lambda p: prompts.append(p) or "전체")
+    cache = GeminiPrefixCache(provider, min_tokens=1)
+
+    assert cache.generate("지침", "요청") == "전체"
+    assert prompts == ["지침요청"]
+    assert prefix_cache_for(provider).__class__ is PromptPrefixCache
+
+def test_gemini_prefix_cache_skips_prefix_below_minimum_tokens(monkeypatch):
+    created = []
+    monkeypatch.setattr(caching.CachedContent, "create", lambda **kwargs: created.append(kwargs) or kwargs)
+    provider = SimpleNamespace(model_name="gemini-2.0-flash-exp", generate_content=lambda prompt: "전체")
+    cache = GeminiPrefixCache(provider)
+    metrics.reset()
+
+    # 현재 고정 지침은 최소 토큰 수 미달 → 등록 요청 없이 전체 프롬프트
+    for _ in range(2):
+        assert cache.generate(TEMPLATE_PROMPT_PREAMBLE, "요청") == "전체"
+    assert created == []
+    assert metrics.counter_value("prefix_cache_total", result="too_small") == 1
+
+def test_gemini_prefix_cache_engages_above_minimum_tokens(monkeypatch):
+    created, sent = [], []
+    monkeypatch.setattr(caching.CachedContent, "create", lambda **kwargs: created.append(kwargs) or kwargs)
+    monkeypatch.setattr(genai.GenerativeModel, "from_cached_content", lambda cached_content: _CachedModel(sent))
+    provider = SimpleNamespace(model_name="gemini-2.5-flash", generate_content=lambda prompt: "전체")
+    cache = GeminiPrefixCache(provider)   # 모델별 기본 최소 토큰 수 (1024)
+    metrics.reset()
+
+    # 최소 토큰 수를 넘는 접두부는 한 번 등록하고 이후 요청부만 전송
+    prefix = TEMPLATE_PROMPT_PREAMBLE * 4
+    assert estimate_tokens(prefix) >= CACHED_CONTENT_MIN_TOKENS["gemini-2.5-flash"] == cache.min_tokens
+    for request in ("요청1", "요청2"):
+        assert cache.generate(prefix, request) == "템플릿"
+    assert len(created) == 1 and sent == ["요청1", "요청2"]
+    assert metrics.counter_value("prefix_cache_total", result="hit") == 2
+    assert metrics.counter_value("prefix_cache_total", result="too_small") == 0
+
+def test_gemini_prefix_cache_registers_outside_lock(monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+    created = []
+
+    def slow_create(**kwargs):
+        created.append(kwargs)
+        entered.set()
+        release.wait(5)
+        return kwargs
+
+    monkeypatch.setattr(caching.CachedContent, "create", slow_create)
+    monkeypatch.setattr(genai.GenerativeModel, "from_cached_content", lambda cached_content: _CachedModel([]))
+    provider = SimpleNamespace(model_name="gemini-1.5-flash-001", generate_content=lambda prompt: "전체")
+    cache = GeminiPrefixCache(provider, min_tokens=1)
+
+    registering = threading.Thread(target=cache.generate, args=("지침", "요청1"))
+    registering.start()
+    assert entered.wait(5)
+    try:
+        # 등록이 끝나기를 기다리지 않고 전체 프롬프트로 바로 응답 (등록 호출도 한 번만)
+        assert cache.generate("지침", "요청2") == "전체"
+    finally:
+        release.set()
+        registering.join(5)
+    assert cache.generate("지침", "요청4") == "템플릿"
+    assert len(created) == 1
+
+if __name__ == "__main__":
+    test_generator_sends_static_preamble_as_prefix()
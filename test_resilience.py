@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""모델 호출 보호 장치(core.resilience) 테스트 스크립트"""
+
+import time
+
+from core.deadline import DeadlineExceeded, deadline_scope
+from core.resilience import (
+    AdaptiveConcurrency,
+    CircuitBreaker,
+    CircuitOpenError,
+    ModelCallGuard,
+    RateLimiter,
+    RateLimitTimeout,
+    TokenBucket,
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_waits_when_exhausted():
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute=60, clock=clock)
+
+    waits = [bucket.reserve(1) for _ in range(61)]
+    print(f"61번째 요청 대기: {waits[-1]:.2f}초")
+    assert waits[:60] == [0.0] * 60
+    assert abs(waits[-1] - 1.0) < 1e-6
+
+def test_rejected_burst_gives_back_reservations():
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=60, tpm=600, max_wait=1.0, sleep=lambda seconds: None)
+    limiter.requests.clock = limiter.tokens.clock = clock
+    limiter.requests._updated = limiter.tokens._updated = clock.now
+
+    # 한도를 넘는 몰림: 대기 1초 이내만 허용되고 나머지는 거절
+    rejected = 0
+    for _ in range(200):
+        try:
+            limiter.acquire(tokens=10)
+        except RateLimitTimeout:
+            rejected += 1
+    print(f"거절 {rejected}건, 남은 RPM {limiter.requests._tokens:.1f}, TPM {limiter.tokens._tokens:.1f}")
+    assert rejected > 0
+    assert limiter.requests._tokens >= -1 and limiter.tokens._tokens >= -10
+
+    # 거절분이 빚으로 남지 않으므로 잠시 뒤 다시 바로 확보 가능
+    clock.now += 2
+    assert limiter.acquire(tokens=10) == 0.0
+
+def test_concurrency_wait_respects_deadline():
+    concurrency = AdaptiveConcurrency(initial=1, maximum=1)
+    concurrency.acquire()
+
+    start = time.monotonic()
+    try:
+        with deadline_scope(0.1):
+            concurrency.acquire()
+        assert False, "마감이 지나면 DeadlineExceeded"
+    except DeadlineExceeded:
+        pass
+    assert time.monotonic() - start < 1.0
+    assert concurrency.in_flight == 1
+
+def test_guard_backs_off_then_opens_circuit():
+    sleeps = []
+    clock = FakeClock()
+    guard = ModelCallGuard(
+        "generate",
+        limiter=RateLimiter(),
+        breaker=CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock),
+        concurrency=AdaptiveConcurrency(initial=4, maximum=4),
+        max_retries=3,
+        sleep=sleeps.append,
+        seed=0,
+    )
+
+    def failing():
+        raise RuntimeError("429 quota exceeded")
+
+    try:
+        guard.call(failing)
+        assert False, "예외가 전달되어야 함"
+    except RuntimeError as e:
+        assert not isinstance(e, CircuitOpenError)
+    print(f"백오프 대기: {[round(s, 3) for s in sleeps]}, 동시성 상한: {guard.concurrency.limit}")
+    assert len(sleeps) == 2 and sleeps[1] <= 1.0
+    assert guard.breaker.state == CircuitBreaker.OPEN
+    assert guard.concurrency.limit == 1
+
+    # 회로가 열린 동안은 호출 없이 즉시 실패
+    try:
+        guard.call(lambda: "ok")
+        assert False, "회로가 열려 있어야 함"
+    except CircuitOpenError:
+        pass
+
+    # 대기 후 시험 호출 성공 시 회로 닫힘
+    clock.now = 31
+    assert guard.call(lambda: "ok") == "ok"
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+if __name__ == "__main__":
+    test_token_bucket_waits_when_exhausted()
+    test_rejected_burst_gives_back_reservations()
+    test_concurrency_wait_respects_deadline()
+    test_guard_backs_off_then_opens_circuit()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""pre-fork 서버(serving.prefork) 테스트 스크립트 - FakeProvider로 실제 프로세스 실행"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def request(port: int, path: str, payload: dict = None) -> dict:
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", data=data, timeout=10) as response:
+        return json.load(response)
+
+def wait_ready(port: int, timeout: float = 60.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            return request(port, "/healthz")
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("서버가 준비되지 않았습니다.")
+
+def test_prefork_serves_and_restarts_crashed_worker(tmp_path):
+    port = free_port()
+    # FakeProvider 인덱스와 템플릿 라이브러리가 실제 캐시/데이터 폴더에 쓰이지 않도록 임시 폴더 사용
+    env = {
+        **os.environ,
+        "INDEX_CACHE_DIR": str(tmp_path / "index"),
+        "TEMPLATE_LIBRARY_DIR": str(tmp_path / "template_library"),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "serving.prefork", "--workers", "2", "--port", str(port), "--host", "127.0.0.1", "--fake"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env,
+    )
+    try:
+        crashed = wait_ready(port)["pid"]
+        result = request(port, "/generate", {"user_input": "강남점 방문 예약 확인 메시지"})
+        print(f"워커 {result['worker_pid']} 응답, 승인: {result['validation']['approved']}")
+        assert result["generated_template"] and "request_id" in result
+
+        # 워커를 강제 종료해도 감독 프로세스가 새 워커를 띄움
+        os.kill(crashed, signal.SIGKILL)
+        time.sleep(1.0)
+        pids = {wait_ready(port)["pid"] for _ in range(10)}
+        print(f"재시작 후 워커: {pids}")
+        assert crashed not in pids
+    finally:
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=30) == 0
+
+if __name__ == "__main__":
+    test_prefork_serves_and_restarts_crashed_worker(Path(tempfile.mkdtemp()))
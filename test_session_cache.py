@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""세션 문맥 캐시(core.session_cache)와 템플릿 수정 요청 테스트 스크립트"""
+
+import pytest
+
+from benchmarks import FakeProvider
+from core.session_cache import SessionCache, SessionContext
+from main import TemplateSystem
+
+def _context(template: str) -> SessionContext:
+    return SessionContext(user_input="입력", entities={}, similar_templates=[], guidelines=[], template=template)
+
+def test_session_cache_evicts_least_recently_used_and_expires():
+    now = [0.0]
+    cache = SessionCache(max_sessions=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", _context("A"))
+    cache.put("b", _context("B"))
+    assert cache.get("a").template == "A"   # a가 최근 사용으로 이동
+    cache.put("c", _context("C"))
+
+    assert cache.get("b") is None and len(cache) == 2
+    now[0] = 11
+    assert cache.get("a") is None
+
+def test_refine_reuses_cached_context(tmp_path):
+    provider = FakeProvider()
+    system = TemplateSystem(provider=provider, index_cache_dir=tmp_path, background_index=False)
+
+    first = system.generate_template("강남점 방문 예약 확인 메시지 만들어줘", session_id="s1")
+    embed_calls, generate_calls = provider.embed_calls, provider.generate_calls
+
+    refined = system.refine_template("s1", "더 짧게 줄여줘")
+
+    print(f"생성 호출 {provider.generate_calls - generate_calls}회, 임베딩 호출 {provider.embed_calls - embed_calls}회")
+    assert provider.embed_calls == embed_calls                     # 검색 재실행 없음
+    assert provider.generate_calls - generate_calls <= 2            # 수정 1회 (+ LLM 판정)
+    assert refined["entities"] == first["entities"]
+    assert refined["session_id"] == "s1"
+    if refined["validation"]["approved"]:
+        assert refined["revision"] == 1
+        assert system.sessions.get("s1").template == refined["generated_template"]
+
+    with pytest.raises(KeyError):
+        system.refine_template("unknown", "더 짧게")
+
+if __name__ == "__main__":
+    test_session_cache_evicts_least_recently_used_and_expires()
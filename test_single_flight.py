@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""동일 요청 합치기(core.single_flight) 테스트 스크립트"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.deadline import DeadlineExceeded, deadline_scope
+from core.single_flight import SingleFlight, coalesce_key
+
+def test_concurrent_identical_calls_run_once():
+    flight = SingleFlight()
+    calls = []
+
+    def pipeline():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"generated_template": "안녕하세요"}
+
+    key = coalesce_key("  크리스마스   이벤트 안내 ")
+    assert key == coalesce_key("크리스마스 이벤트 안내")
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: flight.do(key, pipeline), range(5)))
+
+    shared = sum(1 for _, was_shared in results if was_shared)
+    print(f"실행 {len(calls)}회, 공유 {shared}회")
+    assert len(calls) == 1 and shared == 4
+    assert flight.in_flight() == 0
+
+def test_leader_error_reaches_followers():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("파이프라인 실패")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing)
+        started.wait()
+        follower = executor.submit(flight.do, "key", lambda: "다시 실행되면 안 됨")
+        for future in (leader, follower):
+            try:
+                future.result()
+                assert False, "예외가 전달되어야 함"
+            except RuntimeError:
+                pass
+
+def test_follower_gives_up_at_its_own_deadline():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.5)
+        return "리더 결과"
+
+    def follower():
+        with deadline_scope(0.1):
+            start = time.perf_counter()
+            try:
+                flight.do("key", lambda: "다시 실행되면 안 됨")
+            except DeadlineExceeded:
+                return time.perf_counter() - start
+        raise AssertionError("DeadlineExceeded가 발생해야 함")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", slow)
+        started.wait()
+        waited = executor.submit(follower).result()
+        print(f"대기자 {waited:.2f}초 후 포기")
+        assert waited < 0.3
+        assert leader.result() == ("리더 결과", False)   # 리더는 영향 없이 끝남
+
+if __name__ == "__main__":
+    test_concurrent_identical_calls_run_once()
+    test_leader_error_reaches_followers()
+    test_follower_gives_up_at_its_own_deadline()
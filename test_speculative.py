@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""추측 초안(TemplateSystem._speculate) 테스트 스크립트"""
+
+from benchmarks import FakeProvider
+from core.entity_extractor import canonical_intent
+from core.metrics import metrics
+from core.resilience import reset_call_guards
+from main import TemplateSystem
+
+def _drafts(result: str) -> int:
+    samples = metrics.snapshot()["counters"].get("speculative_drafts_total", [])
+    return sum(sample["value"] for sample in samples if sample["labels"]["result"] == result)
+
+def test_canonical_intent():
+    assert canonical_intent("예약 확인") == "예약확인"
+    assert canonical_intent("행사 안내 메시지") == "행사안내"
+    assert canonical_intent("") == "일반안내"
+
+def test_draft_accepted_or_regenerated(tmp_path):
+    reset_call_guards()   # 다른 테스트가 열어 둔 차단기 영향 제거
+    provider = FakeProvider(generate_latency=0.05)
+    system = TemplateSystem(provider=provider, index_cache_dir=tmp_path, background_index=False)
+    system.enable_speculation()
+    metrics.reset()
+
+    # 규칙/모델 모두 행사안내·정보성 → 초안 채택, 생성 호출은 추측 없이와 같은 횟수
+    accepted = system.generate_template("신제품 출시 기념 이벤트 안내")
+    assert _drafts("accepted") == 1
+    calls = provider.generate_calls
+
+    # 규칙은 예약확인, 모델은 일반안내 → 추출 결과로 다시 검색/생성
+    rejected = system.generate_template("강남점 방문 예약 확인 메시지를 김철수님에게 보내려고 해")
+    assert _drafts("rejected") == 1
+    assert provider.generate_calls - calls == 4      # 추출 + 초안 + 재생성 + 판정
+
+    for result in (accepted, rejected):
+        assert result["generated_template"] and result["validation"]["approved"]
+        assert result["entities"].get("extraction_method") != "rules"
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""승인 템플릿 라이브러리(core.template_library) 테스트 스크립트"""
+
+import numpy as np
+import pytest
+
+import core.template_library as template_library
+from core.template_library import TemplateLibrary
+
+def _records(n: int):
+    return [
+        {"text": f"[안내 {i}] #{{고객명}}님 {i}번 안내입니다.", "category": "정보성",
+         "industry": f"업종{i % 3}", "intent": f"의도{i % 4}"}
+        for i in range(n)
+    ]
+
+def _embedder(dimension: int = 16, seed: int = 0):
+    """텍스트별로 고정된 무작위 벡터 (같은 텍스트 -> 같은 벡터)"""
+    rng = np.random.default_rng(seed)
+    table = {}
+
+    def embed(texts):
+        return np.stack([table.setdefault(text, rng.normal(size=dimension)) for text in texts])
+    return embed, table
+
+def test_import_is_deduplicated_sharded_and_resumable(tmp_path):
+    embed, _ = _embedder()
+    library = TemplateLibrary(tmp_path, embedding_key="test", shard_size=4)
+    assert library.add(_records(6)) == {"imported": 6, "skipped": 0}
+    assert library.add(_records(10)) == {"imported": 4, "skipped": 6}
+
+    assert library.sync_index(embed, batch_size=3) == 10
+    assert library.sync_index(embed) == 0
+    assert [shard["count"] for shard in library._manifest["shards"]] == [4, 4, 2]
+
+    # 다시 열면 저장된 샤드를 그대로 쓰고, 새로 추가한 행만 마지막 샤드에 이어 색인
+    reopened = TemplateLibrary(tmp_path, embedding_key="test", shard_size=4)
+    reopened.add(_records(11))
+    assert reopened.sync_index(embed) == 1
+    assert len(reopened) == reopened.indexed_count == 11
+
+def test_facet_filtered_search(tmp_path):
+    embed, table = _embedder()
+    records = _records(12)
+    library = TemplateLibrary(tmp_path, embedding_key="test", shard_size=4)
+    library.add(records)
+    library.sync_index(embed)
+
+    query = table[template_library.embedding_text(records[5]["text"])]
+    assert library.search(query, top_k=1)[0][0] == records[5]["text"]
+
+    results = library.search(query, top_k=5, intent="의도1")
+    assert {text for text, _ in results} == {r["text"] for r in records if r["intent"] == "의도1"}   # 1, 5, 9
+    assert [text for text, _ in library.search(query, intent="의도1", industry="업종0")] == [records[9]["text"]]
+    assert library.search(query, intent="없는 의도") == []
+    with pytest.raises(ValueError):
+        library.search(query, channel="sms")
+
+def test_ivf_shards_with_bitmap_filter(tmp_path, monkeypatch):
+    """큰 샤드(IVF)와 후보가 많은 필터(비트맵 선택자) 경로"""
+    monkeypatch.setattr(template_library, "IVF_MIN_ROWS", 200)
+    monkeypatch.setattr(template_library, "EXACT_FILTER_LIMIT", 10)
+    embed, table = _embedder(dimension=32)
+    library = TemplateLibrary(tmp_path, embedding_key="test", shard_size=400, nprobe=64)
+    records = _records(1000)
+    library.add(records)
+    library.sync_index(embed, batch_size=256)
+    assert all(isinstance(shard.index, template_library.faiss.IndexIVF) for shard in library._shards[:2])
+
+    target = records[123]
+    query = table[template_library.embedding_text(target["text"])]
+    assert library.search(query, top_k=1)[0][0] == target["text"]
+
+    results = library.search(query, top_k=5, intent=target["intent"])
+    intents = {r["text"]: r["intent"] for r in records}
+    assert results[0][0] == target["text"]
+    assert all(intents[text] == target["intent"] for text, _ in results)
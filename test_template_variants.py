@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""다중 스타일 템플릿 생성 및 로컬 점수 테스트 스크립트"""
+
+import pytest
+
+from benchmarks import FakeProvider
+from core import TemplateGenerator
+from core.resilience import reset_call_guards
+from main import TemplateSystem
+
+ENTITIES = {
+    "extracted_info": {"dates": ["12월 25일"], "names": ["홍길동"], "locations": [], "events": [], "others": []},
+    "message_intent": "행사안내",
+}
+
+def test_score_template_rewards_coverage_and_legal_notice():
+    generator = TemplateGenerator(None, provider=FakeProvider())
+
+    good = "#{고객명}님, #{일시} 행사 안내입니다.\n" + "안내 " * 100 + "\n※ 본 메시지는 신청 고객에게 발송됩니다."
+    bad = "#{고객명}님 안녕하세요."
+    good_score, good_detail = generator.score_template(good, ENTITIES)
+    bad_score, bad_detail = generator.score_template(bad, ENTITIES)
+
+    print(f"좋은 예: {good_score} {good_detail} / 나쁜 예: {bad_score} {bad_detail}")
+    assert good_score == 100.0
+    assert bad_detail["coverage"] == 0.5 and bad_detail["legal_notice"] == 0.0
+    assert generator.score_template("가" * 1001 + "※", ENTITIES)[1]["length"] == 0.0
+
+def test_generate_variants_returns_ranked_styles():
+    reset_call_guards()   # 앞선 테스트가 열어 둔 generate 차단기가 호출 수를 바꾸지 않도록
+    provider = FakeProvider()
+    generator = TemplateGenerator(None, provider=provider)
+
+    variants = generator.generate_variants("12월 25일 행사 안내를 홍길동님께", ENTITIES, [], ["가이드"])
+    print([(v["style"], v["score"]) for v in variants])
+    assert {v["style"] for v in variants} == {"정중형", "간결형", "친근형"}
+    assert [v["score"] for v in variants] == sorted((v["score"] for v in variants), reverse=True)
+    assert provider.generate_calls == 3
+
+def test_variant_count_beyond_styles_is_rejected(tmp_path):
+    system = TemplateSystem(provider=FakeProvider(), index_cache_dir=tmp_path, background_index=False)
+    for count in (0, 4, 5):
+        with pytest.raises(ValueError):
+            system.generate_variants("12월 25일 행사 안내", count=count)
+
+if __name__ == "__main__":
+    test_score_template_rewards_coverage_and_legal_notice()
+    test_generate_variants_returns_ranked_styles()
@@ -0,0 +1,7 @@
+"""
+템플릿 검증 도구 모듈
+"""
+
+from .policy_rule_engine import PolicyRuleEngine, get_policy_engine
+
+__all__ = ['PolicyRuleEngine', 'get_policy_engine']
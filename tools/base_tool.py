@@ -0,0 +1,41 @@
+"""
+검증 도구 공통 기반
+각 도구는 {"pass", "hard_fail", "score", "issues", "suggestions"} 형태의 결과를 반환한다
+키워드 스캔(scan)과 정책 규칙 판정(policy)은 호출 측(Agent2)이 한 번 계산해 모든 도구에 넘기며, 없으면 도구가 직접 계산한다
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+from utils.keyword_matcher import KeywordScan
+
+
+class BaseValidationTool(ABC):
+    """템플릿 검증 도구 기본 클래스"""
+
+    name = "base_tool"
+    description = ""
+
+    @abstractmethod
+    def run(self, template: str, entities: Dict = None, scan: KeywordScan = None, policy: Dict = None) -> Dict:
+        """템플릿 검증 (하위 클래스에서 구현, policy는 PolicyRuleEngine.validate 결과)"""
+
+    def _result(self, score: float, issues: List[str], suggestions: List[str], hard_fail: bool = False) -> Dict:
+        """공통 결과 형식"""
+        return {
+            "tool": self.name,
+            "pass": not issues and not hard_fail,
+            "hard_fail": hard_fail,
+            "score": round(max(0.0, min(100.0, score)), 1),
+            "issues": issues,
+            "suggestions": suggestions,
+        }
+
+
+def is_advertising(scan: KeywordScan, entities: Dict = None) -> bool:
+    """광고성 메시지 여부 판단 (엔티티 판단 우선, 없으면 홍보 키워드 기준)"""
+    message_type = (entities or {}).get("message_type", "")
+    if "광고" in message_type and "비광고" not in message_type:
+        return True
+    promotions = {hit.keyword for hit in scan.hits if hit.table == "advertising" and hit.category == "promotion"}
+    return len(promotions) >= 2
@@ -0,0 +1,43 @@
+"""
+BlackListTool
+predata/cleaned_black_list.md 기반 금지 유형 검증 + 광고성 메시지의 (광고) 표기 누락 감지
+"""
+
+from typing import Dict
+
+from utils.keyword_matcher import KeywordScan, get_keyword_matcher
+from .base_tool import BaseValidationTool, is_advertising
+from .policy_rule_engine import PolicyRuleEngine, get_policy_engine
+
+
+class BlackListTool(BaseValidationTool):
+    """블랙리스트 검증 도구"""
+
+    name = "blacklist"
+    description = "알림톡 블랙리스트 유형 및 광고 표기 누락 검증"
+
+    def __init__(self, engine: PolicyRuleEngine = None):
+        self.engine = engine or get_policy_engine()
+
+    def run(self, template: str, entities: Dict = None, scan: KeywordScan = None, policy: Dict = None) -> Dict:
+        scan = scan or get_keyword_matcher().scan(template)
+        policy = policy or self.engine.validate(template)
+        issues, suggestions = [], []
+        hard_fail = False
+        score = 100.0
+
+        # 광고성인데 맨 앞 (광고) 표기가 없으면 즉시 반려
+        if is_advertising(scan, entities) and not template.lstrip().startswith("(광고)"):
+            hard_fail = True
+            score -= 60
+            issues.append("광고성 내용이 포함되어 있으나 메시지 맨 앞에 (광고) 표기가 없습니다.")
+            suggestions.append("메시지 맨 앞에 (광고)를 표기하거나 홍보성 문구를 제거하세요.")
+
+        for violation in policy["violations"]:
+            if violation["severity"] == "critical":
+                hard_fail = True
+            score -= 30
+            issues.append(f"{violation['violation_type']}: {violation['description']}")
+            suggestions.append(f"블랙리스트 항목에 해당하지 않도록 내용을 수정하세요. ({violation['source_url']})")
+
+        return self._result(score, issues, suggestions, hard_fail)
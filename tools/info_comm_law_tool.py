@@ -0,0 +1,46 @@
+"""
+InfoCommLawTool
+정보통신망법(불법스팸 방지 안내서) 기반 체크리스트 검증
+"""
+
+from typing import Dict
+
+from config import MAX_TEMPLATE_LENGTH
+from utils.keyword_matcher import KeywordScan, get_keyword_matcher
+from .base_tool import BaseValidationTool, is_advertising
+
+
+class InfoCommLawTool(BaseValidationTool):
+    """정보통신망법 검증 도구"""
+
+    name = "info_comm_law"
+    description = "정보통신망법 광고 전송 의무사항 및 길이 제한 검증"
+
+    def run(self, template: str, entities: Dict = None, scan: KeywordScan = None, policy: Dict = None) -> Dict:
+        scan = scan or get_keyword_matcher().scan(template)
+        issues, suggestions = [], []
+        hard_fail = False
+        score = 100.0
+
+        if len(template) > MAX_TEMPLATE_LENGTH:
+            hard_fail = True
+            score -= 50
+            issues.append(f"템플릿 길이({len(template)}자)가 {MAX_TEMPLATE_LENGTH}자를 초과합니다.")
+            suggestions.append(f"부가 안내를 줄여 {MAX_TEMPLATE_LENGTH}자 이내로 작성하세요.")
+
+        if is_advertising(scan, entities):
+            # 제50조 제4항: 전송자 연락처 및 수신거부 방법 표시 의무
+            if not scan.has("advertising", "opt_out"):
+                score -= 30
+                issues.append("광고성 메시지에 무료 수신거부 방법이 없습니다.")
+                suggestions.append("메시지 하단에 무료 수신거부 및 수신동의 철회 방법을 안내하세요.")
+            if not scan.has("message_elements", "contact"):
+                score -= 20
+                issues.append("광고성 메시지에 전송자 연락처가 없습니다.")
+                suggestions.append("전송자의 명칭과 연락처를 표시하세요.")
+        elif scan.has("advertising", "promotion"):
+            # 정보성 메시지에 홍보 문구가 섞이면 광고성으로 판단될 수 있음
+            score -= 10
+            suggestions.append("정보성 메시지에는 할인/쿠폰 등 홍보 문구를 최소화하세요.")
+
+        return self._result(score, issues, suggestions, hard_fail)
@@ -0,0 +1,296 @@
+"""
+정책 규칙 엔진
+predata의 블랙리스트/화이트리스트 문서(메타데이터 포함)를 규칙으로 컴파일하고
+트리거 단어 인덱스로 템플릿을 검증한다
+
+- 규칙: 문서의 번호 항목 "(n) ..." 하나가 규칙 하나
+- 트리거: 항목 제목에서 뽑은 핵심 단어 (조사/불용어 제거)
+- 판정: 서로 다른 트리거 2개 이상, 트리거가 하나뿐인 규칙은 2회 이상 등장 또는 제목 구절 일치
+- 화이트리스트가 더 구체적으로 허용하는 주제의 블랙리스트 규칙은 제외 (예: 대출이자, 수술 후 주의사항)
+- 검증 비용은 규칙 수가 아니라 템플릿 길이에 비례 (단일 매처 스캔)
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.keyword_matcher import KeywordHit, KeywordMatcher
+from utils.page_urls import PAGE_URLS
+
+
+# 규칙 트리거로 쓰기엔 너무 일반적인 단어
+STOPWORDS = {
+    "메시지", "안내", "알림", "발송", "불가", "포함", "경우", "고객", "상품", "서비스",
+    "수신자", "대상", "관련", "정보", "내용", "확인", "가능", "이용", "사용", "요청",
+    "제공", "이후", "통한", "위한", "대한", "따른", "않은", "명시적", "카카오톡", "알림톡",
+    "부가적", "자체", "별도", "목적", "결과", "해당", "모든", "기타", "문자",
+    "또는", "하는", "되는", "등의", "등을", "없이", "않는", "외의", "수신", "사항",
+}
+
+# 단어 끝 조사/어미 (긴 것부터 제거)
+JOSA_SUFFIXES = [
+    "적으로", "으로", "에게", "에서", "하는", "되는", "하지", "하여",
+    "에", "의", "을", "를", "은", "는", "이", "가", "로", "과", "와", "도",
+]
+
+# 조사처럼 끝나지만 그 자체가 한 단어인 용어 (조사 제거 대상에서 제외)
+KNOWN_TERMS = {
+    "수신동의", "광고수신동의", "측정결과", "검사결과", "처리결과", "심사결과",
+    "만족도", "신용도", "할인가", "판매가", "종합주가", "상담문의", "고객문의",
+}
+
+# 규칙이 걸리기 위한 최소 히트 수: 서로 다른 트리거 수, 트리거가 하나뿐이면 등장 횟수 (구절 일치는 한 번으로 충분)
+MIN_TRIGGER_HITS = 2
+
+RULE_FILES = {
+    "cleaned_black_list.md": "blacklist",
+    "cleaned_white_list.md": "whitelist",
+}
+
+
+@dataclass
+class PolicyRule:
+    """블랙리스트/화이트리스트 항목 하나에 대응하는 규칙"""
+    rule_id: str
+    kind: str  # blacklist / whitelist
+    number: int
+    title: str
+    triggers: List[str]
+    min_hits: int
+    phrases: List[str] = field(default_factory=list)  # 트리거로 시작하는 제목 구절 (예: "특가 상품")
+    metadata: Dict = field(default_factory=dict)
+
+
+class PolicyRuleEngine:
+    """트리거 단어 인덱스 기반 정책 검증 엔진"""
+
+    def __init__(self, rules: List[PolicyRule]):
+        self.rules = {rule.rule_id: rule for rule in rules}
+
+        # 종류별 테이블 -> {rule_id: 트리거 + 구절}: 매처 하나가 트리거 -> 규칙 인덱스 역할
+        tables: Dict[str, Dict[str, List[str]]] = {}
+        for rule in rules:
+            tables.setdefault(rule.kind, {})[rule.rule_id] = rule.triggers + rule.phrases
+        self.matcher = KeywordMatcher(tables)
+
+    @classmethod
+    def from_predata(cls, predata_dir: str = "predata") -> "PolicyRuleEngine":
+        """predata 폴더의 블랙리스트/화이트리스트 문서로 엔진 생성"""
+        rules = []
+        for filename, kind in RULE_FILES.items():
+            file_path = Path(predata_dir) / filename
+            if not file_path.exists():
+                print(f"⚠️ {filename} 파일이 존재하지 않습니다.")
+                continue
+            with open(file_path, "r", encoding="utf-8") as f:
+                rules.extend(parse_rules(f.read(), filename, kind))
+        print(f"✅ 정책 규칙 {len(rules)}개 컴파일 완료")
+        return cls(rules)
+
+    def match(self, text: str) -> List[PolicyRule]:
+        """텍스트에 걸리는 규칙 목록 (화이트리스트에 가려진 블랙리스트 규칙 제외)"""
+        rule_hits: Dict[str, List[KeywordHit]] = {}
+        for hit in self.matcher.find_all(text):
+            rule_hits.setdefault(hit.category, []).append(hit)
+
+        fired = {
+            rule_id: hits
+            for rule_id, hits in rule_hits.items()
+            if self._fires(self.rules[rule_id], hits)
+        }
+        allowed = [
+            (self.rules[rule_id], hits) for rule_id, hits in fired.items()
+            if self.rules[rule_id].kind == "whitelist"
+        ]
+
+        return [
+            self.rules[rule_id]
+            for rule_id, hits in fired.items()
+            if self.rules[rule_id].kind != "blacklist" or not _allowed_by_whitelist(self.rules[rule_id], hits, allowed)
+        ]
+
+    @staticmethod
+    def _fires(rule: PolicyRule, hits: List[KeywordHit]) -> bool:
+        """규칙 판정: 구절 일치, 또는 서로 다른 트리거 수(트리거가 하나면 등장 횟수)가 min_hits 이상"""
+        if any(hit.keyword in rule.phrases for hit in hits):
+            return True
+        if len(rule.triggers) == 1:
+            return len({hit.start for hit in hits}) >= rule.min_hits
+        return len({hit.keyword for hit in hits}) >= rule.min_hits
+
+    def validate(self, template: str) -> Dict:
+        """템플릿 하나 검증 (validate_user_input과 같은 결과 구조)"""
+        matched = self.match(template)
+        violations = [self._to_violation(rule) for rule in matched if rule.kind == "blacklist"]
+
+        return {
+            "is_valid": len(violations) == 0,
+            "violations": violations,
+            "allowed_patterns": [rule.title for rule in matched if rule.kind == "whitelist"],
+            "recommendations": generate_recommendations(violations),
+        }
+
+    def validate_many(self, templates: Iterable[str]) -> List[Dict]:
+        """대량 템플릿 일괄 검증"""
+        return [self.validate(template) for template in templates]
+
+    def _to_violation(self, rule: PolicyRule) -> Dict:
+        """규칙을 위반사항 딕셔너리로 변환"""
+        metadata = rule.metadata
+        return {
+            "violation_type": f"{metadata.get('page_title')} ({rule.number}) 위반",
+            "severity": metadata.get("severity", "medium"),
+            "description": rule.title,
+            "source_url": metadata.get("source_url") or PAGE_URLS.get(metadata.get("source_file", "")),
+            "page_title": metadata.get("page_title"),
+            "file_reference": metadata.get("source_file"),
+            "chunk_id": metadata.get("chunk_id"),
+        }
+
+
+def _allowed_by_whitelist(
+    rule: PolicyRule, hits: List[KeywordHit], allowed: List[Tuple[PolicyRule, List[KeywordHit]]]
+) -> bool:
+    """걸린 화이트리스트 규칙이 이 블랙리스트 규칙의 주제를 명시적으로 허용하는지
+
+    - 모든 히트가 화이트리스트의 더 긴 단어 안에 들어 있음 (예: 대출이자 속 대출)
+    - 같은 주제 단어를 공유하면서 블랙리스트에 없는 단어로 더 구체적으로 걸림
+      (예: '수술 후 주의사항'은 허용, '수술/진료/검사 후 안부'는 불가)
+    화이트리스트 히트가 모두 블랙리스트 트리거이면(예: 포인트 적립) 더 엄격한 블랙리스트 판정을 유지한다
+    """
+    allowed_hits = [hit for _, whitelist_hits in allowed for hit in whitelist_hits]
+    covered = all(
+        any(
+            other.start <= hit.start
+            and hit.start + len(hit.keyword) <= other.start + len(other.keyword)
+            and len(other.keyword) > len(hit.keyword)
+            for other in allowed_hits
+        )
+        for hit in hits
+    )
+    if covered:
+        return True
+
+    terms = {hit.keyword for hit in hits}
+    for _, whitelist_hits in allowed:
+        whitelist_terms = {hit.keyword for hit in whitelist_hits}
+        if terms & whitelist_terms and whitelist_terms - set(rule.triggers):
+            return True
+    return False
+
+
+def generate_recommendations(violations: List[Dict]) -> List[str]:
+    """위반사항 기반 권장사항 생성"""
+    if not violations:
+        return ["입력하신 내용은 정책에 적합합니다."]
+
+    recommendations = []
+    for violation in violations:
+        recommendations.append(
+            f"📋 **{violation['violation_type']}**\n"
+            f"   ⚠️  {violation['description']}\n"
+            f"   📖 자세한 내용: [{violation['page_title']}]({violation['source_url']})\n"
+            f"   📄 파일 참조: {violation['file_reference']} (청크 {violation['chunk_id']})"
+        )
+
+    return recommendations
+
+
+def parse_metadata_blocks(content: str) -> List[Dict]:
+    """<!-- METADATA: ... --> 블록 단위로 (메타데이터, 본문) 분리"""
+    parts = re.split(r"<!--\s*\nMETADATA:\n(.*?)-->", content, flags=re.DOTALL)
+
+    # 메타데이터 블록이 없는 문서는 통째로 하나의 청크
+    if len(parts) == 1:
+        return [{"metadata": {}, "content": content}]
+
+    blocks = []
+    for raw_metadata, body in zip(parts[1::2], parts[2::2]):
+        metadata = {}
+        for line in raw_metadata.strip().splitlines():
+            key, _, value = line.strip().partition(":")
+            try:
+                metadata[key] = json.loads(value.strip())
+            except json.JSONDecodeError:
+                metadata[key] = value.strip()
+        blocks.append({"metadata": metadata, "content": body})
+    return blocks
+
+
+def strip_josa(word: str) -> str:
+    """단어 끝 조사/어미 제거 (사전 용어/불용어는 그대로 둠)"""
+    if word in KNOWN_TERMS or word in STOPWORDS:
+        return word
+    for suffix in JOSA_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[: -len(suffix)]
+    return word
+
+
+def _title_words(title: str) -> List[str]:
+    """괄호 속 예외/부연 설명을 뺀 제목 단어 목록"""
+    return re.findall(r"[가-힣A-Za-z]{2,}", re.sub(r"\([^)]*\)", " ", title))
+
+
+def extract_trigger_terms(title: str) -> List[str]:
+    """항목 제목에서 트리거 단어 추출"""
+    terms = []
+    for word in _title_words(title):
+        word = strip_josa(word)
+        if word not in STOPWORDS and word not in terms:
+            terms.append(word)
+    return terms
+
+
+def extract_trigger_phrases(title: str, trigger: str) -> List[str]:
+    """트리거와 바로 뒤 단어로 된 제목 구절 (원문 형태와 조사 제거 형태)"""
+    words = _title_words(title)
+    phrases = []
+    for word, following in zip(words, words[1:]):
+        if strip_josa(word) != trigger:
+            continue
+        for phrase in (f"{word} {following}", f"{trigger} {strip_josa(following)}"):
+            if phrase not in phrases:
+                phrases.append(phrase)
+    return phrases
+
+
+def parse_rules(content: str, source_file: str, kind: str) -> List[PolicyRule]:
+    """문서 내용을 규칙 목록으로 변환"""
+    title_match = re.search(r"^# (.+)$", content, flags=re.MULTILINE)
+    page_title = title_match.group(1).strip() if title_match else source_file
+
+    rules = []
+    for block in parse_metadata_blocks(content):
+        metadata = {**block["metadata"], "source_file": source_file, "page_title": page_title}
+
+        for number, title in re.findall(r"^\((\d+)\)\s*(.+)$", block["content"], flags=re.MULTILINE):
+            title = re.sub(r"&#x20;|\\$", "", title).strip()
+            triggers = extract_trigger_terms(title)
+            if not triggers:
+                continue
+
+            rules.append(PolicyRule(
+                rule_id=f"{kind}:{metadata.get('chunk_id', 0)}:{number}",
+                kind=kind,
+                number=int(number),
+                title=title,
+                triggers=triggers,
+                min_hits=MIN_TRIGGER_HITS,
+                phrases=extract_trigger_phrases(title, triggers[0]) if len(triggers) == 1 else [],
+                metadata=metadata,
+            ))
+    return rules
+
+
+_default_engine: Optional[PolicyRuleEngine] = None
+
+
+def get_policy_engine(predata_dir: str = "predata") -> PolicyRuleEngine:
+    """기본 predata 기반 엔진 (최초 호출 시 한 번만 컴파일)"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = PolicyRuleEngine.from_predata(predata_dir)
+    return _default_engine
@@ -0,0 +1,42 @@
+"""
+WhiteListTool
+predata/cleaned_white_list.md 기반 승인 패턴 매칭 + 필수 요소 포함 여부 검증
+"""
+
+from typing import Dict
+
+from utils.keyword_matcher import KeywordScan, get_keyword_matcher
+from .base_tool import BaseValidationTool
+from .policy_rule_engine import PolicyRuleEngine, get_policy_engine
+
+
+class WhiteListTool(BaseValidationTool):
+    """화이트리스트 검증 도구"""
+
+    name = "whitelist"
+    description = "알림톡 화이트리스트 패턴 및 필수 요소 검증"
+
+    def __init__(self, engine: PolicyRuleEngine = None):
+        self.engine = engine or get_policy_engine()
+
+    def run(self, template: str, entities: Dict = None, scan: KeywordScan = None, policy: Dict = None) -> Dict:
+        scan = scan or get_keyword_matcher().scan(template)
+        policy = policy or self.engine.validate(template)
+        issues, suggestions = [], []
+
+        allowed_patterns = policy["allowed_patterns"]
+        score = 60.0 + min(len(allowed_patterns), 2) * 10
+
+        if not scan.has("message_elements", "contact"):
+            score -= 20
+            issues.append("발신자 문의처(연락처/고객센터) 정보가 없습니다.")
+            suggestions.append("문의처 또는 연락 방법을 추가하세요. (예: 고객센터 #{고객센터번호})")
+
+        if not scan.has("message_elements", "legal_notice"):
+            score -= 20
+            issues.append("발송 사유 및 법적 근거 안내(※)가 없습니다.")
+            suggestions.append("메시지 끝에 '※ 본 메시지는 ...' 형태의 발송 사유를 명시하세요.")
+
+        result = self._result(score, issues, suggestions)
+        result["allowed_patterns"] = allowed_patterns
+        return result
@@ -0,0 +1,176 @@
+"""
+다중 패턴 키워드 매처
+메타데이터 감지와 정책 검증에서 쓰는 키워드 테이블을
+하나의 정규식으로 컴파일하여 한 번의 선형 탐색으로 모든 히트를 찾는다
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+
+# 테이블명 -> {카테고리: [키워드]} (카테고리 순서가 곧 판정 우선순위)
+KEYWORD_TABLES: Dict[str, Dict[str, List[str]]] = {
+    "severity": {
+        "critical": ["영구적으로", "차단", "중지", "금지"],
+        "high": ["제한", "반려", "위반"],
+        "medium": ["권장", "주의", "확인"],
+    },
+    "table_syntax": {
+        "cell": ["| "],
+        "rule": ["---|"],
+    },
+    "content_type": {
+        "warning": ['{% hint style="danger" %}'],
+        "example": ['{% hint style="success" %}'],
+        "info": ['{% hint style="info" %}'],
+        "procedure": ["단계", "방법", "절차"],
+        "definition": ["정의", "개념", "이란"],
+    },
+    "compliance_level": {
+        "mandatory": ["필수", "반드시", "의무"],
+        "recommended": ["권장", "바람직"],
+    },
+    "keywords": {
+        keyword: [keyword]
+        for keyword in [
+            "알림톡", "친구톡", "정보성", "광고성", "템플릿",
+            "심사", "승인", "반려", "발송", "채널",
+            "정보통신망법", "컴플라이언스", "위반", "차단",
+        ]
+    },
+    "page_info": {
+        "회원가입 가이드": ["회원가입", "가입", "회원"],
+        "주문/배송 가이드": ["주문", "배송", "택배", "결제"],
+        "예약/신청 가이드": ["예약", "신청", "방문"],
+        "쿠폰/포인트 가이드": ["쿠폰", "포인트", "마일리지", "적립"],
+        "금융 서비스 가이드": ["은행", "대출", "이자", "증권", "카드"],
+        "보안/안전 가이드": ["보안", "안전", "OTP", "비밀번호"],
+        "심사 정책": ["심사", "승인", "반려", "검토"],
+        "블랙리스트 정책": ["블랙리스트", "금지", "불가", "위반"],
+        "화이트리스트 정책": ["화이트리스트", "허용", "가능", "발송"],
+        "템플릿 제작 가이드": ["템플릿", "제작", "가이드", "유형"],
+    },
+    "advertising": {
+        "promotion": ["할인", "특가", "세일", "프로모션", "쿠폰", "사은품", "증정", "최저가", "구매하기", "적립금"],
+        "marker": ["(광고)"],
+        "opt_out": ["수신거부", "수신 거부", "무료거부", "수신동의 철회"],
+    },
+    "message_elements": {
+        "contact": ["문의", "연락처", "고객센터", "전화"],
+        "legal_notice": ["※"],
+    },
+}
+
+
+class KeywordHit(NamedTuple):
+    """키워드 히트 한 건"""
+    start: int
+    keyword: str
+    table: str
+    category: str
+
+
+class KeywordScan:
+    """한 텍스트에 대한 스캔 결과 (테이블/카테고리별 조회용)"""
+
+    def __init__(self, hits: List[KeywordHit], tables: Dict[str, Dict[str, List[str]]]):
+        self.hits = hits
+        self._tables = tables
+        self._categories: Dict[str, Set[str]] = {}
+        for hit in hits:
+            self._categories.setdefault(hit.table, set()).add(hit.category)
+
+    def has(self, table: str, category: str) -> bool:
+        """해당 카테고리 키워드가 하나라도 등장했는지 여부"""
+        return category in self._categories.get(table, ())
+
+    def matched(self, table: str) -> List[str]:
+        """히트된 카테고리를 테이블 정의 순서대로 반환"""
+        found = self._categories.get(table, set())
+        return [category for category in self._tables.get(table, {}) if category in found]
+
+    def first(self, table: str, default: str = None) -> str:
+        """우선순위가 가장 높은 히트 카테고리 (없으면 default)"""
+        matched = self.matched(table)
+        return matched[0] if matched else default
+
+
+class KeywordMatcher:
+    """여러 키워드 테이블을 트라이 기반 단일 정규식으로 컴파일한 매처"""
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]]):
+        self.tables = tables
+
+        # 키워드 -> [(테이블, 카테고리)]
+        self._owners: Dict[str, List[Tuple[str, str]]] = {}
+        for table, categories in tables.items():
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    if keyword:
+                        self._owners.setdefault(keyword, []).append((table, category))
+
+        # 정규식은 위치마다 가장 긴 키워드만 잡으므로, 같은 위치에서 시작하는
+        # 더 짧은 키워드(접두사)의 히트까지 미리 펼쳐 둔다
+        self._expanded: Dict[str, List[Tuple[str, str, str]]] = {
+            keyword: [
+                (other, table, category)
+                for other in self._owners if keyword.startswith(other)
+                for table, category in self._owners[other]
+            ]
+            for keyword in self._owners
+        }
+
+        self._pattern = re.compile(self._build_trie_pattern(self._owners))
+
+    @staticmethod
+    def _build_trie_pattern(keywords: Iterable[str]) -> str:
+        """키워드 목록을 트라이 형태의 정규식으로 변환"""
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        def render(node: Dict) -> str:
+            branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            if "" in node:
+                return "(?:" + body + ")?"
+            return body
+
+        return render(trie)
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """텍스트 한 번 순회로 모든 키워드 히트를 카테고리와 함께 반환"""
+        if not text or not self._owners:
+            return []
+
+        hits = []
+        search = self._pattern.search
+        match = search(text)
+        while match:
+            start = match.start()
+            for keyword, table, category in self._expanded[match.group()]:
+                hits.append(KeywordHit(start, keyword, table, category))
+            # 겹치는 히트도 찾기 위해 다음 글자부터 다시 탐색
+            match = search(text, start + 1)
+        return hits
+
+    def scan(self, text: str) -> KeywordScan:
+        """텍스트를 스캔하여 테이블별 조회 가능한 결과 반환"""
+        return KeywordScan(self.find_all(text), self.tables)
+
+    def scan_many(self, texts: Iterable[str]) -> Iterator[KeywordScan]:
+        """대량 텍스트를 순차적으로 스캔"""
+        for text in texts:
+            yield self.scan(text)
+
+
+@lru_cache(maxsize=1)
+def get_keyword_matcher() -> KeywordMatcher:
+    """전체 키워드 테이블로 만든 공유 매처 (프로세스당 한 번만 컴파일)"""
+    return KeywordMatcher(KEYWORD_TABLES)
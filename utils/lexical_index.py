@@ -0,0 +1,60 @@
+"""
+어휘 기반 검색 (문자 bigram BM25)
+임베딩 없이 바로 만들 수 있어 벡터 인덱스가 준비되기 전 가이드라인 검색 대체용으로 쓴다.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+_WORD = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def bigrams(text: str) -> List[str]:
+    """단어별 문자 bigram (한 글자 단어는 그대로) - 조사가 붙은 한국어도 부분 일치"""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if len(word) == 1:
+            terms.append(word)
+        else:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+class LexicalIndex:
+    """BM25 역색인"""
+
+    def __init__(self, texts: Sequence[str], k1: float = 1.2, b: float = 0.75):
+        self.texts = texts
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+
+        for doc_id, text in enumerate(texts):
+            counts = Counter(bigrams(text))
+            self._lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((doc_id, tf))
+
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """[(텍스트, 점수)] 점수 내림차순"""
+        if not self._lengths:
+            return []
+
+        n_docs = len(self._lengths)
+        scores: Dict[int, float] = {}
+        for term in set(bigrams(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(self.texts[doc_id], score) for doc_id, score in ranked]
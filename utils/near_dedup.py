@@ -0,0 +1,92 @@
+"""
+청크 준중복 제거 (MinHash + LSH)
+임베딩 전에 거의 같은 청크를 하나로 합치고, 합쳐진 청크마다 원본 출처 목록을 유지한다.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WHITESPACE = re.compile(r"\s+")
+
+
+def shingles(text: str, k: int = 5) -> np.ndarray:
+    """공백 정규화 후 문자 k-gram 해시 집합"""
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    if len(normalized) <= k:
+        grams = {normalized}
+    else:
+        grams = {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHasher:
+    """고정 시드 MinHash 서명 생성기"""
+
+    def __init__(self, num_perm: int = 64, k: int = 5, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.k = k
+        self.num_perm = num_perm
+        self._a = rng.randint(1, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MAX_HASH, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = shingles(text, self.k)
+        # (a * x + b) mod p 를 순열마다 계산한 뒤 최솟값
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=0)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def near_duplicate_groups(
+    texts: Sequence[str],
+    threshold: float = 0.85,
+    num_perm: int = 64,
+    bands: int = 16,
+) -> List[List[int]]:
+    """준중복 그룹 (그룹 안 인덱스는 오름차순, 그룹은 대표 인덱스 순)"""
+    if not texts:
+        return []
+    hasher = MinHasher(num_perm=num_perm)
+    signatures = np.stack([hasher.signature(text) for text in texts])
+    rows = num_perm // bands
+
+    parent = list(range(len(texts)))
+    for band in range(bands):
+        buckets: Dict[bytes, int] = {}
+        for i, key in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            first = buckets.setdefault(key.tobytes(), i)
+            if first == i:
+                continue
+            a, b = _find(parent, first), _find(parent, i)
+            # 후보는 두 그룹 대표끼리의 추정 Jaccard 유사도로 확인 (연쇄 병합으로 대표와 멀어지는 것 방지)
+            if a != b and np.mean(signatures[a] == signatures[b]) >= threshold:
+                parent[max(a, b)] = min(a, b)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return [groups[root] for root in sorted(groups)]
+
+
+def dedupe_chunks(
+    chunks: Sequence[str],
+    sources: Sequence[str],
+    threshold: float = 0.85,
+) -> Tuple[List[str], List[List[str]]]:
+    """대표 청크 목록과 청크별 출처 목록 (대표는 먼저 나온 청크)"""
+    texts, merged_sources = [], []
+    for group in near_duplicate_groups(chunks, threshold):
+        texts.append(chunks[group[0]])
+        merged_sources.append(list(dict.fromkeys(sources[i] for i in group)))
+    return texts, merged_sources
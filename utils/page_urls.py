@@ -0,0 +1,17 @@
+"""
+가이드 문서 파일별 원본 페이지 URL
+메타데이터 생성기와 정책 규칙 엔진이 함께 쓰는 매핑
+"""
+
+PAGE_URLS = {
+    "cleaned_add_infotalk.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend",
+    "cleaned_black_list.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/audit/black-list",
+    "cleaned_white_list.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/audit/white-list",
+    "cleaned_content-guide.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/infotalk/content-guide",
+    "cleaned_message_yuisahang.md": "https://kakaobusiness.gitbook.io/main/ad/moment/start/messagead/operations",
+    "cleaned_info_simsa.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend/audit",
+    "cleaned_alrimtalk.md": "https://kakaobusiness.gitbook.io/main/ad/bizmessage/notice-friend",
+    "cleaned_message.md": "https://kakaobusiness.gitbook.io/main/channel/run/message",
+    "cleaned_run_message.md": "https://kakaobusiness.gitbook.io/main/channel/run/message",
+    "cleaned_zipguide.md": "https://kakaobusiness.gitbook.io/main/",
+}
@@ -0,0 +1,132 @@
+"""
+PDF 가이드 수집 (페이지 단위 병렬 추출 + 파일 해시 캐시)
+- PyMuPDF로 페이지별 텍스트를 프로세스 풀에서 추출
+- 추출 결과는 파일 SHA-256 기준으로 캐시하므로 같은 파일 재수집은 디스크 읽기만 발생
+- 청크에는 "[파일명 p.N]" 페이지 태그를 붙여 가이드라인 인덱스에 바로 사용
+
+사용 예:
+    python -m utils.pdf_ingest data/*.pdf
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import fitz  # PyMuPDF
+    USE_PYMUPDF = True
+except ImportError:
+    USE_PYMUPDF = False
+
+DEFAULT_CACHE_DIR = Path(".cache") / "pdf_pages"
+PAGES_PER_TASK = 8        # 프로세스 작업 하나가 맡는 페이지 수
+MIN_PAGES_FOR_POOL = 16   # 이보다 작은 문서는 현재 프로세스에서 추출
+
+
+def file_sha256(path: Path) -> str:
+    """파일 내용 해시 (캐시 키)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_page_range(path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """[start, end) 페이지 텍스트 추출 (프로세스 풀 작업 단위, 페이지 번호는 1부터)"""
+    with fitz.open(path) as doc:
+        return [(number + 1, doc[number].get_text("text")) for number in range(start, end)]
+
+
+def extract_pdf_pages(
+    path: Path,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    max_workers: Optional[int] = None,
+) -> List[Tuple[int, str]]:
+    """PDF 페이지별 텍스트 [(페이지 번호, 텍스트)] (캐시 우선)"""
+    if not USE_PYMUPDF:
+        raise ImportError("PDF 수집에는 PyMuPDF(fitz)가 필요합니다.")
+
+    path = Path(path)
+    cache_file = Path(cache_dir) / f"{file_sha256(path)}.json"
+    if cache_file.exists():
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return [tuple(page) for page in json.load(f)["pages"]]
+
+    with fitz.open(path) as doc:
+        page_count = doc.page_count
+
+    ranges = [(str(path), start, min(start + PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PAGES_PER_TASK)]
+    if page_count < MIN_PAGES_FOR_POOL or (max_workers or os.cpu_count() or 1) == 1:
+        pages = [page for task in ranges for page in _extract_page_range(*task)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            pages = [page for result in pool.map(_extract_page_range, *zip(*ranges)) for page in result]
+
+    # 원자적 저장 (동시 실행 시 반쯤 쓴 캐시를 읽지 않도록)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump({"source": path.name, "pages": pages}, f, ensure_ascii=False)
+    os.replace(tmp_file, cache_file)
+    return pages
+
+
+def page_tag(source: str, page: int) -> str:
+    return f"[{Path(source).stem} p.{page}]"
+
+
+def chunk_pages(
+    source: str,
+    pages: List[Tuple[int, str]],
+    chunker: Callable[[str], List[str]],
+) -> List[str]:
+    """페이지별로 청킹하고 페이지 태그를 앞에 붙인 청크 목록"""
+    chunks = []
+    for page, text in pages:
+        for chunk in chunker(text):
+            chunks.append(f"{page_tag(source, page)}\n{chunk}")
+    return chunks
+
+
+def ingest_pdfs(
+    paths: List[Path],
+    chunker: Callable[[str], List[str]],
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    max_workers: Optional[int] = None,
+) -> Dict[str, List[str]]:
+    """여러 PDF를 수집해 {파일명: 페이지 태그 청크 목록} 반환 (추출에 실패한 파일은 경고 후 제외)"""
+    chunks = {}
+    for path in paths:
+        name = Path(path).name
+        try:
+            chunks[name] = chunk_pages(name, extract_pdf_pages(path, cache_dir, max_workers), chunker)
+        except Exception as e:
+            print(f"⚠️ {name} PDF 수집 실패: {e}")
+    return chunks
+
+
+def main(argv=None):
+    from core.base_processor import BaseTemplateProcessor
+
+    parser = argparse.ArgumentParser(description="PDF 가이드 페이지 단위 수집 (캐시 생성)")
+    parser.add_argument("pdfs", nargs="+", help="수집할 PDF 파일")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    for path in args.pdfs:
+        start = time.perf_counter()
+        pages = extract_pdf_pages(Path(path), Path(args.cache_dir), args.workers)
+        chunks = chunk_pages(Path(path).name, pages, BaseTemplateProcessor.chunk_text)
+        print(f"✅ {Path(path).name}: {len(pages)}페이지, {len(chunks)}개 청크 ({time.perf_counter() - start:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()